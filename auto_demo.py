@@ -83,14 +83,14 @@ def main():
     
     # Показуємо нотатки
     notes = note_manager.get_all_notes()
-    for index, note in notes:
-        print(f"\n{index}. {note}")
+    for number, (_, note) in enumerate(notes, 1):
+        print(f"\n{number}. {note}")
     
     # Пошук за тегами
     print("\n🏷️ Нотатки з тегом 'важливо':")
     tagged = note_manager.find_notes_by_tags(["важливо"])
-    for index, note in tagged:
-        print(f"  #{index}: {note.title}")
+    for number, (_, note) in enumerate(tagged, 1):
+        print(f"  #{number}: {note.title}")
     
     # === РОЗПІЗНАВАННЯ КОМАНД ===
     print_separator("Розпізнавання команд")
@@ -133,23 +133,23 @@ def demo_notes(note_manager):
     
     print("\n🔹 Показуємо всі нотатки:")
     notes = note_manager.get_all_notes()
-    for index, note in notes:
-        print(f"\n{index}. {note}")
+    for number, (_, note) in enumerate(notes, 1):
+        print(f"\n{number}. {note}")
         print("-" * 50)
     
     time.sleep(2)
     
     print("\n🔹 Пошук нотаток за словом 'проект':")
     found_notes = note_manager.search_notes("проект")
-    for index, note in found_notes:
-        print(f"Знайдено #{index}: {note.title}")
+    for number, (_, note) in enumerate(found_notes, 1):
+        print(f"Знайдено #{number}: {note.title}")
     
     time.sleep(1)
     
     print("\n🔹 Нотатки з тегом 'важливо':")
     tagged_notes = note_manager.find_notes_by_tags(["важливо"])
-    for index, note in tagged_notes:
-        print(f"#{index}: {note.title} - теги: {', '.join(note.tags)}")
+    for number, (_, note) in enumerate(tagged_notes, 1):
+        print(f"#{number}: {note.title} - теги: {', '.join(note.tags)}")
     
     time.sleep(1)
     
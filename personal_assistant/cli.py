@@ -3,7 +3,8 @@
 """
 
 import sys
-from typing import Optional, List, Dict, Any
+from itertools import chain, islice
+from typing import Optional, List, Dict, Any, Iterable, Callable
 from datetime import datetime
 
 try:
@@ -22,6 +23,9 @@ from .utils.validators import (
     validate_yes_no, validate_tags_input, format_list_for_display
 )
 
+# Маркер вичерпаного ітератора для посторінкового виводу
+_NO_MORE_ITEMS = object()
+
 
 class PersonalAssistantCLI:
     """
@@ -31,6 +35,13 @@ class PersonalAssistantCLI:
     та управління контактами і нотатками.
     """
 
+    # Кількість записів, що виводяться за один раз
+    PAGE_SIZE = 20
+    # Максимальна кількість результатів ранжованого пошуку
+    SEARCH_LIMIT = 100
+    # Максимальний час пошуку регулярним виразом (секунди)
+    REGEX_TIMEOUT = 10.0
+
     def __init__(self):
         """Ініціалізує CLI інтерфейс"""
         # Ініціалізуємо сховище та менеджери
@@ -208,6 +219,39 @@ class PersonalAssistantCLI:
         except ValueError:
             return False
 
+    def print_paged(self, items: Iterable[Any], print_item: Callable[[int, Any], None]) -> int:
+        """
+        Виводить елементи посторінково, споживаючи ітератор лише за потреби
+        
+        Args:
+            items (Iterable[Any]): Елементи для виводу (можуть бути лінивими)
+            print_item (Callable[[int, Any], None]): Функція виводу (порядковий_номер, елемент)
+            
+        Returns:
+            int: Кількість виведених елементів
+        """
+        iterator = iter(items)
+        shown = 0
+        
+        while True:
+            page = list(islice(iterator, self.PAGE_SIZE))
+            for item in page:
+                shown += 1
+                print_item(shown, item)
+            
+            if len(page) < self.PAGE_SIZE:
+                break
+            
+            # Перевіряємо, чи є ще елементи, не втрачаючи прочитаний
+            next_item = next(iterator, _NO_MORE_ITEMS)
+            if next_item is _NO_MORE_ITEMS:
+                break
+            if not self.confirm_action(f"Показати наступні {self.PAGE_SIZE}?"):
+                break
+            iterator = chain([next_item], iterator)
+        
+        return shown
+
     # === КОМАНДИ УПРАВЛІННЯ КОНТАКТАМИ ===
 
     def add_contact_command(self) -> None:
@@ -288,6 +332,7 @@ class PersonalAssistantCLI:
     def search_contact_command(self) -> None:
         """Команда пошуку контактів"""
         self.print_section("Пошук контактів")
+        self.print_info("Можна уточнити запит умовами: has:phone, birthday:03, domain:example.com, name:петр*")
         
         query = self.get_user_input("Введіть ім'я, телефон або email для пошуку: ")
         if not query:
@@ -295,17 +340,21 @@ class PersonalAssistantCLI:
             return
         
         try:
-            contacts = self.contact_manager.search_contacts(query)
+            def print_contact(i: int, contact: Contact) -> None:
+                print(f"\n{self.colorize(f'{i}.', 'cyan')} {contact}")
+                print("-" * 40)
             
-            if not contacts:
+            # Найрелевантніші збіги виводяться першими
+            contacts = self.contact_manager.search_contacts(query, ranked=True, limit=self.SEARCH_LIMIT)
+            shown = self.print_paged(contacts, print_contact)
+            
+            if not shown:
                 self.print_warning("Контактів не знайдено")
                 return
             
-            print(f"\n{self.colorize(f'Знайдено контактів: {len(contacts)}', 'green')}")
-            
-            for i, contact in enumerate(contacts, 1):
-                print(f"\n{self.colorize(f'{i}.', 'cyan')} {contact}")
-                print("-" * 40)
+            print(f"\n{self.colorize(f'Показано контактів: {shown}', 'green')}")
+            if len(contacts) == self.SEARCH_LIMIT:
+                self.print_info(f"Показано {self.SEARCH_LIMIT} найрелевантніших збігів - уточніть запит")
                 
         except Exception as e:
             self.print_error(f"Помилка пошуку: {e}")
@@ -326,22 +375,58 @@ class PersonalAssistantCLI:
             if sort_choice == '2':
                 sort_by = 'birthday'
             
-            contacts = self.contact_manager.get_all_contacts(sort_by=sort_by)
-            
-            if not contacts:
+            total = len(self.contact_manager)
+            if not total:
                 self.print_warning("Контактів поки що немає")
                 self.print_info("Додайте перший контакт командою 'add contact'")
                 return
             
-            print(f"\n{self.colorize(f'Усього контактів: {len(contacts)}', 'green')}")
+            print(f"\n{self.colorize(f'Усього контактів: {total}', 'green')}")
             
-            for i, contact in enumerate(contacts, 1):
-                print(f"\n{self.colorize(f'{i}.', 'cyan')} {contact}")
-                print("-" * 50)
+            # Виводимо контакти посторінково, не сортуючи всю колекцію
+            cursor = None
+            i = 0
+            while True:
+                contacts, cursor = self.contact_manager.page(sort_by, after=cursor, limit=self.PAGE_SIZE)
+                for contact in contacts:
+                    i += 1
+                    print(f"\n{self.colorize(f'{i}.', 'cyan')} {contact}")
+                    print("-" * 50)
+                
+                if cursor is None or not self.confirm_action(f"Показати наступні {self.PAGE_SIZE}?"):
+                    break
                 
         except Exception as e:
             self.print_error(f"Помилка отримання контактів: {e}")
 
+    def find_contact_or_suggest(self, name: str) -> Optional[Contact]:
+        """
+        Знаходить контакт за ім'ям, а якщо його немає - пропонує схожі імена
+        
+        Args:
+            name (str): Ім'я, введене користувачем
+            
+        Returns:
+            Optional[Contact]: Знайдений або обраний контакт, None - якщо немає
+        """
+        contact = self.contact_manager.find_contact(name)
+        if contact:
+            return contact
+        
+        self.print_error(f"Контакт з ім'ям '{name}' не знайдено")
+        suggestions = self.contact_manager.find_similar_names(name)
+        if not suggestions:
+            return None
+        
+        print("\nМожливо, ви мали на увазі:")
+        for i, suggestion in enumerate(suggestions, 1):
+            print(f"  {self.colorize(f'{i}.', 'cyan')} {suggestion}")
+        
+        choice = self.get_user_input("Введіть номер контакту (або Enter для скасування): ")
+        if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+            return self.contact_manager.find_contact(suggestions[int(choice) - 1])
+        return None
+
     def edit_contact_command(self) -> None:
         """Команда редагування контакту"""
         self.print_section("Редагування контакту")
@@ -351,9 +436,8 @@ class PersonalAssistantCLI:
         if not name:
             return
         
-        contact = self.contact_manager.find_contact(name)
+        contact = self.find_contact_or_suggest(name)
         if not contact:
-            self.print_error(f"Контакт з ім'ям '{name}' не знайдено")
             return
         
         print(f"\nПоточна інформація:")
@@ -414,8 +498,8 @@ class PersonalAssistantCLI:
                     contact.remove_address()
                     self.print_success("Адресу видалено")
             
-            # Зберігаємо зміни
-            self.contact_manager.save_contacts()
+            # Фіксуємо зміни у менеджері та зберігаємо
+            self.contact_manager.update_contact(contact.name.value)
             self.print_success("Контакт успішно оновлено!")
             print(f"\n{contact}")
             
@@ -430,16 +514,15 @@ class PersonalAssistantCLI:
         if not name:
             return
         
-        contact = self.contact_manager.find_contact(name)
+        contact = self.find_contact_or_suggest(name)
         if not contact:
-            self.print_error(f"Контакт з ім'ям '{name}' не знайдено")
             return
         
         print(f"\nКонтакт для видалення:")
         print(contact)
         
         if self.confirm_action(f"Ви впевнені, що хочете видалити контакт '{contact.name.value}'?"):
-            if self.contact_manager.remove_contact(name):
+            if self.contact_manager.remove_contact(contact.name.value):
                 self.print_success(f"Контакт '{contact.name.value}' успішно видалено")
             else:
                 self.print_error("Помилка видалення контакту")
@@ -488,6 +571,65 @@ class PersonalAssistantCLI:
 
     # === КОМАНДИ УПРАВЛІННЯ НОТАТКАМИ ===
 
+    def _print_indexed_note(self, number: int, id_note: tuple) -> None:
+        """Виводить нотатку разом з її порядковим номером у списку"""
+        _, note = id_note
+        print(f"\n{self.colorize(f'{number}.', 'cyan')} {note}")
+        print("-" * 50)
+
+    def _print_scored_note(self, number: int, scored_note: tuple) -> None:
+        """Виводить нотатку з порядковим номером та балом релевантності"""
+        _, note, score = scored_note
+        print(f"\n{self.colorize(f'{number}.', 'cyan')} "
+              f"{self.colorize(f'(релевантність: {score:.2f})', 'yellow')} {note}")
+        print("-" * 50)
+
+    def _print_regex_note(self, number: int, matched_note: tuple) -> None:
+        """Виводить нотатку з порядковим номером та збігами регулярного виразу"""
+        _, note, spans = matched_note
+        matches = ", ".join(note.content[start:end] for start, end in spans[:5])
+        more = f" та ще {len(spans) - 5}" if len(spans) > 5 else ""
+        print(f"\n{self.colorize(f'{number}.', 'cyan')} "
+              f"{self.colorize(f'(збіги: {matches}{more})', 'yellow')} {note}")
+        print("-" * 50)
+
+    def choose_note(self, action: str) -> Optional[tuple]:
+        """
+        Показує найновіші нотатки та просить обрати одну за номером
+        
+        Номери - лише позиції у списку (від найновішої нотатки); менеджер
+        адресує нотатки ідентифікаторами.
+        
+        Args:
+            action (str): Дія для підказки ("редагування", "видалення")
+            
+        Returns:
+            Optional[tuple]: (ідентифікатор, нотатка) або None, якщо номер неправильний
+            
+        Raises:
+            ValueError: Якщо введено не додатне ціле число
+        """
+        total = len(self.note_manager)
+        shown = list(self.note_manager.iter_all(limit=10))  # Показуємо перші 10
+        
+        print("Доступні нотатки:")
+        for number, (_, note) in enumerate(shown, 1):
+            print(f"{number}. {note.title}")
+        
+        if total > 10:
+            print(f"... та ще {total - 10} нотаток")
+        
+        # Отримуємо номер нотатки
+        note_num_input = self.get_user_input(f"Введіть номер нотатки для {action}: ")
+        note_num = validate_positive_integer(note_num_input, "номер нотатки")
+        
+        if note_num <= len(shown):
+            return shown[note_num - 1]
+        chosen = next(islice(self.note_manager.iter_all(), note_num - 1, None), None)
+        if chosen is None:
+            self.print_error("Нотатку з таким номером не знайдено")
+        return chosen
+
     def add_note_command(self) -> None:
         """Команда додавання нової нотатки"""
         self.print_section("Створення нової нотатки")
@@ -526,6 +668,8 @@ class PersonalAssistantCLI:
     def search_notes_command(self) -> None:
         """Команда пошуку нотаток"""
         self.print_section("Пошук нотаток")
+        self.print_info('Фразу беріть у лапки ("квартальний звіт"), префікс позначайте зірочкою (бюдж*)')
+        self.print_info("Регулярний вираз по змісту: re:<вираз> (наприклад, re:INV-\\d+)")
         
         query = self.get_user_input("Введіть текст для пошуку: ")
         if not query:
@@ -533,17 +677,19 @@ class PersonalAssistantCLI:
             return
         
         try:
-            found_notes = self.note_manager.search_notes(query)
+            if query.startswith('re:'):
+                results = self.note_manager.search_notes_regex(query[3:], timeout=self.REGEX_TIMEOUT)
+                shown = self.print_paged(results, self._print_regex_note)
+            else:
+                # Найрелевантніші нотатки (збіг у заголовку важливіший) - першими
+                results = self.note_manager.search_notes_ranked(query, limit=self.SEARCH_LIMIT)
+                shown = self.print_paged(results, self._print_scored_note)
             
-            if not found_notes:
+            if not shown:
                 self.print_warning("Нотаток не знайдено")
                 return
             
-            print(f"\n{self.colorize(f'Знайдено нотаток: {len(found_notes)}', 'green')}")
-            
-            for index, note in found_notes:
-                print(f"\n{self.colorize(f'{index}.', 'cyan')} {note}")
-                print("-" * 50)
+            print(f"\n{self.colorize(f'Показано нотаток: {shown}', 'green')}")
                 
         except Exception as e:
             self.print_error(f"Помилка пошуку: {e}")
@@ -567,18 +713,25 @@ class PersonalAssistantCLI:
             if sort_choice in sort_map:
                 sort_by = sort_map[sort_choice]
             
-            notes = self.note_manager.get_all_notes(sort_by=sort_by)
-            
-            if not notes:
+            total = len(self.note_manager)
+            if not total:
                 self.print_warning("Нотаток поки що немає")
                 self.print_info("Додайте першу нотатку командою 'add note'")
                 return
             
-            print(f"\n{self.colorize(f'Усього нотаток: {len(notes)}', 'green')}")
+            print(f"\n{self.colorize(f'Усього нотаток: {total}', 'green')}")
             
-            for index, note in notes:
-                print(f"\n{self.colorize(f'{index}.', 'cyan')} {note}")
-                print("-" * 50)
+            # Виводимо нотатки посторінково з підтримуваного порядку сортування
+            cursor = None
+            i = 0
+            while True:
+                id_notes, cursor = self.note_manager.page(sort_by, after=cursor, limit=self.PAGE_SIZE)
+                for id_note in id_notes:
+                    i += 1
+                    self._print_indexed_note(i, id_note)
+                
+                if cursor is None or not self.confirm_action(f"Показати наступні {self.PAGE_SIZE}?"):
+                    break
                 
         except Exception as e:
             self.print_error(f"Помилка отримання нотаток: {e}")
@@ -589,37 +742,24 @@ class PersonalAssistantCLI:
         
         try:
             # Показуємо список нотаток для вибору
-            notes = self.note_manager.get_all_notes()
-            if not notes:
+            if not len(self.note_manager):
                 self.print_warning("Нотаток немає для редагування")
                 return
             
-            print("Доступні нотатки:")
-            for index, note in notes[:10]:  # Показуємо перші 10
-                print(f"{index}. {note.title}")
-            
-            if len(notes) > 10:
-                print(f"... та ще {len(notes) - 10} нотаток")
-            
-            # Отримуємо номер нотатки
-            note_num_input = self.get_user_input("Введіть номер нотатки для редагування: ")
-            note_num = validate_positive_integer(note_num_input, "номер нотатки")
-            
-            note = self.note_manager.get_note(note_num)
-            if not note:
-                self.print_error("Нотатку з таким номером не знайдено")
+            chosen = self.choose_note("редагування")
+            if not chosen:
                 return
+            note_id, note = chosen
             
             print(f"\nПоточна нотатка:")
             print(note)
             print(f"\nЗміст:\n{note.content}")
             
+            new_title = new_content = new_tags = None
+            
             # Редагуємо заголовок
             if self.confirm_action("Редагувати заголовок?"):
-                new_title = self.get_user_input(f"Новий заголовок (поточний: '{note.title}'): ")
-                if new_title:
-                    note.set_title(new_title)
-                    self.print_success("Заголовок оновлено")
+                new_title = self.get_user_input(f"Новий заголовок (поточний: '{note.title}'): ") or None
             
             # Редагуємо зміст
             if self.confirm_action("Редагувати зміст?"):
@@ -632,8 +772,6 @@ class PersonalAssistantCLI:
                     content_lines.append(line)
                 
                 new_content = "\n".join(content_lines)
-                note.set_content(new_content)
-                self.print_success("Зміст оновлено")
             
             # Редагуємо теги
             if self.confirm_action("Редагувати теги?"):
@@ -642,15 +780,15 @@ class PersonalAssistantCLI:
                 
                 tags_input = self.get_user_input("Введіть нові теги через кому (або Enter для очищення): ")
                 new_tags = validate_tags_input(tags_input) if tags_input else []
-                
-                note.clear_tags()
-                for tag in new_tags:
-                    note.add_tag(tag)
-                
-                self.print_success("Теги оновлено")
             
-            # Зберігаємо зміни
-            self.note_manager.save_notes()
+            # Застосовуємо всі зміни одним оновленням (одна переіндексація та збереження)
+            self.note_manager.update_note(note_id, title=new_title, content=new_content, tags=new_tags)
+            if new_title is not None:
+                self.print_success("Заголовок оновлено")
+            if new_content is not None:
+                self.print_success("Зміст оновлено")
+            if new_tags is not None:
+                self.print_success("Теги оновлено")
             self.print_success("Нотатку успішно оновлено!")
             
         except ValueError as e:
@@ -664,32 +802,20 @@ class PersonalAssistantCLI:
         
         try:
             # Показуємо список нотаток
-            notes = self.note_manager.get_all_notes()
-            if not notes:
+            if not len(self.note_manager):
                 self.print_warning("Нотаток немає для видалення")
                 return
             
-            print("Доступні нотатки:")
-            for index, note in notes[:10]:
-                print(f"{index}. {note.title}")
-            
-            if len(notes) > 10:
-                print(f"... та ще {len(notes) - 10} нотаток")
-            
-            # Отримуємо номер нотатки
-            note_num_input = self.get_user_input("Введіть номер нотатки для видалення: ")
-            note_num = validate_positive_integer(note_num_input, "номер нотатки")
-            
-            note = self.note_manager.get_note(note_num)
-            if not note:
-                self.print_error("Нотатку з таким номером не знайдено")
+            chosen = self.choose_note("видалення")
+            if not chosen:
                 return
+            note_id, note = chosen
             
             print(f"\nНотатка для видалення:")
             print(note)
             
             if self.confirm_action(f"Ви впевнені, що хочете видалити нотатку '{note.title}'?"):
-                if self.note_manager.remove_note(note_num):
+                if self.note_manager.remove_note(note_id):
                     self.print_success(f"Нотатку '{note.title}' успішно видалено")
                 else:
                     self.print_error("Помилка видалення нотатки")
@@ -713,32 +839,21 @@ class PersonalAssistantCLI:
             print(f"Доступні теги ({len(all_tags)}):")
             print(format_list_for_display(sorted(all_tags)))
             
-            # Отримуємо теги для пошуку
-            tags_input = self.get_user_input("\nВведіть теги для пошуку через кому: ")
-            if not tags_input:
+            # Отримуємо вираз тегів для пошуку
+            print("\nВираз може поєднувати теги через AND, OR, NOT та дужки,")
+            print("наприклад: (робота OR проєкт) AND NOT архів")
+            tag_expr = self.get_user_input("Введіть тег або вираз тегів: ")
+            if not tag_expr:
                 return
             
-            search_tags = validate_tags_input(tags_input)
-            if not search_tags:
-                self.print_warning("Не вказано валідних тегів для пошуку")
-                return
-            
-            # Запитуємо режим пошуку
-            match_all = self.confirm_action("Шукати нотатки, які містять ВСІ вказані теги? (інакше - хоча б один)")
+            found_notes = self.note_manager.find_notes(tag_expr)
+            shown = self.print_paged(found_notes, self._print_indexed_note)
             
-            found_notes = self.note_manager.find_notes_by_tags(search_tags, match_all)
-            
-            if not found_notes:
-                mode_text = "всі" if match_all else "хоча б один з"
-                self.print_warning(f"Не знайдено нотаток, які містять {mode_text} тегів: {format_list_for_display(search_tags)}")
+            if not shown:
+                self.print_warning(f"Не знайдено нотаток за виразом: {tag_expr}")
                 return
             
-            mode_text = "всі" if match_all else "хоча б один з"
-            print(f"\n{self.colorize(f'Знайдено {len(found_notes)} нотаток з тегами ({mode_text}): {format_list_for_display(search_tags)}', 'green')}")
-            
-            for index, note in found_notes:
-                print(f"\n{self.colorize(f'{index}.', 'cyan')} {note}")
-                print("-" * 50)
+            print(f"\n{self.colorize(f'Показано {shown} нотаток за виразом: {tag_expr}', 'green')}")
                 
         except ValueError as e:
             self.print_error(str(e))
@@ -762,6 +877,7 @@ class PersonalAssistantCLI:
             print(f"   З днями народження: {contact_stats['with_birthdays']}")
             print(f"   З адресами: {contact_stats['with_addresses']}")
             print(f"   Найближчі дні народження (7 днів): {contact_stats['upcoming_birthdays']}")
+            print(f"   Кеш запитів: {contact_stats['cache_hits']} влучань, {contact_stats['cache_misses']} промахів")
             
             # Отримуємо статистику нотаток
             note_stats = self.note_manager.get_statistics()
@@ -773,12 +889,13 @@ class PersonalAssistantCLI:
             print(f"   Середньо слів на нотатку: {note_stats['avg_words_per_note']}")
             print(f"   Нотаток з тегами: {note_stats['notes_with_tags']}")
             print(f"   Середньо тегів на нотатку: {note_stats['avg_tags_per_note']}")
+            print(f"   Кеш запитів: {note_stats['cache_hits']} влучань, {note_stats['cache_misses']} промахів")
             
             # Показуємо топ тегів
             if note_stats['total_tags'] > 0:
-                tag_stats = self.note_manager.get_tag_statistics()
+                top_tags = self.note_manager.most_common_tags(5)
                 print(f"\n{self.colorize('🏷️ Топ-5 найпопулярніших тегів:', 'bright')}")
-                for i, (tag, count) in enumerate(list(tag_stats.items())[:5], 1):
+                for i, (tag, count) in enumerate(top_tags, 1):
                     print(f"   {i}. {tag} ({count} разів)")
             
             # Інформація про сховище
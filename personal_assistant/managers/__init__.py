@@ -4,5 +4,6 @@
 
 from .contact_manager import ContactManager
 from .note_manager import NoteManager
+from .tenant_pool import TenantPool
 
-__all__ = ['ContactManager', 'NoteManager']
\ No newline at end of file
+__all__ = ['ContactManager', 'NoteManager', 'TenantPool']
\ No newline at end of file
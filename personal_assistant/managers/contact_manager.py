@@ -2,10 +2,50 @@
 Менеджер для управління контактами
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import date
+import heapq
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Iterable
+from datetime import date, timedelta
+from difflib import SequenceMatcher
 from ..models.contact import Contact
 from ..storage.file_storage import FileStorage
+from ..utils.events import ChangeEvent, EventStream
+from ..utils.lru_cache import VersionedLRUCache
+from ..utils.rwlock import ReadWriteLock, read_locked, write_locked
+from ..utils.sorted_index import SortedIndex
+from ..utils.transliteration import fold_text, folded_phonetic_key, name_block_key
+from .contact_query import QueryPlan, Predicate, parse_query, is_structured_query, free_text_terms
+
+
+def _build_contacts(records: List[Any], offset: int = 0) -> Tuple[List[Contact], List[Tuple[int, str]]]:
+    """
+    Валідує та нормалізує пачку сирих записів контактів
+    
+    Функція виконується у процесах-обробниках, тому знаходиться на рівні
+    модуля. Повертає вже провалідовані об'єкти Contact, які передаються
+    назад через pickle без повторної валідації.
+    
+    Args:
+        records (List[Any]): Словники у форматі Contact.to_dict()
+        offset (int): Позиція першого запису пачки у вхідних даних
+        
+    Returns:
+        Tuple[List[Contact], List[Tuple[int, str]]]: Створені контакти та
+        помилки у вигляді (позиція_запису, повідомлення)
+    """
+    contacts = []
+    errors = []
+    for position, record in enumerate(records, offset):
+        try:
+            contacts.append(Contact.from_dict(record))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append((position, str(e)))
+    return contacts, errors
 
 
 class ContactManager:
@@ -14,37 +54,251 @@ class ContactManager:
     
     Забезпечує функціональність для додавання, видалення, пошуку та редагування контактів,
     а також їх збереження на диску.
+    
+    Менеджер потокобезпечний: методи читання виконуються паралельно під
+    блокуванням на читання, зміни - під ексклюзивним блокуванням на запис.
+    Редагування об'єктів Contact "на місці" слід фіксувати через update_contact().
+    
+    Зміни публікуються у потік events (ChangeEvent з ключами контакту - ім'ям
+    у нижньому регістрі), тож зовнішні індекси та експортери можуть
+    оновлюватися інкрементально.
     """
 
-    def __init__(self, storage: FileStorage):
+    # Кількість контактів у журналі відкату, з якої відсортовані
+    # представлення дешевше пересортувати, ніж оновлювати вставками
+    BULK_ROLLBACK_SIZE = 512
+
+    def __init__(self, storage: FileStorage, cache_size: int = 128):
         """
         Ініціалізує менеджер контактів з вказаним сховищем
         
         Args:
             storage (FileStorage): Об'єкт для збереження даних
+            cache_size (int): Кількість запитів у кеші результатів (0 вимикає кеш)
         """
         self.storage = storage
+        self._lock = ReadWriteLock()
         self._contacts: Dict[str, Contact] = {}
+        # Версія колекції збільшується при кожній зміні й робить недійсними
+        # закешовані результати запитів
+        self._version = 0
+        self._cache = VersionedLRUCache(cache_size)
+        # Стан пакетного режиму: глибина вкладеності, наявність незбережених
+        # змін та журнал відкату - стан кожного зміненого в пакеті контакту
+        # до його першої зміни (None - контакту не було)
+        self._batch_depth = 0
+        self._dirty = False
+        self._undo_log: Optional[Dict[str, Optional[tuple]]] = None
+        # Закритий менеджер відхиляє зміни (див. close())
+        self._closed = False
+        # Потік подій про зміни для зовнішніх споживачів
+        self.events = EventStream('contacts')
+        # Замок кешу найближчих днів народження, який заповнюють читачі
+        self._upcoming_lock = threading.Lock()
+        self._reset_indexes()
         self.load_contacts()
 
+    def _reset_indexes(self) -> None:
+        """Скидає всі похідні структури, що супроводжують колекцію контактів"""
+        # Знімок ознак, з якими контакт потрапив у лічильники: (телефони, emails,
+        # день народження, адреса). Саме він використовується при видаленні,
+        # тому лічильники коректні навіть після редагування контакту "на місці".
+        self._contact_flags: Dict[str, Tuple[bool, bool, bool, bool]] = {}
+        self._stat_counts = [0, 0, 0, 0]
+        # Кеш кількості найближчих днів народження: {days_ahead: кількість},
+        # дійсний лише протягом дня _upcoming_cache_day
+        self._upcoming_cache: Dict[int, int] = {}
+        self._upcoming_cache_day: Optional[date] = None
+        self._upcoming_days: Dict[str, Optional[int]] = {}
+        # Відсортовані представлення для впорядкованого та посторінкового виводу
+        self._name_view = SortedIndex()
+        self._birthday_view = SortedIndex()
+        # Дати народження як порядкові номери дня (date.toordinal()) для
+        # діапазонних запитів; містить лише контакти з днем народження
+        self._birthdate_view = SortedIndex()
+        # Індекси для структурованих запитів: {(вид, значення): ключі контактів}
+        # для ('has', поле), ('phone', номер), ('domain', домен), ('month', місяць),
+        # ('phonetic', код) - фонетичні коди імені та його слів,
+        # а також відсортовані слова імен для пошуку за префіксом
+        self._term_postings: Dict[tuple, set] = {}
+        self._query_terms: Dict[str, Tuple[List[tuple], List[str]]] = {}
+        self._name_words = SortedIndex()
+        # Пошукові ключі імен: транслітерована форма без діакритики, щоб
+        # "ivan" знаходив "Іван" і навпаки без транслітерації під час запиту
+        self._search_keys: Dict[str, str] = {}
+
+    @staticmethod
+    def _birthday_sort_key(contact: Contact) -> Tuple[int, ...]:
+        """
+        Повертає ключ сортування за днем народження
+        
+        Контакти з днем народження впорядковуються за (місяць, день), решта
+        йде в кінець. Порядок "за найближчим днем народження" є циклічним
+        зсувом цього порядку, що починається з поточної дати.
+        """
+        if contact.birthday is None:
+            return (1,)
+        value = contact.birthday.value  # DD.MM.YYYY
+        return (0, int(value[3:5]), int(value[0:2]))
+
+    @staticmethod
+    def _birth_ordinal(contact: Contact) -> Optional[int]:
+        """Повертає дату народження як порядковий номер дня без розбору через strptime"""
+        if contact.birthday is None:
+            return None
+        value = contact.birthday.value  # DD.MM.YYYY
+        return date(int(value[6:10]), int(value[3:5]), int(value[0:2])).toordinal()
+
+    @staticmethod
+    def _query_terms_of(name_key: str, search_key: str,
+                        contact: Contact) -> Tuple[List[tuple], List[str]]:
+        """
+        Повертає ключі індексів структурованих запитів та слова імені контакту
+        
+        До слів імені додаються й слова пошукового ключа, тож префікс name:ivan*
+        знаходить "Іван".
+        """
+        terms = []
+        if contact.phones:
+            terms.append(('has', 'phone'))
+        if contact.emails:
+            terms.append(('has', 'email'))
+        if contact.birthday is not None:
+            terms.append(('has', 'birthday'))
+            terms.append(('month', int(contact.birthday.value[3:5])))
+        if contact.address is not None:
+            terms.append(('has', 'address'))
+        terms.extend(('phone', phone.value) for phone in contact.phones)
+        terms.extend({('domain', email.value.rsplit('@', 1)[-1]) for email in contact.emails})
+        name_code = folded_phonetic_key(search_key)
+        terms.extend(('phonetic', code) for code in {name_code} | set(name_code.split()))
+        return terms, sorted(set(name_key.split()) | set(search_key.split()))
+
+    def _index_contact(self, name_key: str, contact: Contact) -> None:
+        """
+        Реєструє контакт у лічильниках статистики та індексах
+        
+        Args:
+            name_key (str): Ключ контакту (ім'я у нижньому регістрі)
+            contact (Contact): Контакт для реєстрації
+        """
+        self._version += 1
+        flags = (bool(contact.phones), bool(contact.emails),
+                 contact.birthday is not None, contact.address is not None)
+        self._contact_flags[name_key] = flags
+        for i, flag in enumerate(flags):
+            self._stat_counts[i] += flag
+        
+        self._name_view.add(name_key, name_key)
+        self._birthday_view.add(name_key, self._birthday_sort_key(contact))
+        ordinal = self._birth_ordinal(contact)
+        if ordinal is not None:
+            self._birthdate_view.add(name_key, ordinal)
+        
+        search_key = fold_text(contact.name.value)
+        self._search_keys[name_key] = search_key
+        terms, words = self._query_terms_of(name_key, search_key, contact)
+        self._query_terms[name_key] = (terms, words)
+        for term in terms:
+            self._term_postings.setdefault(term, set()).add(name_key)
+        for word in words:
+            self._name_words.add((word, name_key), word)
+        
+        if self._upcoming_cache:
+            days = self._safe_days_to_birthday(contact)
+            self._upcoming_days[name_key] = days
+            self._adjust_upcoming_cache(days, 1)
+
+    def _unindex_contact(self, name_key: str) -> None:
+        """
+        Прибирає контакт з лічильників статистики та індексів за збереженим знімком
+        
+        Args:
+            name_key (str): Ключ контакту (ім'я у нижньому регістрі)
+        """
+        self._version += 1
+        flags = self._contact_flags.pop(name_key, None)
+        if flags is None:
+            return
+        for i, flag in enumerate(flags):
+            self._stat_counts[i] -= flag
+        
+        self._name_view.remove(name_key)
+        self._birthday_view.remove(name_key)
+        self._birthdate_view.remove(name_key)
+        
+        del self._search_keys[name_key]
+        terms, words = self._query_terms.pop(name_key)
+        for term in terms:
+            postings = self._term_postings[term]
+            postings.discard(name_key)
+            if not postings:
+                del self._term_postings[term]
+        for word in words:
+            self._name_words.remove((word, name_key))
+        
+        if self._upcoming_cache:
+            self._adjust_upcoming_cache(self._upcoming_days.pop(name_key, None), -1)
+
+    def _adjust_upcoming_cache(self, days: Optional[int], delta: int) -> None:
+        """Коригує закешовані кількості найближчих днів народження"""
+        if days is None:
+            return
+        for days_ahead in self._upcoming_cache:
+            if days <= days_ahead:
+                self._upcoming_cache[days_ahead] += delta
+
+    @staticmethod
+    def _safe_days_to_birthday(contact: Contact) -> Optional[int]:
+        """Повертає кількість днів до дня народження або None, якщо її не обчислити"""
+        try:
+            return contact.days_to_birthday()
+        except ValueError:
+            return None
+
+    @write_locked
     def load_contacts(self) -> None:
-        """Завантажує контакти з файлового сховища"""
+        """
+        Завантажує контакти з файлового сховища
+        
+        Відсортовані представлення наповнюються масово і сортуються один
+        раз, а не вставкою кожного контакту.
+        """
         try:
             contacts_data = self.storage.load_data('contacts')
             if isinstance(contacts_data, dict):
-                for contact_data in contacts_data.values():
-                    try:
-                        contact = Contact.from_dict(contact_data)
-                        self._contacts[contact.name.value.lower()] = contact
-                    except (ValueError, KeyError) as e:
-                        print(f"Помилка завантаження контакту: {e}")
+                with self._bulk_views():
+                    self._load_contacts_data(contacts_data)
         except FileNotFoundError:
             # Файл не існує, починаємо з порожньої колекції
             self._contacts = {}
+            self._reset_indexes()
         except Exception as e:
             print(f"Помилка завантаження контактів: {e}")
             self._contacts = {}
+            self._reset_indexes()
+
+    def _load_contacts_data(self, contacts_data: Dict[str, Any]) -> None:
+        """Додає до колекції контакти зі збережених даних"""
+        for contact_data in contacts_data.values():
+            try:
+                contact = Contact.from_dict(contact_data)
+                name_key = contact.name.value.lower()
+                if name_key in self._contacts:
+                    self._unindex_contact(name_key)
+                self._contacts[name_key] = contact
+                self._index_contact(name_key, contact)
+            except (ValueError, KeyError) as e:
+                print(f"Помилка завантаження контакту: {e}")
+
+    @contextmanager
+    def _bulk_views(self):
+        """Контекст масового наповнення всіх відсортованих представлень"""
+        with self._name_view.bulk(), self._birthday_view.bulk(), \
+                self._birthdate_view.bulk(), self._name_words.bulk():
+            yield
 
+    @write_locked
     def save_contacts(self) -> None:
         """Зберігає контакти у файлове сховище"""
         try:
@@ -53,9 +307,119 @@ class ContactManager:
                 for name, contact in self._contacts.items()
             }
             self.storage.save_data('contacts', contacts_data)
+            self._dirty = False
         except Exception as e:
             print(f"Помилка збереження контактів: {e}")
 
+    def close(self) -> None:
+        """
+        Зберігає колекцію та закриває менеджер
+        
+        Після закриття всі зміни та збереження відхиляються з RuntimeError,
+        тож застарілий менеджер не перезапише дані, які вже завантажив
+        інший менеджер тієї самої папки. Читання залишаються доступними.
+        """
+        with self._lock.write_lock():
+            if not self._closed:
+                self.save_contacts()
+                self._closed = True
+
+    def _commit(self) -> None:
+        """Зберігає зміни або відкладає збереження до кінця пакета"""
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save_contacts()
+
+    @contextmanager
+    def batch(self):
+        """
+        Контекст пакетних змін з одним збереженням наприкінці
+        
+        Усі add_*, update_* та remove_* всередині блоку не зберігають дані
+        одразу - колекція зберігається один раз при виході з блоку. Якщо з
+        блоку виходить виняток, стан колекції в пам'яті відкочується до
+        стану на початку пакета, а файл не змінюється. Для відкату пакет
+        запам'ятовує лише контакти, які змінюють методи менеджера, тож його
+        вартість залежить від кількості змінених контактів, а не від розміру
+        колекції (видалені контакти повертаються в кінець порядку додавання).
+        Вкладені пакети приєднуються до зовнішнього. Події змін доставляються підписникам
+        після збереження пакета, а при відкаті відкидаються.
+        
+        Пакет виконується під ексклюзивним блокуванням, тож інші потоки не
+        бачать проміжного стану.
+        
+        Yields:
+            ContactManager: Цей менеджер
+        """
+        with self._lock.write_lock():
+            if self._batch_depth:
+                self._batch_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+            
+            was_dirty = self._dirty
+            self._batch_depth = 1
+            self._undo_log = {}
+            self.events.hold()
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth = 0
+                self._rollback(self._undo_log)
+                self._undo_log = None
+                self._dirty = was_dirty
+                self.events.discard()
+                raise
+            self._batch_depth = 0
+            self._undo_log = None
+            if self._dirty:
+                self.save_contacts()
+            self.events.release()
+
+    def _remember(self, name_key: str) -> None:
+        """
+        Записує у журнал відкату стан контакту перед його першою зміною в пакеті
+        
+        Поля (Name, Phone, ...) після створення не змінюються, тому достатньо
+        запам'ятати посилання на них, а не копіювати значення.
+        """
+        if self._undo_log is None or name_key in self._undo_log:
+            return
+        contact = self._contacts.get(name_key)
+        self._undo_log[name_key] = None if contact is None else (
+            contact, contact.name, list(contact.phones), list(contact.emails),
+            contact.birthday, contact.address
+        )
+
+    def _rollback(self, undo_log: Dict[str, Optional[tuple]]) -> None:
+        """
+        Повертає змінені в пакеті контакти до стану з журналу відкату
+        
+        Переіндексовуються лише ці контакти; коли їх багато, відсортовані
+        представлення наповнюються масово, а не вставкою кожного.
+        """
+        views = self._bulk_views() if len(undo_log) > self.BULK_ROLLBACK_SIZE else nullcontext()
+        with views:
+            for name_key, saved in undo_log.items():
+                if name_key in self._contacts:
+                    self._unindex_contact(name_key)
+                    if saved is None:
+                        del self._contacts[name_key]
+                if saved is not None:
+                    contact, name, phones, emails, birthday, address = saved
+                    contact.name = name
+                    contact.phones[:] = phones
+                    contact.emails[:] = emails
+                    contact.birthday = birthday
+                    contact.address = address
+                    self._contacts[name_key] = contact
+                    self._index_contact(name_key, contact)
+
+    @write_locked
     def add_contact(self, contact: Contact) -> None:
         """
         Додає новий контакт до колекції
@@ -71,9 +435,246 @@ class ContactManager:
         if name_key in self._contacts:
             raise ValueError(f"Контакт з ім'ям '{contact.name.value}' вже існує")
         
+        self._remember(name_key)
         self._contacts[name_key] = contact
-        self.save_contacts()
+        self._index_contact(name_key, contact)
+        self.events.publish(ChangeEvent.ADDED, None, name_key, contact)
+        self._commit()
 
+    def _merge_into(self, target: Contact, source: Contact, overwrite: bool = True) -> None:
+        """
+        Зливає дані контакту source у контакт target, що вже є в колекції
+        
+        Телефони та emails об'єднуються. День народження та адреса беруться
+        з source, якщо вони там вказані і overwrite=True або у target їх немає.
+        """
+        name_key = target.name.value.lower()
+        self._remember(name_key)
+        self._unindex_contact(name_key)
+        
+        known_phones = {phone.value for phone in target.phones}
+        target.phones.extend(phone for phone in source.phones if phone.value not in known_phones)
+        known_emails = {email.value for email in target.emails}
+        target.emails.extend(email for email in source.emails if email.value not in known_emails)
+        if source.birthday is not None and (overwrite or target.birthday is None):
+            target.birthday = source.birthday
+        if source.address is not None and (overwrite or target.address is None):
+            target.address = source.address
+        
+        self._index_contact(name_key, target)
+        self.events.publish(ChangeEvent.UPDATED, name_key, name_key, target)
+
+    @write_locked
+    def add_contacts_bulk(self, records: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                          chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Масово імпортує контакти з сирих словників
+        
+        Валідація записів (регулярні вирази, розбір дат) виконується пачками
+        у ProcessPoolExecutor, а злиття з колекцією - у поточному процесі.
+        Записи з ім'ям, що вже є в колекції або раніше в імпорті, зливаються
+        з наявним контактом. Уся операція зберігається один раз.
+        
+        Args:
+            records (Iterable[Dict[str, Any]]): Словники у форматі Contact.to_dict()
+            workers (Optional[int]): Кількість процесів (None - кількість ядер,
+                1 - валідація у поточному процесі)
+            chunk_size (int): Кількість записів у пачці для одного процесу
+            
+        Returns:
+            Dict[str, Any]: Підсумок імпорту з ключами 'added', 'merged'
+            та 'errors' (список (позиція_запису, повідомлення))
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        summary = {'added': 0, 'merged': 0, 'errors': []}
+        
+        def merge(contacts: List[Contact], errors: List[Tuple[int, str]]) -> None:
+            summary['errors'].extend(errors)
+            for contact in contacts:
+                name_key = contact.name.value.lower()
+                existing = self._contacts.get(name_key)
+                if existing is None:
+                    self._remember(name_key)
+                    self._contacts[name_key] = contact
+                    self._index_contact(name_key, contact)
+                    self.events.publish(ChangeEvent.ADDED, None, name_key, contact)
+                    summary['added'] += 1
+                else:
+                    self._merge_into(existing, contact)
+                    summary['merged'] += 1
+        
+        iterator = iter(records)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        
+        with self.batch():
+            if workers <= 1:
+                offset = 0
+                for chunk in chunks:
+                    merge(*_build_contacts(chunk, offset))
+                    offset += len(chunk)
+            else:
+                # Обмежуємо кількість пачок "у польоті", щоб не читати весь вхід
+                # у пам'ять, і зливаємо результати у вхідному порядку
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = deque()
+                    offset = 0
+                    for chunk in chunks:
+                        pending.append(executor.submit(_build_contacts, chunk, offset))
+                        offset += len(chunk)
+                        if len(pending) >= workers * 2:
+                            merge(*pending.popleft().result())
+                    while pending:
+                        merge(*pending.popleft().result())
+            
+            if summary['added'] or summary['merged']:
+                self._commit()
+        
+        return summary
+
+    @read_locked
+    def find_similar_names(self, name: str, limit: int = 5) -> List[str]:
+        """
+        Знаходить імена контактів, схожі на вказане за звучанням
+        
+        Кандидати беруться з фонетичного індексу (ключ усього імені та
+        кожного його слова - кілька звертань до словника), а потім
+        упорядковуються за схожістю написання транслітерованих форм.
+        
+        Args:
+            name (str): Ім'я, можливо з помилками або іншим алфавітом
+            limit (int): Максимальна кількість імен
+            
+        Returns:
+            List[str]: Імена контактів від найсхожішого
+        """
+        folded = fold_text(name)
+        name_code = folded_phonetic_key(folded)
+        if not name_code:
+            return []
+        
+        candidates = set()
+        for code in {name_code} | set(name_code.split()):
+            candidates |= self._term_postings.get(('phonetic', code), set())
+        
+        best = heapq.nsmallest(limit, candidates, key=lambda name_key: (
+            -SequenceMatcher(None, folded, self._search_keys[name_key]).ratio(), name_key
+        ))
+        return [self._contacts[name_key].name.value for name_key in best]
+
+    @staticmethod
+    def _are_duplicates(first: Contact, second: Contact) -> bool:
+        """
+        Перевіряє, чи описують два контакти одну людину
+        
+        Контакти вважаються дублікатами, якщо їхні імена збігаються незалежно
+        від алфавіту та порядку слів, або якщо вони мають спільний телефон чи
+        email і схожі імена (одне містить інше або вони близькі за написанням).
+        """
+        first_key = name_block_key(first.name.value)
+        second_key = name_block_key(second.name.value)
+        if first_key == second_key:
+            return True
+        
+        shares_contact_point = (
+            {phone.value for phone in first.phones} & {phone.value for phone in second.phones}
+            or {email.value for email in first.emails} & {email.value for email in second.emails}
+        )
+        if not shares_contact_point:
+            return False
+        
+        first_words, second_words = set(first_key.split()), set(second_key.split())
+        if first_words <= second_words or second_words <= first_words:
+            return True
+        return SequenceMatcher(None, first_key, second_key).ratio() >= 0.75
+
+    @read_locked
+    def find_duplicates(self, max_block_size: int = 50) -> List[List[Contact]]:
+        """
+        Знаходить групи контактів, що ймовірно описують одну людину
+        
+        Контакти розбиваються на блоки за нормалізованим телефоном, email та
+        транслітерованим ім'ям, і попарно порівнюються лише в межах блоку.
+        Завдяки цьому вартість близька до лінійної, а не O(n²). Надто великі
+        блоки (наприклад, спільний офісний телефон) пропускаються.
+        
+        Args:
+            max_block_size (int): Максимальний розмір блоку для порівняння
+            
+        Returns:
+            List[List[Contact]]: Групи дублікатів (по два і більше контакти)
+        """
+        blocks: Dict[Tuple[str, str], List[str]] = {}
+        for name_key, contact in self._contacts.items():
+            keys = [('name', name_block_key(contact.name.value))]
+            keys.extend(('phone', phone.value) for phone in contact.phones)
+            keys.extend(('email', email.value) for email in contact.emails)
+            for key in set(keys):
+                blocks.setdefault(key, []).append(name_key)
+        
+        # Об'єднуємо дублікати у групи через систему неперетинних множин
+        parent: Dict[str, str] = {}
+        
+        def find(key: str) -> str:
+            parent.setdefault(key, key)
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+        
+        for members in blocks.values():
+            if len(members) < 2 or len(members) > max_block_size:
+                continue
+            for i, first_key in enumerate(members):
+                for second_key in members[i + 1:]:
+                    if find(first_key) == find(second_key):
+                        continue
+                    if self._are_duplicates(self._contacts[first_key], self._contacts[second_key]):
+                        parent[find(second_key)] = find(first_key)
+        
+        groups: Dict[str, List[Contact]] = {}
+        for name_key in parent:
+            groups.setdefault(find(name_key), []).append(self._contacts[name_key])
+        
+        return [
+            sorted(group, key=lambda c: c.name.value.lower())
+            for group in groups.values() if len(group) > 1
+        ]
+
+    @write_locked
+    def merge_contacts(self, target_name: str, source_name: str) -> Optional[Contact]:
+        """
+        Зливає контакт source у контакт target і видаляє source
+        
+        Телефони та emails об'єднуються; день народження та адреса target
+        зберігаються, а відсутні заповнюються з source. Зміни зберігаються
+        один раз. Пакет злиття запам'ятовує для відкату лише два контакти,
+        тож злиття не копіює колекцію; щоб злиття багатьох дублікатів
+        зберігалося один раз, їх варто виконувати в спільному batch().
+        
+        Args:
+            target_name (str): Ім'я контакту, що залишається
+            source_name (str): Ім'я контакту, що поглинається
+            
+        Returns:
+            Optional[Contact]: Об'єднаний контакт або None, якщо якогось із контактів немає
+            
+        Raises:
+            ValueError: Якщо обидва імені вказують на той самий контакт
+        """
+        target = self.find_contact(target_name)
+        source = self.find_contact(source_name)
+        if target is None or source is None:
+            return None
+        if target is source:
+            raise ValueError("Неможливо об'єднати контакт сам із собою")
+        
+        with self.batch():
+            self._merge_into(target, source, overwrite=False)
+            self.remove_contact(source_name)
+        return target
+
+    @write_locked
     def remove_contact(self, name: str) -> bool:
         """
         Видаляє контакт з колекції
@@ -87,11 +688,15 @@ class ContactManager:
         name_key = name.lower()
         
         if name_key in self._contacts:
-            del self._contacts[name_key]
-            self.save_contacts()
+            self._remember(name_key)
+            contact = self._contacts.pop(name_key)
+            self._unindex_contact(name_key)
+            self.events.publish(ChangeEvent.REMOVED, name_key, None, contact)
+            self._commit()
             return True
         return False
 
+    @read_locked
     def find_contact(self, name: str) -> Optional[Contact]:
         """
         Знаходить контакт за точним ім'ям
@@ -104,47 +709,305 @@ class ContactManager:
         """
         return self._contacts.get(name.lower())
 
-    def search_contacts(self, query: str) -> List[Contact]:
+    # Рівні релевантності збігу: менше значення - вищий ранг
+    RANK_EXACT_NAME = 0
+    RANK_NAME_PREFIX = 1
+    RANK_NAME_SUBSTRING = 2
+    RANK_PHONE = 3
+    RANK_EMAIL = 4
+    RANK_ADDRESS = 5
+
+    def _search_key(self, contact: Contact) -> str:
+        """Повертає попередньо обчислений пошуковий ключ імені контакту"""
+        search_key = self._search_keys.get(contact.name.value.lower())
+        if search_key is None:
+            # Контакт ще (або вже) не в колекції - обчислюємо на місці
+            search_key = fold_text(contact.name.value)
+        return search_key
+
+    def _match_rank(self, contact: Contact, query: str, query_lower: str,
+                    query_folded: str) -> Optional[int]:
+        """
+        Визначає рівень релевантності збігу контакту з пошуковим запитом
+        
+        Ім'я порівнюється і як є, і у транслітерованій формі (пошуковий ключ),
+        тож латиниця знаходить кирилицю і навпаки з тим самим рівнем.
+        
+        Args:
+            contact (Contact): Контакт для перевірки
+            query (str): Пошуковий запит
+            query_lower (str): Пошуковий запит у нижньому регістрі
+            query_folded (str): Пошуковий запит, оброблений fold_text()
+            
+        Returns:
+            Optional[int]: Рівень релевантності (RANK_*) або None, якщо збігу немає
+        """
+        # Пошук в імені
+        name_lower = contact.name.value.lower()
+        for name_form, query_form in ((name_lower, query_lower),
+                                      (self._search_key(contact), query_folded)):
+            if query_form and query_form in name_form:
+                if name_form == query_form:
+                    return self.RANK_EXACT_NAME
+                if name_form.startswith(query_form):
+                    return self.RANK_NAME_PREFIX
+                return self.RANK_NAME_SUBSTRING
+        
+        # Пошук у телефонах
+        if any(query in phone.value for phone in contact.phones):
+            return self.RANK_PHONE
+        
+        # Пошук в emails
+        if any(query_lower in email.value.lower() for email in contact.emails):
+            return self.RANK_EMAIL
+        
+        # Пошук в адресі
+        if contact.address and query_lower in contact.address.value.lower():
+            return self.RANK_ADDRESS
+        
+        return None
+
+    @read_locked
+    def iter_search(self, query: str, limit: Optional[int] = None) -> Iterator[Contact]:
+        """
+        Ліниво шукає контакти за частковим збігом у різних полях
+        
+        Результати видаються по одному, тому пошук зупиняється одразу після
+        того, як викликач отримав потрібну кількість контактів. Перевірка
+        йде по знімку колекції і не блокує запис.
+        
+        Args:
+            query (str): Пошуковий запит
+            limit (Optional[int]): Максимальна кількість результатів
+            
+        Returns:
+            Iterator[Contact]: Знайдені контакти
+        """
+        contacts = list(self._contacts.values())
+        return islice(self._filter_contacts(contacts, query), limit)
+
+    def _filter_contacts(self, contacts: List[Contact], query: str) -> Iterator[Contact]:
+        """Ліниво відбирає з контактів ті, що збігаються з пошуковим запитом"""
+        if not query:
+            yield from contacts
+            return
+        
+        query_lower, query_folded = query.lower(), fold_text(query)
+        for contact in contacts:
+            if self._match_rank(contact, query, query_lower, query_folded) is not None:
+                yield contact
+
+    @read_locked
+    def search_contacts(self, query: str, ranked: bool = False,
+                        limit: Optional[int] = None, explain: bool = False) -> List[Contact]:
         """
         Шукає контакти за частковим збігом у різних полях
         
+        У режимі ranked результати впорядковуються за релевантністю: точне
+        ім'я, початок імені, частина імені, телефон, email, адреса (у межах
+        рівня - за ім'ям). З limit зберігаються лише найкращі limit збігів
+        у купі heapq, тож пам'ять становить O(limit) навіть для широких запитів.
+        
+        Запит з умовами виду поле:значення (наприклад,
+        "has:phone birthday:03 domain:example.com name:петр*") виконується
+        планувальником з contact_query: він стартує з найвибірковішого
+        індексу, а решту умов перевіряє лише на кандидатах.
+        
         Args:
             query (str): Пошуковий запит
+            ranked (bool): Чи впорядковувати результати за релевантністю
+            limit (Optional[int]): Максимальна кількість результатів
+            explain (bool): Вивести план структурованого запиту з кількостями кандидатів
             
         Returns:
             List[Contact]: Список знайдених контактів
+            
+        Raises:
+            ValueError: Якщо умова структурованого запиту неправильна
         """
+        # Пошук за телефоном чутливий лише до цифр, тому нижній регістр
+        # не змінює результат і годиться для нормалізації ключа
+        cache_key = ('search', query.lower(), ranked, limit)
+        if not explain:
+            cached = self._cache.get(cache_key, self._version)
+            if cached is not VersionedLRUCache.MISS:
+                return list(cached)
+        
+        if is_structured_query(query):
+            results = self._search_structured(query, ranked, limit, explain)
+        else:
+            results = self._search_contacts(query, ranked, limit)
+        self._cache.put(cache_key, self._version, results)
+        return list(results)
+
+    def _search_contacts(self, query: str, ranked: bool, limit: Optional[int]) -> List[Contact]:
+        """Виконує пошук контактів без кешу (див. search_contacts)"""
+        if not ranked:
+            return list(self.iter_search(query, limit))
         if not query:
-            return list(self._contacts.values())
+            # Як і _filter_contacts, порожній запит збігається з усіма
+            # контактами з однаковим рівнем, тож порядок - за ім'ям
+            return [self._contacts[name_key] for name_key in self._name_view.iter_keys(0, limit)]
         
-        query_lower = query.lower()
-        found_contacts = []
+        query_lower, query_folded = query.lower(), fold_text(query)
+        scored = (
+            (rank, name_key, contact)
+            for name_key, contact in self._contacts.items()
+            for rank in (self._match_rank(contact, query, query_lower, query_folded),)
+            if rank is not None
+        )
+        if limit is None:
+            best = sorted(scored, key=lambda item: item[:2])
+        else:
+            best = heapq.nsmallest(limit, scored, key=lambda item: item[:2])
+        return [contact for _, _, contact in best]
+
+    def _search_structured(self, query: str, ranked: bool, limit: Optional[int],
+                           explain: bool) -> List[Contact]:
+        """
+        Виконує структурований запит через план (див. search_contacts)
         
-        for contact in self._contacts.values():
-            # Пошук в імені
-            if query_lower in contact.name.value.lower():
-                found_contacts.append(contact)
-                continue
+        Результати впорядковуються за ім'ям, а в режимі ranked - спершу за
+        найкращим рівнем релевантності умов вільного тексту.
+        """
+        plan = QueryPlan(self, parse_query(self, query))
+        name_keys = plan.execute()
+        if explain:
+            print(plan.explain())
+        
+        terms = [(term, term.lower(), fold_text(term)) for term in free_text_terms(query)] if ranked else []
+        
+        def sort_key(name_key: str) -> tuple:
+            contact = self._contacts[name_key]
+            ranks = [self._match_rank(contact, *term) for term in terms]
+            return (min(ranks) if ranks else 0, name_key)
+        
+        if limit is None:
+            best = sorted(name_keys, key=sort_key)
+        else:
+            best = heapq.nsmallest(limit, name_keys, key=sort_key)
+        return [self._contacts[name_key] for name_key in best]
+
+    def _name_prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Повертає діапазон позицій слів імен, що починаються з префікса"""
+        start = self._name_words.bisect(prefix)
+        stop = self._name_words.bisect(prefix + '\U0010ffff')
+        return start, stop
+
+    def _estimate_candidates(self, predicate: Predicate) -> int:
+        """Оцінює кількість кандидатів індексованої умови без їх вибірки"""
+        if predicate.name_prefix is not None:
+            start, stop = self._name_prefix_range(predicate.name_prefix)
+            return stop - start
+        return len(self._term_postings.get(predicate.index_term, ()))
+
+    def _index_candidates(self, predicate: Predicate) -> set:
+        """Повертає ключі контактів - кандидатів індексованої умови"""
+        if predicate.name_prefix is not None:
+            start, stop = self._name_prefix_range(predicate.name_prefix)
+            return {word_key[1] for word_key in self._name_words.iter_keys(start, stop)}
+        return set(self._term_postings.get(predicate.index_term, ()))
+
+    def _sorted_view(self, sort_by: str) -> SortedIndex:
+        """
+        Повертає відсортоване представлення для критерію сортування
+        
+        Raises:
+            ValueError: Якщо критерій сортування невідомий
+        """
+        if sort_by == 'name':
+            return self._name_view
+        if sort_by == 'birthday':
+            return self._birthday_view
+        raise ValueError(f"Невідомий критерій сортування: {sort_by}")
+
+    @staticmethod
+    def _birthday_rotation(view: SortedIndex) -> Tuple[int, int]:
+        """
+        Повертає параметри циклічного зсуву порядку за днем народження
+        
+        Args:
+            view (SortedIndex): Представлення за днем народження
+            
+        Returns:
+            Tuple[int, int]: (кількість контактів з днем народження,
+            позиція першого дня народження, не раніше сьогоднішньої дати)
+        """
+        today = date.today()
+        with_birthdays = view.bisect((1,))
+        start = view.bisect((0, today.month, today.day))
+        return with_birthdays, start
+
+    def _iter_sorted_keys(self, sort_by: str, start: int = 0,
+                          view: Optional[SortedIndex] = None) -> Iterator[str]:
+        """
+        Ітерує ключі контактів у вказаному порядку, починаючи з логічної позиції
+        
+        Args:
+            sort_by (str): Критерій сортування ('name', 'birthday')
+            start (int): Логічна позиція (починається з 0)
+            view (Optional[SortedIndex]): Представлення (або його знімок) для
+                ітерації; за замовчуванням - поточне представлення менеджера
             
-            # Пошук у телефонах
-            for phone in contact.phones:
-                if query in phone.value:
-                    found_contacts.append(contact)
-                    break
+        Yields:
+            str: Ключі контактів
+        """
+        if view is None:
+            view = self._sorted_view(sort_by)
+        if sort_by == 'name':
+            yield from view.iter_keys(start)
+            return
+        
+        with_birthdays, rotation = self._birthday_rotation(view)
+        for logical in range(start, len(view)):
+            if logical < with_birthdays:
+                yield view.key_at((rotation + logical) % with_birthdays)
             else:
-                # Пошук в emails
-                for email in contact.emails:
-                    if query_lower in email.value.lower():
-                        found_contacts.append(contact)
-                        break
-                else:
-                    # Пошук в адресі
-                    if (contact.address and 
-                        query_lower in contact.address.value.lower()):
-                        found_contacts.append(contact)
+                yield view.key_at(logical)
+
+    def _logical_position(self, sort_by: str, name_key: str) -> int:
+        """
+        Повертає логічну позицію контакту у вказаному порядку
         
-        return found_contacts
+        Raises:
+            ValueError: Якщо критерій сортування невідомий
+            KeyError: Якщо контакту немає в колекції
+        """
+        view = self._sorted_view(sort_by)
+        position = view.position_of(name_key)
+        if position is None:
+            raise KeyError(name_key)
+        
+        if sort_by == 'birthday':
+            with_birthdays, rotation = self._birthday_rotation(view)
+            if position < with_birthdays:
+                position = (position - rotation) % with_birthdays
+        return position
 
+    @read_locked
+    def iter_all(self, sort_by: str = 'name', limit: Optional[int] = None) -> Iterator[Contact]:
+        """
+        Ліниво ітерує всі контакти у вказаному порядку
+        
+        Ітерація йде по знімку колекції, тому не блокує запис і не
+        ламається, якщо колекцію змінюють під час перегляду.
+        
+        Args:
+            sort_by (str): Критерій сортування ('name', 'birthday')
+            limit (Optional[int]): Максимальна кількість контактів
+            
+        Returns:
+            Iterator[Contact]: Контакти у відсортованому порядку
+        """
+        contacts = self._contacts.copy()
+        if sort_by in ('name', 'birthday'):
+            view = self._sorted_view(sort_by).snapshot()
+            ordered = (contacts[key] for key in self._iter_sorted_keys(sort_by, view=view))
+        else:
+            ordered = iter(contacts.values())
+        return islice(ordered, limit)
+
+    @read_locked
     def get_all_contacts(self, sort_by: str = 'name') -> List[Contact]:
         """
         Повертає всі контакти, відсортовані за вказаним критерієм
@@ -155,22 +1018,91 @@ class ContactManager:
         Returns:
             List[Contact]: Відсортований список контактів
         """
-        contacts = list(self._contacts.values())
+        return list(self.iter_all(sort_by))
+
+    @read_locked
+    def page(self, sort_by: str = 'name', after: Optional[str] = None,
+             limit: int = 20) -> Tuple[List[Contact], Optional[str]]:
+        """
+        Повертає сторінку контактів у вказаному порядку
         
-        if sort_by == 'name':
-            contacts.sort(key=lambda c: c.name.value.lower())
-        elif sort_by == 'birthday':
-            # Спочатку контакти з днями народження, потім без
-            def birthday_key(contact):
-                if contact.birthday is None:
-                    return (1, contact.name.value.lower())  # Без дня народження - в кінець
-                days = contact.days_to_birthday()
-                return (0, days if days is not None else 365, contact.name.value.lower())
+        Сторінка будується з підтримуваних відсортованих представлень, тому
+        її вартість пропорційна розміру сторінки, а не колекції.
+        
+        Args:
+            sort_by (str): Критерій сортування ('name', 'birthday')
+            after (Optional[str]): Курсор - ключ останнього контакту попередньої сторінки
+            limit (int): Максимальна кількість контактів на сторінці
+            
+        Returns:
+            Tuple[List[Contact], Optional[str]]: Контакти сторінки та курсор
+            наступної сторінки (None, якщо сторінка остання)
             
-            contacts.sort(key=birthday_key)
+        Raises:
+            ValueError: Якщо критерій сортування невідомий
+            KeyError: Якщо контакт-курсор не знайдено
+        """
+        start = 0 if after is None else self._logical_position(sort_by, after.lower()) + 1
+        keys = list(islice(self._iter_sorted_keys(sort_by, start), limit))
         
-        return contacts
+        has_more = start + len(keys) < len(self._contacts)
+        next_cursor = keys[-1] if keys and has_more else None
+        return [self._contacts[key] for key in keys], next_cursor
+
+    @staticmethod
+    def _years_before(day: date, years: int) -> date:
+        """Повертає ту саму календарну дату years років тому (29.02 -> 28.02)"""
+        try:
+            return day.replace(year=day.year - years)
+        except ValueError:
+            return day.replace(year=day.year - years, day=28)
+
+    @read_locked
+    def born_between(self, start: date, end: date) -> Iterator[Contact]:
+        """
+        Ліниво ітерує контакти, народжені між двома датами (включно)
+        
+        Межі діапазону знаходяться бінарним пошуком у відсортованому індексі
+        дат народження, тож вартість - O(log n + k) для k результатів, а
+        дати контактів не розбираються при кожному запиті. Контакти
+        повертаються від найстаршого до наймолодшого; видалені після
+        виклику контакти пропускаються.
+        
+        Args:
+            start (date): Перша дата діапазону
+            end (date): Остання дата діапазону
+            
+        Returns:
+            Iterator[Contact]: Контакти, народжені у діапазоні
+        """
+        keys = self._birthdate_view.keys_between(start.toordinal(), end.toordinal() + 1)
+        contacts = self._contacts
+        return (contact for contact in map(contacts.get, keys) if contact is not None)
 
+    @read_locked
+    def age_bracket(self, lo: int, hi: int) -> Iterator[Contact]:
+        """
+        Ліниво ітерує контакти, вік яких сьогодні від lo до hi років (включно)
+        
+        Args:
+            lo (int): Мінімальний вік
+            hi (int): Максимальний вік
+            
+        Returns:
+            Iterator[Contact]: Контакти від найстаршого до наймолодшого
+            
+        Raises:
+            ValueError: Якщо межі віку неправильні
+        """
+        if lo < 0 or hi < lo:
+            raise ValueError("Межі віку мають бути невід'ємними, а мінімальний вік - не більшим за максимальний")
+        today = date.today()
+        # Вік hi ще триває для тих, чий (hi + 1)-й день народження не настав
+        start = self._years_before(today, hi + 1) + timedelta(days=1)
+        end = self._years_before(today, lo)
+        return self.born_between(start, end)
+
+    @read_locked
     def get_upcoming_birthdays(self, days_ahead: int = 7) -> List[Contact]:
         """
         Повертає контакти з днями народження в найближчі дні
@@ -181,6 +1113,11 @@ class ContactManager:
         Returns:
             List[Contact]: Список контактів з найближчими днями народження
         """
+        cache_key = ('upcoming', days_ahead, date.today())
+        cached = self._cache.get(cache_key, self._version)
+        if cached is not VersionedLRUCache.MISS:
+            return list(cached)
+        
         upcoming_contacts = []
         
         for contact in self._contacts.values():
@@ -192,12 +1129,17 @@ class ContactManager:
         # Сортуємо за кількістю днів до дня народження
         upcoming_contacts.sort(key=lambda c: c.days_to_birthday() or 0)
         
-        return upcoming_contacts
+        self._cache.put(cache_key, self._version, upcoming_contacts)
+        return list(upcoming_contacts)
 
+    @write_locked
     def update_contact(self, name: str, **kwargs) -> Optional[Contact]:
         """
         Оновлює інформацію про контакт
         
+        Виклик без полів фіксує зміни, внесені у контакт безпосередньо
+        (наприклад, під час редагування у CLI), та зберігає колекцію.
+        
         Args:
             name (str): Ім'я контакту для оновлення
             **kwargs: Поля для оновлення (phones, emails, birthday, address)
@@ -212,49 +1154,95 @@ class ContactManager:
         if not contact:
             return None
         
-        # Оновлюємо телефони
-        if 'phones' in kwargs:
-            contact.phones.clear()
-            for phone in kwargs['phones']:
-                contact.add_phone(phone)
-        
-        # Оновлюємо emails
-        if 'emails' in kwargs:
-            contact.emails.clear()
-            for email in kwargs['emails']:
-                contact.add_email(email)
-        
-        # Оновлюємо день народження
-        if 'birthday' in kwargs:
-            if kwargs['birthday']:
-                contact.set_birthday(kwargs['birthday'])
-            else:
-                contact.remove_birthday()
-        
-        # Оновлюємо адресу
-        if 'address' in kwargs:
-            if kwargs['address']:
-                contact.set_address(kwargs['address'])
-            else:
-                contact.remove_address()
+        name_key = name.lower()
+        self._remember(name_key)
+        self._unindex_contact(name_key)
+        try:
+            # Оновлюємо телефони
+            if 'phones' in kwargs:
+                contact.phones.clear()
+                for phone in kwargs['phones']:
+                    contact.add_phone(phone)
+            
+            # Оновлюємо emails
+            if 'emails' in kwargs:
+                contact.emails.clear()
+                for email in kwargs['emails']:
+                    contact.add_email(email)
+            
+            # Оновлюємо день народження
+            if 'birthday' in kwargs:
+                if kwargs['birthday']:
+                    contact.set_birthday(kwargs['birthday'])
+                else:
+                    contact.remove_birthday()
+            
+            # Оновлюємо адресу
+            if 'address' in kwargs:
+                if kwargs['address']:
+                    contact.set_address(kwargs['address'])
+                else:
+                    contact.remove_address()
+        finally:
+            # Навіть при помилці валідації частина змін могла застосуватись
+            self._index_contact(name_key, contact)
         
-        self.save_contacts()
+        self.events.publish(ChangeEvent.UPDATED, name_key, name_key, contact)
+        self._commit()
         return contact
 
+    @read_locked
+    def count_upcoming_birthdays(self, days_ahead: int = 7) -> int:
+        """
+        Повертає кількість контактів з днями народження в найближчі дні
+        
+        Значення обчислюється один раз за календарний день для кожного
+        days_ahead, а далі підтримується інкрементально при змінах колекції.
+        Кеш заповнюється під окремим внутрішнім замком, тож метод виконується
+        під блокуванням на читання і не зупиняє інших читачів.
+        
+        Args:
+            days_ahead (int): Кількість днів наперед для пошуку
+            
+        Returns:
+            int: Кількість контактів з найближчими днями народження
+        """
+        today = date.today()
+        with self._upcoming_lock:
+            if self._upcoming_cache_day != today:
+                self._upcoming_cache = {}
+                self._upcoming_days = {}
+                self._upcoming_cache_day = today
+            
+            if days_ahead not in self._upcoming_cache:
+                if not self._upcoming_days and self._contacts:
+                    self._upcoming_days = {
+                        name_key: self._safe_days_to_birthday(contact)
+                        for name_key, contact in self._contacts.items()
+                    }
+                self._upcoming_cache[days_ahead] = sum(
+                    1 for days in self._upcoming_days.values()
+                    if days is not None and days <= days_ahead
+                )
+            
+            return self._upcoming_cache[days_ahead]
+
+    @read_locked
     def get_statistics(self) -> Dict[str, Any]:
         """
         Повертає статистику по контактах
         
+        Лічильники підтримуються при кожній зміні колекції, тому виклик
+        не залежить від кількості контактів.
+        
         Returns:
             Dict[str, Any]: Словник зі статистикою
         """
         total_contacts = len(self._contacts)
-        contacts_with_phones = sum(1 for c in self._contacts.values() if c.phones)
-        contacts_with_emails = sum(1 for c in self._contacts.values() if c.emails)
-        contacts_with_birthdays = sum(1 for c in self._contacts.values() if c.birthday)
-        contacts_with_addresses = sum(1 for c in self._contacts.values() if c.address)
+        (contacts_with_phones, contacts_with_emails,
+         contacts_with_birthdays, contacts_with_addresses) = self._stat_counts
         
-        upcoming_birthdays = len(self.get_upcoming_birthdays())
+        upcoming_birthdays = self.count_upcoming_birthdays()
         
         return {
             'total_contacts': total_contacts,
@@ -262,17 +1250,22 @@ class ContactManager:
             'with_emails': contacts_with_emails,
             'with_birthdays': contacts_with_birthdays,
             'with_addresses': contacts_with_addresses,
-            'upcoming_birthdays': upcoming_birthdays
+            'upcoming_birthdays': upcoming_birthdays,
+            'cache_hits': self._cache.hits,
+            'cache_misses': self._cache.misses
         }
 
+    @read_locked
     def __len__(self) -> int:
         """Повертає кількість контактів у колекції"""
         return len(self._contacts)
 
+    @read_locked
     def __iter__(self):
-        """Дозволяє ітерацію по контактах"""
-        return iter(self._contacts.values())
+        """Дозволяє ітерацію по знімку контактів"""
+        return iter(list(self._contacts.values()))
 
+    @read_locked
     def __contains__(self, name: str) -> bool:
         """Перевіряє, чи існує контакт з вказаним ім'ям"""
         return name.lower() in self._contacts
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Мова структурованих запитів до контактів та планувальник їх виконання
+
+Запит складається з умов, розділених пробілами, які поєднуються через "І":
+
+    has:phone            - є телефон (також email, birthday, address)
+    phone:0501234567     - телефонний номер (частковий збіг, якщо номер неповний)
+    email:ivan           - частина email адреси
+    domain:example.com   - домен email адреси
+    birthday:03          - місяць дня народження
+    name:петр*           - слово імені, що починається з "петр"
+    name:петро           - частина імені
+    address:київ         - частина адреси
+    іван                 - вільний текст (як у звичайному пошуку)
+
+Планувальник починає з найвибірковішого доступного індексу, а решту умов
+перевіряє лише на отриманій множині кандидатів.
+"""
+
+import re
+from typing import Callable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ..models.contact import Contact
+from ..models.field import Phone
+from ..utils.transliteration import fold_text
+
+if TYPE_CHECKING:
+    from .contact_manager import ContactManager
+
+
+_FIELD_TOKEN = re.compile(r'^(has|name|phone|email|domain|birthday|address):(.+)$', re.IGNORECASE)
+
+HAS_FIELDS = ('phone', 'email', 'birthday', 'address')
+
+
+class Predicate:
+    """
+    Умова структурованого запиту
+
+    Attributes:
+        text (str): Вихідний текст умови для виводу плану
+        index_term (Optional[tuple]): Ключ індексу менеджера, якщо умову
+            можна виконати через індекс
+        name_prefix (Optional[str]): Префікс слова імені для індексу слів
+        matches (Callable[[Contact], bool]): Перевірка контакту
+    """
+
+    def __init__(self, text: str, matches: Callable[[Contact], bool],
+                 index_term: Optional[tuple] = None, name_prefix: Optional[str] = None):
+        self.text = text
+        self.matches = matches
+        self.index_term = index_term
+        self.name_prefix = name_prefix
+
+    @property
+    def indexed(self) -> bool:
+        """Чи можна виконати умову через індекс"""
+        return self.index_term is not None or self.name_prefix is not None
+
+    def __repr__(self) -> str:
+        return f"Predicate('{self.text}')"
+
+
+def is_structured_query(query: str) -> bool:
+    """
+    Перевіряє, чи містить запит хоча б одну умову виду поле:значення
+
+    Args:
+        query (str): Пошуковий запит
+
+    Returns:
+        bool: True, якщо запит структурований
+    """
+    return any(_FIELD_TOKEN.match(token) for token in query.split())
+
+
+def free_text_terms(query: str) -> List[str]:
+    """
+    Повертає умови вільного тексту структурованого запиту
+
+    Args:
+        query (str): Пошуковий запит
+
+    Returns:
+        List[str]: Токени без префікса поле:
+    """
+    return [token for token in query.split() if not _FIELD_TOKEN.match(token)]
+
+
+def _text_predicate(manager: 'ContactManager', token: str) -> Predicate:
+    """Створює умову вільного тексту з семантикою звичайного пошуку"""
+    token_lower, token_folded = token.lower(), fold_text(token)
+    return Predicate(token, lambda c: manager._match_rank(c, token, token_lower, token_folded) is not None)
+
+
+def _field_predicate(manager: 'ContactManager', field: str, value: str, text: str) -> Predicate:
+    """
+    Створює умову для токена поле:значення
+
+    Raises:
+        ValueError: Якщо значення умови неправильне
+    """
+    value_lower = value.lower()
+
+    if field == 'has':
+        if value_lower not in HAS_FIELDS:
+            raise ValueError(f"Невідоме поле для has: '{value}'. Доступні: {', '.join(HAS_FIELDS)}")
+        attribute = {'phone': 'phones', 'email': 'emails'}.get(value_lower, value_lower)
+        return Predicate(text, lambda c: bool(getattr(c, attribute)), index_term=('has', value_lower))
+
+    if field == 'phone':
+        try:
+            phone = Phone(value).value
+        except ValueError:
+            # Неповний номер - частковий збіг без індексу
+            return Predicate(text, lambda c: any(value in p.value for p in c.phones))
+        return Predicate(text, lambda c: any(p.value == phone for p in c.phones),
+                         index_term=('phone', phone))
+
+    if field == 'email':
+        return Predicate(text, lambda c: any(value_lower in e.value for e in c.emails))
+
+    if field == 'domain':
+        domain = value_lower.lstrip('@')
+        return Predicate(text, lambda c: any(e.value.rsplit('@', 1)[-1] == domain for e in c.emails),
+                         index_term=('domain', domain))
+
+    if field == 'birthday':
+        if not value.isdigit() or not 1 <= int(value) <= 12:
+            raise ValueError(f"Місяць дня народження має бути числом від 1 до 12: '{value}'")
+        month = int(value)
+        return Predicate(text, lambda c: c.birthday is not None and int(c.birthday.value[3:5]) == month,
+                         index_term=('month', month))
+
+    if field == 'name':
+        if value_lower.endswith('*') and len(value_lower) > 1:
+            prefix = value_lower.rstrip('*')
+            return Predicate(
+                text,
+                lambda c: any(word.startswith(prefix) for word in
+                              c.name.value.lower().split() + manager._search_key(c).split()),
+                name_prefix=prefix
+            )
+        return Predicate(text, lambda c: value_lower in c.name.value.lower())
+
+    # address
+    return Predicate(text, lambda c: c.address is not None and value_lower in c.address.value.lower())
+
+
+def parse_query(manager: 'ContactManager', query: str) -> List[Predicate]:
+    """
+    Розбирає структурований запит на умови
+
+    Args:
+        manager (ContactManager): Менеджер, для якого будується запит
+        query (str): Пошуковий запит
+
+    Returns:
+        List[Predicate]: Умови запиту
+
+    Raises:
+        ValueError: Якщо умова запиту неправильна
+    """
+    predicates = []
+    for token in query.split():
+        match = _FIELD_TOKEN.match(token)
+        if match:
+            predicates.append(_field_predicate(manager, match.group(1).lower(), match.group(2), token))
+        else:
+            predicates.append(_text_predicate(manager, token))
+    return predicates
+
+
+class QueryPlan:
+    """
+    План виконання структурованого запиту
+
+    Attributes:
+        driver (Optional[Predicate]): Умова, індекс якої дає множину кандидатів
+            (None - повний перегляд колекції)
+        filters (List[Predicate]): Умови, що перевіряються на кандидатах
+        estimates (List[Tuple[Predicate, int]]): Оцінки розміру індексованих умов
+    """
+
+    def __init__(self, manager: 'ContactManager', predicates: List[Predicate]):
+        """
+        Будує план: обирає індексовану умову з найменшою кількістю кандидатів
+
+        Args:
+            manager (ContactManager): Менеджер з індексами
+            predicates (List[Predicate]): Умови запиту
+        """
+        self.manager = manager
+        self.estimates: List[Tuple[Predicate, int]] = [
+            (predicate, manager._estimate_candidates(predicate))
+            for predicate in predicates if predicate.indexed
+        ]
+        self.driver: Optional[Predicate] = None
+        if self.estimates:
+            self.driver = min(self.estimates, key=lambda item: item[1])[0]
+        self.filters = [predicate for predicate in predicates if predicate is not self.driver]
+        self.candidate_count: Optional[int] = None
+        self.result_count: Optional[int] = None
+
+    def execute(self) -> List[str]:
+        """
+        Виконує план
+
+        Returns:
+            List[str]: Ключі контактів, що задовольняють усі умови
+        """
+        manager = self.manager
+        if self.driver is None:
+            candidates: Set[str] = set(manager._contacts)
+        else:
+            candidates = manager._index_candidates(self.driver)
+        self.candidate_count = len(candidates)
+
+        results = []
+        for name_key in candidates:
+            contact = manager._contacts[name_key]
+            if all(predicate.matches(contact) for predicate in self.filters):
+                results.append(name_key)
+        self.result_count = len(results)
+        return results
+
+    def explain(self) -> str:
+        """
+        Повертає текстовий опис плану з кількостями кандидатів
+
+        Returns:
+            str: Опис плану
+        """
+        lines = []
+        for predicate, estimate in self.estimates:
+            lines.append(f"  індекс {predicate.text}: {estimate} кандидатів")
+        if self.driver is None:
+            lines.append(f"  старт: повний перегляд ({len(self.manager._contacts)} контактів)")
+        else:
+            lines.append(f"  старт: індекс {self.driver.text}")
+        if self.candidate_count is not None:
+            lines.append(f"  кандидатів перевірено: {self.candidate_count}")
+        if self.filters:
+            lines.append(f"  фільтри: {', '.join(predicate.text for predicate in self.filters)}")
+        if self.result_count is not None:
+            lines.append(f"  результатів: {self.result_count}")
+        return "План запиту:\n" + "\n".join(lines)
@@ -2,10 +2,27 @@
 Менеджер для управління нотатками
 """
 
-from typing import List, Optional, Dict, Any, Set
+import heapq
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from typing import List, Optional, Dict, Any, Set, Iterable, Iterator
 from datetime import datetime
 from ..models.note import Note
 from ..storage.file_storage import FileStorage
+from ..utils.events import ChangeEvent, EventStream
+from ..utils.lru_cache import VersionedLRUCache
+from ..utils.rwlock import ReadWriteLock, read_locked, write_locked
+from ..utils.sorted_index import SortedIndex
+from ..utils.bitset import bit_positions, bits_from_positions
+from ..utils.regex_search import compile_pattern, required_words, search_texts
+from ..utils.text_index import TextIndex, TextQuery
+from .tag_query import compile_tag_expression
 
 
 class NoteManager:
@@ -14,55 +31,504 @@ class NoteManager:
     
     Забезпечує функціональність для створення, видалення, пошуку, редагування
     та сортування нотаток за тегами.
+    
+    Нотатки адресуються незмінним ідентифікатором (Note.id) і зберігаються у
+    словнику за ним, тож отримання, зміна та видалення мають вартість O(1),
+    а видалення однієї нотатки не змінює адреси інших. Порядкові номери -
+    лише питання відображення у CLI.
+    
+    Менеджер потокобезпечний: методи читання виконуються паралельно під
+    блокуванням на читання, зміни - під ексклюзивним блокуванням на запис.
+    Редагування об'єктів Note "на місці" через їхні методи (set_title,
+    set_content, теги) одразу оновлює індекси менеджера та публікує подію
+    UPDATED (якщо потік тримає блокування на читання, наприклад під час
+    ітерації iter_*, - одразу після його звільнення), але зберігати такі
+    зміни слід через update_note().
+    
+    Зміни публікуються у потік events (ChangeEvent з ключами - ідентифікаторами
+    нотаток).
     """
 
-    def __init__(self, storage: FileStorage):
+    # У скільки разів збіг у заголовку важливіший за збіг у змісті
+    TITLE_BOOST = 2.0
+    # Підтримувані порядки сортування: критерій -> чи йти від кінця представлення
+    SORT_ORDERS = {'created': True, 'updated': True, 'title': False, 'tags': True}
+    # Обсяг тексту (символів), з якого пошук регулярним виразом розподіляється
+    # між процесами, та кількість процесів (None - за кількістю ядер)
+    REGEX_PARALLEL_CHARS = 4_000_000
+    REGEX_WORKERS: Optional[int] = None
+
+    def __init__(self, storage: FileStorage, cache_size: int = 128):
         """
         Ініціалізує менеджер нотаток з вказаним сховищем
         
         Args:
             storage (FileStorage): Об'єкт для збереження даних
+            cache_size (int): Кількість запитів у кеші результатів (0 вимикає кеш)
         """
         self.storage = storage
-        self._notes: List[Note] = []
+        self._lock = ReadWriteLock()
+        # Нотатки за ідентифікатором; словник зберігає порядок додавання
+        self._notes: Dict[str, Note] = {}
+        # Версія колекції збільшується при кожній зміні й робить недійсними
+        # закешовані результати запитів
+        self._version = 0
+        self._cache = VersionedLRUCache(cache_size)
+        # Стан пакетного режиму: глибина вкладеності та наявність незбережених змін
+        self._batch_depth = 0
+        self._dirty = False
+        # Закритий менеджер відхиляє зміни (див. close())
+        self._closed = False
+        # Потік подій про зміни для зовнішніх споживачів
+        self.events = EventStream('notes')
+        # Замок побудови лінивих індексів паралельними читачами
+        self._lazy_index_lock = threading.Lock()
+        # Чи йде масове наповнення індексів (бітові множини будуються наприкінці)
+        self._bulk_loading = False
+        self._reset_indexes()
         self.load_notes()
 
+    def _reset_indexes(self) -> None:
+        """Скидає всі похідні структури, що супроводжують колекцію нотаток"""
+        # Заголовок у нижньому регістрі -> ідентифікатори нотаток (у порядку
+        # індексації), та знімок заголовка і змісту, з якими нотатку проіндексовано
+        self._title_index: Dict[str, Dict[str, None]] = {}
+        self._indexed_texts: Dict[str, tuple] = {}
+        # Інвертований індекс слів заголовків і змісту для пошуку; будується
+        # при першому текстовому запиті (None - ще не побудований)
+        self._text_index: Optional[TextIndex] = None
+        # Тег -> ідентифікатори нотаток, та знімок тегів, з якими нотатку
+        # проіндексовано
+        self._tag_postings: Dict[str, Set[str]] = {}
+        self._indexed_tags: Dict[str, frozenset] = {}
+        # Щільні слоти нотаток для бітових множин: ідентифікатор -> слот,
+        # слот -> ідентифікатор, вільні слоти видалених нотаток, біти всіх
+        # нотаток та біти нотаток кожного тегу
+        self._slots: Dict[str, int] = {}
+        self._slot_ids: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._live_bits = 0
+        self._tag_bits: Dict[str, int] = {}
+        # Кількість нотаток з кожним тегом та теги, впорядковані за нею
+        # (ключ сортування - (-кількість, тег))
+        self._tag_counts: Counter = Counter()
+        self._tag_ranking = SortedIndex()
+        # Кількість слів, з якою нотатку проіндексовано, та сумарна кількість
+        # слів колекції (рахуються при першому запиті статистики, None - ще
+        # не пораховано), а також кількість нотаток з тегами
+        self._indexed_word_counts: Dict[str, int] = {}
+        self._total_words: Optional[int] = None
+        self._tagged_notes = 0
+        # Відсортовані представлення для кожного критерію з SORT_ORDERS
+        self._views: Dict[str, SortedIndex] = {sort_by: SortedIndex() for sort_by in self.SORT_ORDERS}
+
+    def _index_note(self, note_id: str, note: Note) -> None:
+        """
+        Реєструє нотатку в індексах (повторний виклик переіндексовує її)
+        
+        Менеджер також підписується на зміни нотатки, тож set_title,
+        set_content та зміни тегів одразу оновлюють індекси.
+        
+        Args:
+            note_id (str): Ідентифікатор нотатки
+            note (Note): Нотатка
+        """
+        if note_id in self._indexed_texts:
+            self._unindex_note(note_id)
+        note._listener = self._on_note_changed
+        
+        if note_id not in self._slots:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._slot_ids[slot] = note_id
+            else:
+                slot = len(self._slot_ids)
+                self._slot_ids.append(note_id)
+            self._slots[note_id] = slot
+            if not self._bulk_loading:
+                self._live_bits |= 1 << slot
+        
+        self._index_text(note_id, note)
+        self._index_tags(note_id, note)
+        for sort_by, sort_key in self._sort_keys(note_id, note).items():
+            self._views[sort_by].add(note_id, sort_key)
+
+    def _unindex_note(self, note_id: str) -> None:
+        """
+        Прибирає нотатку з індексів за збереженим знімком
+        
+        Слот нотатки звільняється, лише якщо її вже немає в колекції
+        (при переіндексації він зберігається).
+        
+        Args:
+            note_id (str): Ідентифікатор нотатки
+        """
+        if note_id not in self._indexed_texts:
+            return
+        self._unindex_text(note_id)
+        self._unindex_tags(note_id)
+        for view in self._views.values():
+            view.remove(note_id)
+        
+        if note_id not in self._notes:
+            slot = self._slots.pop(note_id)
+            self._slot_ids[slot] = None
+            self._free_slots.append(slot)
+            if not self._bulk_loading:
+                self._live_bits &= ~(1 << slot)
+
+    def _refresh_note(self, note_id: str, note: Note) -> None:
+        """
+        Оновлює індекси вже проіндексованої нотатки після її зміни
+        
+        Текст переіндексовується, лише якщо змінився заголовок чи зміст, а
+        структури тегів - лише якщо змінилися теги; представлення оновлюються
+        завжди (змінився час оновлення).
+        """
+        title, content = self._indexed_texts[note_id]
+        if title != note.title or content != note.content:
+            self._unindex_text(note_id)
+            self._index_text(note_id, note)
+        if self._indexed_tags[note_id] != note.tags:
+            self._unindex_tags(note_id)
+            self._index_tags(note_id, note)
+        for sort_by, sort_key in self._sort_keys(note_id, note).items():
+            self._views[sort_by].add(note_id, sort_key)
+
+    def _index_text(self, note_id: str, note: Note) -> None:
+        """Реєструє заголовок і зміст нотатки в текстових індексах та лічильниках слів"""
+        if self._text_index is not None:
+            self._text_index.add(note_id, note.title, note.content)
+        self._indexed_texts[note_id] = (note.title, note.content)
+        self._title_index.setdefault(note.title.lower(), {})[note_id] = None
+        
+        if self._total_words is not None:
+            word_count = note.get_word_count()
+            self._indexed_word_counts[note_id] = word_count
+            self._total_words += word_count
+
+    def _unindex_text(self, note_id: str) -> None:
+        """Прибирає заголовок і зміст нотатки з текстових індексів за знімком"""
+        title, _ = self._indexed_texts.pop(note_id)
+        if self._text_index is not None:
+            self._text_index.remove(note_id)
+        title_key = title.lower()
+        bucket = self._title_index[title_key]
+        del bucket[note_id]
+        if not bucket:
+            del self._title_index[title_key]
+        if self._total_words is not None:
+            self._total_words -= self._indexed_word_counts.pop(note_id)
+
+    def _index_tags(self, note_id: str, note: Note) -> None:
+        """Реєструє теги нотатки у списках, бітових множинах та лічильниках тегів"""
+        bit = 1 << self._slots[note_id]
+        tags = frozenset(note.tags)
+        self._indexed_tags[note_id] = tags
+        if tags:
+            self._tagged_notes += 1
+        for tag in tags:
+            self._tag_postings.setdefault(tag, set()).add(note_id)
+            if not self._bulk_loading:
+                self._tag_bits[tag] = self._tag_bits.get(tag, 0) | bit
+            self._count_tag(tag, 1)
+
+    def _unindex_tags(self, note_id: str) -> None:
+        """Прибирає теги нотатки зі структур тегів за знімком"""
+        bit = 1 << self._slots[note_id]
+        tags = self._indexed_tags.pop(note_id)
+        if tags:
+            self._tagged_notes -= 1
+        for tag in tags:
+            postings = self._tag_postings[tag]
+            postings.discard(note_id)
+            if not postings:
+                del self._tag_postings[tag]
+            if not self._bulk_loading:
+                bits = self._tag_bits[tag] & ~bit
+                if bits:
+                    self._tag_bits[tag] = bits
+                else:
+                    del self._tag_bits[tag]
+            self._count_tag(tag, -1)
+
+    @staticmethod
+    def _sort_keys(note_id: str, note: Note) -> Dict[str, tuple]:
+        """
+        Повертає ключі сортування нотатки для кожного представлення
+        
+        Ідентифікатор наприкінці ключа робить порядок однозначним.
+        """
+        return {
+            'created': (note.created_at, note_id),
+            'updated': (note.updated_at, note_id),
+            'title': (note.title.lower(), note.created_at, note_id),
+            'tags': (len(note.tags), note.created_at, note_id),
+        }
+
+    def _count_tag(self, tag: str, delta: int) -> None:
+        """Змінює лічильник тегу; тег з нульовою кількістю зникає"""
+        count = self._tag_counts[tag] + delta
+        if count > 0:
+            self._tag_counts[tag] = count
+            self._tag_ranking.add(tag, (-count, tag))
+        else:
+            del self._tag_counts[tag]
+            self._tag_ranking.remove(tag)
+
+    def _on_note_changed(self, note: Note) -> None:
+        """
+        Оновлює індекси нотатки, зміненої через її методи, та публікує подію
+        
+        Під блокуванням на читання (наприклад, усередині iter_*) оновлення
+        відкладається до його звільнення.
+        """
+        self._lock.write_or_defer(lambda: self._apply_note_change(note))
+
+    def _apply_note_change(self, note: Note) -> None:
+        """Переіндексовує змінену нотатку, якщо вона досі в колекції"""
+        if self._notes.get(note.id) is note:
+            self._refresh_note(note.id, note)
+            self._version += 1
+            self.events.publish(ChangeEvent.UPDATED, note.id, note.id, note)
+
+    @contextmanager
+    def _editing(self, note_id: str, note: Note):
+        """
+        Контекст зміни нотатки методами менеджера
+        
+        Підписку на зміни нотатки вимкнено, тож кожен set_*/add_tag не
+        переіндексовує її окремо - індекси оновлюються один раз при виході,
+        навіть якщо зміну перервала помилка валідації (частина змін могла
+        застосуватись).
+        """
+        note._listener = None
+        try:
+            yield note
+        finally:
+            note._listener = self._on_note_changed
+            self._refresh_note(note_id, note)
+
+    @write_locked
     def load_notes(self) -> None:
-        """Завантажує нотатки з файлового сховища"""
+        """
+        Завантажує нотатки з файлового сховища
+        
+        Нотаткам зі старих файлів без ідентифікатора (або з повторним
+        ідентифікатором) присвоюється новий, і колекція одразу зберігається,
+        щоб ідентифікатори не змінювалися між сесіями.
+        
+        Індекси будуються масово: відсортовані представлення сортуються один
+        раз, а не вставкою кожної нотатки. Текстовий індекс будується лише
+        при першому текстовому запиті і у файл не зберігається: побудова з
+        уже завантажених текстів нотаток швидша за читання й перевірку
+        збереженого індексу, а його запис подвоював би вартість save_notes().
+        """
+        assigned_ids = False
         try:
             notes_data = self.storage.load_data('notes')
             if isinstance(notes_data, list):
                 for note_data in notes_data:
                     try:
                         note = Note.from_dict(note_data)
-                        self._notes.append(note)
                     except (ValueError, KeyError) as e:
                         print(f"Помилка завантаження нотатки: {e}")
+                        continue
+                    if not note_data.get('id') or note.id in self._notes:
+                        note.id = uuid.uuid4().hex
+                        assigned_ids = True
+                    self._notes[note.id] = note
         except FileNotFoundError:
             # Файл не існує, починаємо з порожньої колекції
-            self._notes = []
+            self._notes = {}
+            self._reset_indexes()
         except Exception as e:
             print(f"Помилка завантаження нотаток: {e}")
-            self._notes = []
+            self._notes = {}
+            self._reset_indexes()
+        
+        with self._bulk_indexes():
+            for note_id, note in self._notes.items():
+                self._index_note(note_id, note)
+        
+        if assigned_ids:
+            self.save_notes()
+
+    def _get_text_index(self) -> TextIndex:
+        """
+        Повертає текстовий індекс, будуючи його при першому зверненні
+        
+        Викликається під блокуванням на читання, тож кілька читачів можуть
+        звернутися одночасно: індекс будує один з них під окремим замком,
+        решта чекає на готовий. Письменники паралельно не виконуються.
+        """
+        index = self._text_index
+        if index is None:
+            with self._lazy_index_lock:
+                index = self._text_index
+                if index is None:
+                    index = TextIndex()
+                    with index.bulk():
+                        for note_id, (title, content) in self._indexed_texts.items():
+                            index.add(note_id, title, content)
+                    self._text_index = index
+        return index
 
+    def _get_total_words(self) -> int:
+        """Повертає сумарну кількість слів колекції, рахуючи її при першому зверненні"""
+        total = self._total_words
+        if total is None:
+            with self._lazy_index_lock:
+                total = self._total_words
+                if total is None:
+                    self._indexed_word_counts = {note_id: self._notes[note_id].get_word_count()
+                                                 for note_id in self._indexed_texts}
+                    total = self._total_words = sum(self._indexed_word_counts.values())
+        return total
+
+    @contextmanager
+    def _bulk_indexes(self):
+        """
+        Контекст масового наповнення індексів
+        
+        Відсортовані представлення сортуються один раз при виході, а бітові
+        множини будуються з готових слотів і списків тегів за один прохід
+        замість "|=" для кожної нотатки (кожне таке "|=" створює нове число
+        розміром з усю множину).
+        """
+        self._bulk_loading = True
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(self._tag_ranking.bulk())
+                for view in self._views.values():
+                    stack.enter_context(view.bulk())
+                yield
+        finally:
+            self._bulk_loading = False
+            self._live_bits = bits_from_positions(self._slots.values())
+            self._tag_bits = {
+                tag: bits_from_positions(self._slots[note_id] for note_id in note_ids)
+                for tag, note_ids in self._tag_postings.items()
+            }
+
+    @write_locked
     def save_notes(self) -> None:
         """Зберігає нотатки у файлове сховище"""
         try:
-            notes_data = [note.to_dict() for note in self._notes]
+            notes_data = [note.to_dict() for note in self._notes.values()]
             self.storage.save_data('notes', notes_data)
+            self._dirty = False
         except Exception as e:
             print(f"Помилка збереження нотаток: {e}")
 
+    def close(self) -> None:
+        """
+        Зберігає колекцію та закриває менеджер
+        
+        Після закриття всі зміни та збереження відхиляються з RuntimeError,
+        тож застарілий менеджер не перезапише дані, які вже завантажив
+        інший менеджер тієї самої папки. Читання залишаються доступними.
+        """
+        with self._lock.write_lock():
+            if not self._closed:
+                self.save_notes()
+                self._closed = True
+
+    def _commit(self) -> None:
+        """Фіксує зміну колекції: зберігає її або відкладає збереження до кінця пакета"""
+        self._version += 1
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save_notes()
+
+    @contextmanager
+    def batch(self):
+        """
+        Контекст пакетних змін з одним збереженням наприкінці
+        
+        Усі add_*, create_*, update_* та remove_* всередині блоку не зберігають
+        дані одразу - колекція зберігається один раз при виході з блоку. Якщо
+        з блоку виходить виняток, стан нотаток у пам'яті відкочується до стану
+        на початку пакета. Вкладені пакети приєднуються до зовнішнього.
+        Події змін доставляються після збереження пакета, а при відкаті
+        відкидаються.
+        
+        Пакет виконується під ексклюзивним блокуванням, тож інші потоки не
+        бачать проміжного стану.
+        
+        Yields:
+            NoteManager: Цей менеджер
+        """
+        with self._lock.write_lock():
+            if self._batch_depth:
+                self._batch_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+            
+            snapshot = self._snapshot_state()
+            was_dirty = self._dirty
+            self._batch_depth = 1
+            self.events.hold()
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth = 0
+                self._restore_state(snapshot)
+                self._dirty = was_dirty
+                self.events.discard()
+                raise
+            self._batch_depth = 0
+            if self._dirty:
+                self.save_notes()
+            self.events.release()
+
+    def _snapshot_state(self) -> List[tuple]:
+        """Робить знімок стану нотаток для відкату пакета"""
+        return [
+            (note, note.title, note.content, set(note.tags), note.created_at, note.updated_at)
+            for note in self._notes.values()
+        ]
+
+    def _restore_state(self, snapshot: List[tuple]) -> None:
+        """Відновлює нотатки зі знімка та перебудовує індекси"""
+        self._notes = {}
+        self._reset_indexes()
+        for note, title, content, tags, created_at, updated_at in snapshot:
+            note.title = title
+            note.content = content
+            note._word_count = None
+            note.tags = tags
+            note.created_at = created_at
+            note.updated_at = updated_at
+            self._notes[note.id] = note
+        with self._bulk_indexes():
+            for note_id, note in self._notes.items():
+                self._index_note(note_id, note)
+        self._version += 1
+
+    @write_locked
     def add_note(self, note: Note) -> None:
         """
         Додає нову нотатку до колекції
         
         Args:
             note (Note): Нотатка для додавання
+        
+        Raises:
+            ValueError: Якщо нотатка з таким ідентифікатором вже є
         """
-        self._notes.append(note)
-        self.save_notes()
+        if note.id in self._notes:
+            raise ValueError(f"Нотатка з ідентифікатором '{note.id}' вже існує")
+        self._notes[note.id] = note
+        self._index_note(note.id, note)
+        self.events.publish(ChangeEvent.ADDED, None, note.id, note)
+        self._commit()
 
+    @write_locked
     def create_note(self, title: str, content: str = "", tags: Optional[List[str]] = None) -> Note:
         """
         Створює та додає нову нотатку
@@ -82,25 +548,32 @@ class NoteManager:
         self.add_note(note)
         return note
 
-    def remove_note(self, index: int) -> bool:
+    @write_locked
+    def remove_note(self, note_id: str) -> bool:
         """
-        Видаляє нотатку за індексом
+        Видаляє нотатку за ідентифікатором
         
         Args:
-            index (int): Індекс нотатки для видалення (починається з 1)
+            note_id (str): Ідентифікатор нотатки
             
         Returns:
-            bool: True, якщо нотатку було видалено, False - якщо індекс неправильний
+            bool: True, якщо нотатку було видалено, False - якщо її немає
         """
-        if 1 <= index <= len(self._notes):
-            del self._notes[index - 1]
-            self.save_notes()
-            return True
-        return False
+        note = self._notes.pop(note_id, None)
+        if note is None:
+            return False
+        self._unindex_note(note_id)
+        note._listener = None
+        self.events.publish(ChangeEvent.REMOVED, note_id, None, note)
+        self._commit()
+        return True
 
+    @write_locked
     def remove_note_by_title(self, title: str) -> bool:
         """
-        Видаляє першу нотатку з вказаним заголовком
+        Видаляє нотатку з вказаним заголовком
+        
+        Якщо таких нотаток кілька, видаляється найраніше проіндексована.
         
         Args:
             title (str): Заголовок нотатки для видалення
@@ -108,28 +581,26 @@ class NoteManager:
         Returns:
             bool: True, якщо нотатку було видалено, False - якщо не знайдено
         """
-        for i, note in enumerate(self._notes):
-            if note.title.lower() == title.lower():
-                del self._notes[i]
-                self.save_notes()
-                return True
-        return False
+        bucket = self._title_index.get(title.strip().lower())
+        if not bucket:
+            return False
+        return self.remove_note(next(iter(bucket)))
 
-    def get_note(self, index: int) -> Optional[Note]:
+    @read_locked
+    def get_note(self, note_id: str) -> Optional[Note]:
         """
-        Повертає нотатку за індексом
+        Повертає нотатку за ідентифікатором
         
         Args:
-            index (int): Індекс нотатки (починається з 1)
+            note_id (str): Ідентифікатор нотатки
             
         Returns:
-            Optional[Note]: Нотатка або None, якщо індекс неправильний
+            Optional[Note]: Нотатка або None, якщо її немає
         """
-        if 1 <= index <= len(self._notes):
-            return self._notes[index - 1]
-        return None
+        return self._notes.get(note_id)
 
-    def find_notes_by_title(self, title: str) -> List[tuple[int, Note]]:
+    @read_locked
+    def find_notes_by_title(self, title: str) -> List[tuple[str, Note]]:
         """
         Знаходить нотатки за заголовком (частковий збіг)
         
@@ -137,18 +608,83 @@ class NoteManager:
             title (str): Заголовок для пошуку
             
         Returns:
-            List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
+            List[tuple[str, Note]]: Список кортежів (ідентифікатор, нотатка)
         """
         found_notes = []
         title_lower = title.lower()
         
-        for i, note in enumerate(self._notes):
+        for note_id, note in self._notes.items():
             if title_lower in note.title.lower():
-                found_notes.append((i + 1, note))
+                found_notes.append((note_id, note))
         
         return found_notes
 
-    def search_notes(self, query: str, case_sensitive: bool = False) -> List[tuple[int, Note]]:
+    @read_locked
+    def iter_search(self, query: str, case_sensitive: bool = False,
+                    limit: Optional[int] = None) -> Iterator[tuple[str, Note]]:
+        """
+        Ліниво шукає нотатки за змістом або заголовком
+        
+        Нотатка знаходиться, якщо містить усі слова запиту; останнє слово
+        може бути початком слова ("бюдж" знаходить "Бюджет"), як при
+        пошуку за підрядком. Фраза в лапках ("квартальний звіт") шукається
+        як слова поспіль, а слово із зірочкою (бюдж*) - як префікс. Кандидати беруться з текстового
+        інвертованого індексу, тож вартість залежить від розміру списків
+        для слів запиту, а не від обсягу тексту. З case_sensitive=True
+        кандидати додатково перевіряються на точний збіг частин запиту з
+        урахуванням регістру. Запит без жодного слова (лише розділові
+        знаки) перевіряється підрядком по всіх нотатках. Результати
+        впорядковані за часом створення і видаються по одному без
+        сортування всіх кандидатів.
+        
+        Args:
+            query (str): Пошуковий запит
+            case_sensitive (bool): Чи враховувати регістр
+            limit (Optional[int]): Максимальна кількість результатів
+            
+        Returns:
+            Iterator[tuple[str, Note]]: Кортежі (ідентифікатор, нотатка)
+        """
+        candidate_ids = self._get_text_index().search(query, prefix_last=True)
+        if candidate_ids is None:
+            notes = list(self._notes.items())
+            found = (
+                (note_id, note) for note_id, note in notes
+                if note.search_in_content(query, case_sensitive)
+            )
+            return islice(found, limit)
+        
+        found = self._iter_by_created(candidate_ids)
+        if case_sensitive:
+            literals = TextQuery(query).literals
+            found = (
+                (note_id, note) for note_id, note in found
+                if all(note.search_in_content(literal, case_sensitive) for literal in literals)
+            )
+        return islice(found, limit)
+
+    def _iter_by_created(self, note_ids: Iterable[str]) -> Iterator[tuple[str, Note]]:
+        """
+        Ліниво видає нотатки з note_ids у порядку створення
+        
+        Викликається під блокуванням: купа (час створення, ідентифікатор,
+        нотатка) будується одразу за O(m), а кожна наступна нотатка
+        дістається з неї вже при ітерації за O(log m). Тож перші k
+        результатів коштують O(m + k log m), а не повне сортування.
+        """
+        heap = [(self._notes[note_id].created_at, note_id, self._notes[note_id])
+                for note_id in note_ids]
+        heapq.heapify(heap)
+        
+        def pop_in_order() -> Iterator[tuple[str, Note]]:
+            while heap:
+                _, note_id, note = heapq.heappop(heap)
+                yield note_id, note
+        
+        return pop_in_order()
+
+    @read_locked
+    def search_notes(self, query: str, case_sensitive: bool = False) -> List[tuple[str, Note]]:
         """
         Шукає нотатки за змістом або заголовком
         
@@ -157,31 +693,157 @@ class NoteManager:
             case_sensitive (bool): Чи враховувати регістр
             
         Returns:
-            List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
+            List[tuple[str, Note]]: Список кортежів (ідентифікатор, нотатка)
         """
-        found_notes = []
+        cache_key = ('search', query if case_sensitive else query.lower(), case_sensitive)
+        cached = self._cache.get(cache_key, self._version)
+        if cached is not VersionedLRUCache.MISS:
+            return list(cached)
         
-        for i, note in enumerate(self._notes):
-            if note.search_in_content(query, case_sensitive):
-                found_notes.append((i + 1, note))
+        found_notes = list(self.iter_search(query, case_sensitive))
+        self._cache.put(cache_key, self._version, found_notes)
+        return list(found_notes)
+
+    @read_locked
+    def search_notes_ranked(self, query: str, limit: Optional[int] = 10) -> List[tuple[str, Note, float]]:
+        """
+        Шукає нотатки з ранжуванням за релевантністю (BM25)
         
-        return found_notes
+        Бали рахуються з текстового індексу за заголовком і змістом;
+        збіг у заголовку важить у TITLE_BOOST разів більше. Нотатка
+        потрапляє в результати, якщо містить хоча б одне слово запиту
+        (останнє слово може бути початком слова), а найкращі limit
+        відбираються обмеженою купою.
+        
+        Args:
+            query (str): Пошуковий запит
+            limit (Optional[int]): Максимальна кількість результатів (None - усі)
+            
+        Returns:
+            List[tuple[str, Note, float]]: Кортежі (ідентифікатор, нотатка, бал)
+            від найрелевантнішої
+        """
+        cache_key = ('ranked', query.lower(), limit)
+        cached = self._cache.get(cache_key, self._version)
+        if cached is not VersionedLRUCache.MISS:
+            return list(cached)
+        
+        ranked = self._get_text_index().rank(query, (self.TITLE_BOOST, 1.0), limit,
+                                             prefix_last=True)
+        results = [(note_id, self._notes[note_id], score) for note_id, score in ranked]
+        self._cache.put(cache_key, self._version, results)
+        return list(results)
 
-    def find_notes_by_tags(self, tags: List[str], match_all: bool = False) -> List[tuple[int, Note]]:
+    def search_notes_regex(self, pattern: str, flags: int = 0,
+                           timeout: Optional[float] = None) -> List[tuple[str, Note, List[tuple[int, int]]]]:
         """
-        Знаходить нотатки за тегами
+        Шукає регулярний вираз у змісті нотаток
+        
+        Скомпільовані вирази кешуються (LRU). Якщо з виразу можна витягти
+        обов'язкові слова (наприклад, "рахунок" з r"\\bрахунок №\\d+"),
+        кандидати спершу відбираються текстовим індексом. Коли обсяг
+        тексту кандидатів перевищує REGEX_PARALLEL_CHARS, тексти ділять на
+        частини і шукають у пулі процесів; позиції збігів
+        об'єднуються. Блокування на читання утримується лише під час збору
+        текстів, не під час пошуку.
+        
+        Args:
+            pattern (str): Регулярний вираз
+            flags (int): Прапорці re (re.IGNORECASE, re.MULTILINE, ...)
+            timeout (Optional[float]): Максимальний час пошуку в секундах
+            
+        Returns:
+            List[tuple[str, Note, List[tuple[int, int]]]]: Кортежі
+            (ідентифікатор, нотатка, позиції збігів у змісті), впорядковані
+            за часом створення
+            
+        Raises:
+            ValueError: Якщо вираз неправильний
+            TimeoutError: Якщо пошук не завершився за timeout секунд (при
+                послідовному пошуку час перевіряється між нотатками)
+        """
+        regex = compile_pattern(pattern, flags)
+        words = required_words(pattern, flags)
+        
+        with self._lock.read_lock():
+            if words is None:
+                candidate_ids = list(self._notes)
+            else:
+                terms, prefixes = words
+                query = ' '.join(terms + [prefix + '*' for prefix in prefixes])
+                candidate_ids = self._get_text_index().search(query)
+            notes = {note_id: self._notes[note_id] for note_id in candidate_ids}
+            texts = [(note_id, note.content) for note_id, note in notes.items()]
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if sum(len(text) for _, text in texts) < self.REGEX_PARALLEL_CHARS:
+            found = []
+            for note_id, text in texts:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Пошук не завершився за {timeout} с")
+                spans = [match.span() for match in regex.finditer(text)]
+                if spans:
+                    found.append((note_id, spans))
+        else:
+            found = self._search_regex_parallel(pattern, flags, texts, timeout)
+        
+        results = [(note_id, notes[note_id], spans) for note_id, spans in found]
+        results.sort(key=lambda item: item[1].created_at)
+        return results
+
+    def _search_regex_parallel(self, pattern: str, flags: int, texts: List[tuple[str, str]],
+                               timeout: Optional[float]) -> List[tuple[str, List[tuple[int, int]]]]:
+        """
+        Шукає вираз у текстах, розподіливши їх між процесами
+        
+        Процесам передаються лише пари (ідентифікатор, текст), а не нотатки.
+        Пул процесів створюється з відомою кількістю процесів, і з неї ж
+        рахується кількість частин. При перевищенні часу процеси зупиняються
+        через terminate() пулу, зокрема ті, що ще виконують пошук.
+        
+        Raises:
+            TimeoutError: Якщо пошук не завершився за timeout секунд
+        """
+        workers = self.REGEX_WORKERS or os.cpu_count() or 1
+        # Кілька частин на процес вирівнюють навантаження між ними
+        shard_count = min(workers * 4, len(texts))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Вихід з блоку викликає terminate(): процеси зупиняються і після
+        # успішного пошуку, і після перевищення часу
+        with multiprocessing.Pool(processes=workers) as pool:
+            shards = [pool.apply_async(search_texts, (pattern, flags, texts[i::shard_count]))
+                      for i in range(shard_count)]
+            found = []
+            for shard in shards:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    found.extend(shard.get(remaining))
+                except multiprocessing.TimeoutError:
+                    raise TimeoutError(f"Пошук не завершився за {timeout} с") from None
+            return found
+
+    @read_locked
+    def iter_by_tags(self, tags: List[str], match_all: bool = False,
+                     limit: Optional[int] = None) -> Iterator[tuple[str, Note]]:
+        """
+        Ліниво знаходить нотатки за тегами
+        
+        Кандидати беруться з індексу тег -> нотатки: для всіх тегів списки
+        перетинаються, починаючи з найкоротшого, для будь-якого -
+        об'єднуються. Вартість залежить від розміру списків, а не від
+        кількості нотаток. Результати впорядковані за часом створення і
+        видаються по одному без сортування всіх кандидатів.
         
         Args:
             tags (List[str]): Список тегів для пошуку
             match_all (bool): Чи повинні збігатися всі теги (True) або хоча б один (False)
+            limit (Optional[int]): Максимальна кількість результатів
             
         Returns:
-            List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
+            Iterator[tuple[str, Note]]: Кортежі (ідентифікатор, нотатка)
         """
-        found_notes = []
-        
         if not tags:
-            return found_notes
+            return iter(())
         
         # Нормалізуємо теги для пошуку
         normalized_tags = []
@@ -194,43 +856,156 @@ class NoteManager:
                 continue
         
         if not normalized_tags:
-            return found_notes
+            return iter(())
         
-        for i, note in enumerate(self._notes):
-            if match_all:
-                # Всі теги повинні бути присутні
-                if all(tag in note.tags for tag in normalized_tags):
-                    found_notes.append((i + 1, note))
-            else:
-                # Хоча б один тег повинен бути присутній
-                if note.matches_tags(normalized_tags):
-                    found_notes.append((i + 1, note))
+        postings = [self._tag_postings.get(tag, set()) for tag in set(normalized_tags)]
+        if match_all:
+            # Всі теги повинні бути присутні
+            postings.sort(key=len)
+            note_ids = set(postings[0])
+            for tag_postings in postings[1:]:
+                if not note_ids:
+                    break
+                note_ids.intersection_update(tag_postings)
+        else:
+            # Хоча б один тег повинен бути присутній
+            note_ids = set().union(*postings)
         
-        return found_notes
+        return islice(self._iter_by_created(note_ids), limit)
 
-    def get_all_notes(self, sort_by: str = 'created') -> List[tuple[int, Note]]:
+    @read_locked
+    def find_notes_by_tags(self, tags: List[str], match_all: bool = False) -> List[tuple[str, Note]]:
         """
-        Повертає всі нотатки, відсортовані за вказаним критерієм
+        Знаходить нотатки за тегами
+        
+        Args:
+            tags (List[str]): Список тегів для пошуку
+            match_all (bool): Чи повинні збігатися всі теги (True) або хоча б один (False)
+            
+        Returns:
+            List[tuple[str, Note]]: Список кортежів (ідентифікатор, нотатка)
+        """
+        normalized_tags = frozenset(tag.strip().lower() for tag in tags if tag and tag.strip())
+        cache_key = ('tags', normalized_tags, match_all)
+        cached = self._cache.get(cache_key, self._version)
+        if cached is not VersionedLRUCache.MISS:
+            return list(cached)
+        
+        found_notes = list(self.iter_by_tags(tags, match_all))
+        self._cache.put(cache_key, self._version, found_notes)
+        return list(found_notes)
+
+    @read_locked
+    def find_notes(self, tag_expr: str, limit: Optional[int] = None) -> List[tuple[str, Note]]:
+        """
+        Знаходить нотатки за булевим виразом над тегами
+        
+        Вираз (наприклад, "(робота OR проєкт) AND NOT архів") компілюється
+        один раз і обчислюється побітовими операціями над бітовими
+        множинами тегів, тож вартість не залежить від кількості тегів у
+        нотатках і майже не залежить від кількості нотаток. Синтаксис
+        описано в модулі tag_query. Результати впорядковані за часом створення.
+        
+        Args:
+            tag_expr (str): Булевий вираз над тегами
+            limit (Optional[int]): Максимальна кількість результатів
+            
+        Returns:
+            List[tuple[str, Note]]: Список кортежів (ідентифікатор, нотатка)
+            
+        Raises:
+            ValueError: Якщо вираз неправильний
+        """
+        expression = compile_tag_expression(tag_expr)
+        cache_key = ('tag_expr', expression.text, limit)
+        cached = self._cache.get(cache_key, self._version)
+        if cached is not VersionedLRUCache.MISS:
+            return list(cached)
+        
+        bits = expression.evaluate(lambda tag: self._tag_bits.get(tag, 0), self._live_bits)
+        found = [(note_id, self._notes[note_id])
+                 for note_id in map(self._slot_ids.__getitem__, bit_positions(bits))]
+        found.sort(key=lambda item: item[1].created_at)
+        if limit is not None:
+            del found[limit:]
+        self._cache.put(cache_key, self._version, found)
+        return list(found)
+
+    @read_locked
+    def iter_all(self, sort_by: str = 'created',
+                 limit: Optional[int] = None) -> Iterator[tuple[str, Note]]:
+        """
+        Ліниво ітерує всі нотатки у вказаному порядку
+        
+        Порядки з SORT_ORDERS підтримуються відсортованими представленнями,
+        тож перші limit нотаток читаються за O(limit) без сортування. Без
+        limit ітерація йде по знімку представлення і не ламається, якщо
+        колекцію змінюють під час перегляду. Невідомий критерій - порядок
+        додавання.
         
         Args:
             sort_by (str): Критерій сортування ('created', 'updated', 'title', 'tags')
+            limit (Optional[int]): Максимальна кількість нотаток
             
         Returns:
-            List[tuple[int, Note]]: Список кортежів (оригінальний_індекс, нотатка)
+            Iterator[tuple[str, Note]]: Кортежі (ідентифікатор, нотатка)
         """
-        indexed_notes = [(i + 1, note) for i, note in enumerate(self._notes)]
+        if sort_by not in self.SORT_ORDERS:
+            return islice(iter(list(self._notes.items())), limit)
+        
+        reverse = self.SORT_ORDERS[sort_by]
+        view = self._views[sort_by]
+        if limit is not None:
+            start, stop = (max(len(view) - limit, 0), None) if reverse else (0, limit)
+            return iter([(note_id, self._notes[note_id])
+                         for note_id in view.iter_keys(start, stop, reverse)])
         
-        if sort_by == 'created':
-            indexed_notes.sort(key=lambda x: x[1].created_at, reverse=True)
-        elif sort_by == 'updated':
-            indexed_notes.sort(key=lambda x: x[1].updated_at, reverse=True)
-        elif sort_by == 'title':
-            indexed_notes.sort(key=lambda x: x[1].title.lower())
-        elif sort_by == 'tags':
-            indexed_notes.sort(key=lambda x: len(x[1].tags), reverse=True)
+        notes = self._notes.copy()
+        return ((note_id, notes[note_id]) for note_id in view.snapshot().iter_keys(reverse=reverse))
+
+    @read_locked
+    def page(self, sort_by: str = 'created', after: Optional[str] = None,
+             limit: int = 20) -> tuple[List[tuple[str, Note]], Optional[str]]:
+        """
+        Повертає сторінку нотаток у вказаному порядку
+        
+        Сторінка будується з підтримуваних відсортованих представлень, тому
+        її вартість пропорційна розміру сторінки, а не колекції.
+        
+        Args:
+            sort_by (str): Критерій сортування ('created', 'updated', 'title', 'tags')
+            after (Optional[str]): Курсор - ідентифікатор останньої нотатки
+                попередньої сторінки
+            limit (int): Максимальна кількість нотаток на сторінці
+            
+        Returns:
+            tuple[List[tuple[str, Note]], Optional[str]]: Кортежі (ідентифікатор,
+            нотатка) сторінки та курсор наступної сторінки (None, якщо
+            сторінка остання)
+            
+        Raises:
+            ValueError: Якщо критерій сортування невідомий
+            KeyError: Якщо нотатку-курсор не знайдено
+        """
+        if sort_by not in self.SORT_ORDERS:
+            raise ValueError(f"Невідомий критерій сортування: {sort_by}")
+        note_ids, next_cursor = self._views[sort_by].page(after, limit, self.SORT_ORDERS[sort_by])
+        return [(note_id, self._notes[note_id]) for note_id in note_ids], next_cursor
+
+    @read_locked
+    def get_all_notes(self, sort_by: str = 'created') -> List[tuple[str, Note]]:
+        """
+        Повертає всі нотатки, відсортовані за вказаним критерієм
         
-        return indexed_notes
+        Args:
+            sort_by (str): Критерій сортування ('created', 'updated', 'title', 'tags')
+            
+        Returns:
+            List[tuple[str, Note]]: Список кортежів (ідентифікатор, нотатка)
+        """
+        return list(self.iter_all(sort_by))
 
+    @read_locked
     def get_all_tags(self) -> Set[str]:
         """
         Повертає всі унікальні теги з усіх нотаток
@@ -238,67 +1013,85 @@ class NoteManager:
         Returns:
             Set[str]: Множина всіх тегів
         """
-        all_tags = set()
-        for note in self._notes:
-            all_tags.update(note.tags)
-        return all_tags
+        return set(self._tag_counts)
 
+    @read_locked
     def get_tag_statistics(self) -> Dict[str, int]:
         """
         Повертає статистику використання тегів
         
         Returns:
-            Dict[str, int]: Словник {тег: кількість_використань}
+            Dict[str, int]: Словник {тег: кількість_використань}, від
+            найпопулярнішого тегу
+        """
+        return dict(self.most_common_tags())
+
+    @read_locked
+    def most_common_tags(self, n: Optional[int] = None) -> List[tuple[str, int]]:
         """
-        tag_counts = {}
-        for note in self._notes:
-            for tag in note.tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        Повертає найпопулярніші теги
+        
+        Лічильники тегів підтримуються при кожній зміні тегів, а теги
+        впорядковані за ними в індексі, тож перші n тегів читаються без
+        сортування всіх.
         
-        # Сортуємо за кількістю використань
-        return dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True))
+        Args:
+            n (Optional[int]): Кількість тегів (None - усі)
+            
+        Returns:
+            List[tuple[str, int]]: Пари (тег, кількість нотаток) від
+            найпопулярнішого, за однакової кількості - за алфавітом
+        """
+        return [(tag, self._tag_counts[tag]) for tag in self._tag_ranking.iter_keys(0, n)]
 
-    def update_note(self, index: int, title: Optional[str] = None, 
+    @write_locked
+    def update_note(self, note_id: str, title: Optional[str] = None,
                    content: Optional[str] = None, tags: Optional[List[str]] = None) -> Optional[Note]:
         """
         Оновлює існуючу нотатку
         
+        Виклик без полів фіксує зміни, внесені у нотатку безпосередньо
+        (наприклад, під час редагування у CLI), та зберігає колекцію.
+        
         Args:
-            index (int): Індекс нотатки для оновлення (починається з 1)
+            note_id (str): Ідентифікатор нотатки
             title (Optional[str]): Новий заголовок
             content (Optional[str]): Новий зміст
             tags (Optional[List[str]]): Нові теги (замінюють всі існуючі)
             
         Returns:
-            Optional[Note]: Оновлена нотатка або None, якщо індекс неправильний
+            Optional[Note]: Оновлена нотатка або None, якщо нотатки немає
             
         Raises:
             ValueError: Якщо дані не валідні
         """
-        note = self.get_note(index)
+        note = self._notes.get(note_id)
         if not note:
             return None
         
-        if title is not None:
-            note.set_title(title)
-        
-        if content is not None:
-            note.set_content(content)
-        
-        if tags is not None:
-            note.clear_tags()
-            for tag in tags:
-                note.add_tag(tag)
+        with self._editing(note_id, note):
+            if title is not None:
+                note.set_title(title)
+            
+            if content is not None:
+                note.set_content(content)
+            
+            if tags is not None:
+                note.clear_tags()
+                for tag in tags:
+                    note.add_tag(tag)
         
-        self.save_notes()
+        self.events.publish(ChangeEvent.UPDATED, note_id, note_id, note)
+        self._commit()
         return note
 
-    def add_tag_to_note(self, index: int, tag: str) -> bool:
+    @write_locked
+    def add_tag_to_note(self, note_id: str, tag: str) -> bool:
         """
         Додає тег до існуючої нотатки
         
         Args:
-            index (int): Індекс нотатки (починається з 1)
+            note_id (str): Ідентифікатор нотатки
             tag (str): Тег для додавання
             
         Returns:
@@ -307,53 +1100,62 @@ class NoteManager:
         Raises:
             ValueError: Якщо тег не валідний або вже існує
         """
-        note = self.get_note(index)
+        note = self._notes.get(note_id)
         if not note:
             return False
         
-        note.add_tag(tag)
-        self.save_notes()
+        with self._editing(note_id, note):
+            note.add_tag(tag)
+        self.events.publish(ChangeEvent.UPDATED, note_id, note_id, note)
+        self._commit()
         return True
 
-    def remove_tag_from_note(self, index: int, tag: str) -> bool:
+    @write_locked
+    def remove_tag_from_note(self, note_id: str, tag: str) -> bool:
         """
         Видаляє тег з нотатки
         
         Args:
-            index (int): Індекс нотатки (починається з 1)
+            note_id (str): Ідентифікатор нотатки
             tag (str): Тег для видалення
             
         Returns:
             bool: True, якщо тег було видалено
         """
-        note = self.get_note(index)
+        note = self._notes.get(note_id)
         if not note:
             return False
         
-        if note.remove_tag(tag):
-            self.save_notes()
+        with self._editing(note_id, note):
+            removed = note.remove_tag(tag)
+        if removed:
+            self.events.publish(ChangeEvent.UPDATED, note_id, note_id, note)
+            self._commit()
             return True
         return False
 
+    @read_locked
     def get_statistics(self) -> Dict[str, Any]:
         """
         Повертає статистику по нотатках
         
+        Кількість слів і тегів підтримується індексами інкрементально (слова
+        рахуються один раз при першому запиті), тож статистика не
+        перераховує тексти нотаток.
+        
         Returns:
             Dict[str, Any]: Словник зі статистикою
         """
         total_notes = len(self._notes)
-        total_tags = len(self.get_all_tags())
+        total_tags = len(self._tag_counts)
+        total_words = self._get_total_words()
+        notes_with_tags = self._tagged_notes
         
         if total_notes > 0:
-            total_words = sum(note.get_word_count() for note in self._notes)
             avg_words_per_note = total_words / total_notes
-            notes_with_tags = sum(1 for note in self._notes if note.tags)
-            avg_tags_per_note = sum(len(note.tags) for note in self._notes) / total_notes
+            avg_tags_per_note = sum(self._tag_counts.values()) / total_notes
         else:
-            total_words = 0
             avg_words_per_note = 0
-            notes_with_tags = 0
             avg_tags_per_note = 0
         
         return {
@@ -362,17 +1164,32 @@ class NoteManager:
             'total_words': total_words,
             'avg_words_per_note': round(avg_words_per_note, 1),
             'notes_with_tags': notes_with_tags,
-            'avg_tags_per_note': round(avg_tags_per_note, 1)
+            'avg_tags_per_note': round(avg_tags_per_note, 1),
+            'cache_hits': self._cache.hits,
+            'cache_misses': self._cache.misses
         }
 
+    @read_locked
     def __len__(self) -> int:
         """Повертає кількість нотаток у колекції"""
         return len(self._notes)
 
+    @read_locked
     def __iter__(self):
-        """Дозволяє ітерацію по нотатках"""
-        return iter(self._notes)
+        """Дозволяє ітерацію по знімку нотаток"""
+        return iter(list(self._notes.values()))
+
+    @read_locked
+    def __getitem__(self, note_id: str) -> Note:
+        """
+        Дозволяє доступ до нотаток за ідентифікатором
+        
+        Raises:
+            KeyError: Якщо нотатки немає
+        """
+        return self._notes[note_id]
 
-    def __getitem__(self, index: int) -> Note:
-        """Дозволяє доступ до нотаток за індексом (починається з 0)"""
-        return self._notes[index]
\ No newline at end of file
+    @read_locked
+    def __contains__(self, note_id: str) -> bool:
+        """Перевіряє, чи є нотатка з вказаним ідентифікатором"""
+        return note_id in self._notes
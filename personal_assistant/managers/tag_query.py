@@ -0,0 +1,192 @@
+"""
+Булеві вирази над тегами нотаток
+
+Вираз складається з тегів, операторів та дужок:
+
+    робота                          - нотатки з тегом "робота"
+    робота AND важливо              - з обома тегами (також "робота важливо")
+    робота OR проєкт                - хоча б з одним тегом (також "робота, проєкт")
+    NOT архів                       - без тегу
+    (робота OR проєкт) AND NOT архів
+
+Оператори не залежать від регістру; замість AND/OR/NOT можна писати І/АБО/НЕ.
+Пріоритет: NOT, потім AND, потім OR.
+
+Вираз компілюється один раз у дерево функцій над бітовими множинами:
+кожен тег відповідає цілому числу, біти якого - слоти нотаток з цим тегом,
+тож обчислення зводиться до побітових &, | та ~ над цілими числами.
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, List
+
+_TOKEN = re.compile(r'\(|\)|,|[^\s(),]+')
+_TAG = re.compile(r'^[a-zA-Zа-яА-ЯіІїЇєЄ0-9_\-]+$')
+
+_OPERATORS = {
+    'and': 'AND', 'і': 'AND',
+    'or': 'OR', 'або': 'OR', ',': 'OR',
+    'not': 'NOT', 'не': 'NOT',
+}
+
+# Обчислювач: (біти тегу за назвою, біти всіх нотаток) -> біти результату
+Evaluator = Callable[[Callable[[str], int], int], int]
+
+
+class TagExpression:
+    """
+    Скомпільований булевий вираз над тегами
+
+    Attributes:
+        text (str): Вихідний текст виразу
+        tags (FrozenSet[str]): Теги, що згадуються у виразі
+    """
+
+    def __init__(self, text: str, evaluator: Evaluator, tags: FrozenSet[str]):
+        self.text = text
+        self.tags = tags
+        self._evaluator = evaluator
+
+    def evaluate(self, tag_bits: Callable[[str], int], universe: int) -> int:
+        """
+        Обчислює вираз над бітовими множинами
+
+        Args:
+            tag_bits (Callable[[str], int]): Повертає біти нотаток з тегом
+                (0 для невідомого тегу)
+            universe (int): Біти всіх наявних нотаток (для NOT)
+
+        Returns:
+            int: Біти нотаток, що задовольняють вираз
+        """
+        return self._evaluator(tag_bits, universe)
+
+    def __repr__(self) -> str:
+        return f"TagExpression('{self.text}')"
+
+
+class _Parser:
+    """Рекурсивний розбір виразу з токенів"""
+
+    def __init__(self, text: str):
+        self.tokens: List[str] = _TOKEN.findall(text)
+        self.position = 0
+        self.tags = set()
+
+    def peek(self) -> str:
+        """Повертає поточний токен (порожній рядок наприкінці)"""
+        return self.tokens[self.position] if self.position < len(self.tokens) else ''
+
+    def operator(self) -> str:
+        """Повертає оператор, якщо поточний токен ним є"""
+        return self.operator_of(self.peek())
+
+    def parse(self) -> Evaluator:
+        """
+        Розбирає весь вираз
+
+        Raises:
+            ValueError: Якщо вираз неправильний
+        """
+        if not self.tokens:
+            raise ValueError("Вираз тегів не може бути порожнім")
+        evaluator = self.parse_or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Неочікуваний токен у виразі тегів: '{self.peek()}'")
+        return evaluator
+
+    def parse_or(self) -> Evaluator:
+        operands = [self.parse_and()]
+        while self.operator() == 'OR':
+            self.position += 1
+            operands.append(self.parse_and())
+        if len(operands) == 1:
+            return operands[0]
+
+        def evaluate_or(tag_bits, universe):
+            result = 0
+            for operand in operands:
+                result |= operand(tag_bits, universe)
+            return result
+        return evaluate_or
+
+    def parse_and(self) -> Evaluator:
+        operands = [self.parse_not()]
+        while True:
+            if self.operator() == 'AND':
+                self.position += 1
+            elif not self.peek() or self.peek() == ')' or self.operator() == 'OR':
+                break
+            # Сусідні операнди без оператора поєднуються через AND
+            operands.append(self.parse_not())
+        if len(operands) == 1:
+            return operands[0]
+
+        def evaluate_and(tag_bits, universe):
+            result = universe
+            for operand in operands:
+                result &= operand(tag_bits, universe)
+                if not result:
+                    break
+            return result
+        return evaluate_and
+
+    def parse_not(self) -> Evaluator:
+        if self.operator() == 'NOT':
+            self.position += 1
+            operand = self.parse_not()
+            return lambda tag_bits, universe: universe & ~operand(tag_bits, universe)
+        return self.parse_primary()
+
+    def parse_primary(self) -> Evaluator:
+        token = self.peek()
+        if not token:
+            raise ValueError("Вираз тегів обірвано: очікується тег або '('")
+        self.position += 1
+
+        if token == '(':
+            evaluator = self.parse_or()
+            if self.peek() != ')':
+                raise ValueError("Незакрита дужка у виразі тегів")
+            self.position += 1
+            return evaluator
+        if token == ')' or self.operator_of(token):
+            raise ValueError(f"Неочікуваний токен у виразі тегів: '{token}'")
+        if not _TAG.match(token):
+            raise ValueError(f"Тег може містити лише літери, цифри, дефіс та підкреслення: '{token}'")
+
+        tag = token.lower()
+        self.tags.add(tag)
+        return lambda tag_bits, universe: tag_bits(tag)
+
+    @staticmethod
+    def operator_of(token: str) -> str:
+        """Повертає оператор, якщо токен ним є"""
+        return _OPERATORS.get(token.lower(), '')
+
+
+_compiled: Dict[str, TagExpression] = {}
+_COMPILED_LIMIT = 256
+
+
+def compile_tag_expression(text: str) -> TagExpression:
+    """
+    Компілює булевий вираз над тегами (результат кешується за текстом)
+
+    Args:
+        text (str): Вираз, наприклад "(робота OR проєкт) AND NOT архів"
+
+    Returns:
+        TagExpression: Скомпільований вираз
+
+    Raises:
+        ValueError: Якщо вираз неправильний
+    """
+    expression = _compiled.get(text)
+    if expression is None:
+        parser = _Parser(text)
+        expression = TagExpression(text.strip(), parser.parse(), frozenset(parser.tags))
+        if len(_compiled) >= _COMPILED_LIMIT:
+            _compiled.clear()
+        _compiled[text] = expression
+    return expression
@@ -0,0 +1,319 @@
+"""
+Пул менеджерів для багатьох користувачів (орендарів) з витісненням холодних
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..storage.file_storage import FileStorage
+from ..utils.memory import deep_sizeof
+from .contact_manager import ContactManager
+from .note_manager import NoteManager
+
+
+class Tenant:
+    """
+    Завантажені дані одного орендаря
+
+    Attributes:
+        tenant_id (str): Ідентифікатор орендаря (назва його папки даних)
+        storage (FileStorage): Сховище орендаря
+        contacts (ContactManager): Менеджер контактів
+        notes (NoteManager): Менеджер нотаток
+        memory_bytes (int): Остання оцінка обсягу пам'яті орендаря
+    """
+
+    def __init__(self, tenant_id: str, data_dir: Path, cache_size: int = 128):
+        """
+        Завантажує дані орендаря з його папки
+
+        Args:
+            tenant_id (str): Ідентифікатор орендаря
+            data_dir (Path): Папка даних орендаря
+            cache_size (int): Розмір кешів результатів менеджерів
+        """
+        self.tenant_id = tenant_id
+        self.storage = FileStorage(str(data_dir))
+        self.contacts = ContactManager(self.storage, cache_size)
+        self.notes = NoteManager(self.storage, cache_size)
+        self.memory_bytes = 0
+        self._measured_versions: Optional[tuple] = None
+
+    def measure_memory(self) -> int:
+        """
+        Оцінює обсяг пам'яті, який займають менеджери орендаря
+
+        Повний обхід виконується лише тоді, коли з моменту попередньої
+        оцінки дані змінювалися. Блокування менеджерів лише пробуються без
+        очікування: якщо інший потік саме змінює дані, повертається
+        попередня оцінка, а нову буде зроблено при наступному виклику.
+
+        Returns:
+            int: Оцінка у байтах
+        """
+        if self._versions() != self._measured_versions:
+            with self.contacts._lock.try_read_lock() as contacts_locked, \
+                    self.notes._lock.try_read_lock() as notes_locked:
+                if contacts_locked and notes_locked:
+                    seen = set()
+                    self.memory_bytes = (deep_sizeof(self.contacts, seen)
+                                         + deep_sizeof(self.notes, seen))
+                    self._measured_versions = self._versions()
+        return self.memory_bytes
+
+    def _versions(self) -> tuple:
+        """Повертає версії даних обох менеджерів"""
+        return (self.contacts._version, self.notes._version)
+
+    def flush(self) -> None:
+        """
+        Зберігає дані обох менеджерів
+
+        Зберігаються й зміни, внесені в об'єкти напряму без update_*. Метод
+        чекає на завершення поточних операцій запису (зокрема пакетів) в
+        інших потоках.
+        """
+        self.contacts.save_contacts()
+        self.notes.save_notes()
+
+    @property
+    def closed(self) -> bool:
+        """Чи закрито менеджери орендаря"""
+        return self.contacts._closed and self.notes._closed
+
+    def close(self, blocking: bool = True) -> bool:
+        """
+        Зберігає дані орендаря та закриває його менеджери
+
+        Закриті менеджери відхиляють зміни, тож викликач, що зберіг посилання
+        на них, не перезапише дані, які пул завантажить наново.
+
+        Args:
+            blocking (bool): Чекати на завершення операцій інших потоків з
+                менеджерами; якщо False, орендар, з яким працює будь-який потік
+                (зокрема поточний), не закривається
+
+        Returns:
+            bool: True, якщо менеджери закрито цим викликом
+        """
+        if self.closed:
+            return False
+        if blocking:
+            self.contacts.close()
+            self.notes.close()
+            return True
+        with self.contacts._lock.try_write_lock() as contacts_locked, \
+                self.notes._lock.try_write_lock() as notes_locked:
+            if not (contacts_locked and notes_locked):
+                return False
+            self.contacts.close()
+            self.notes.close()
+            return True
+
+
+class TenantPool:
+    """
+    Пул менеджерів орендарів з лінивим завантаженням та LRU-витісненням
+
+    Дані орендаря завантажуються при першому зверненні і залишаються в
+    пам'яті, поки до нього звертаються. Коли сумарна оцінка пам'яті
+    перевищує бюджет, найдавніше використані орендарі зберігають
+    незбережені зміни і вивантажуються. Щойно запитаний орендар не
+    витісняється, навіть якщо сам перевищує бюджет.
+
+    Менеджери витісненого орендаря закриваються і відхиляють зміни з
+    RuntimeError, тож посилання на них не слід зберігати довше за одну
+    операцію: наступний get() завантажить орендаря наново.
+
+    Пул потокобезпечний.
+    """
+
+    def __init__(self, base_dir: str = "data", memory_budget: int = 64 * 1024 * 1024,
+                 cache_size: int = 128):
+        """
+        Ініціалізує пул
+
+        Args:
+            base_dir (str): Папка, у якій кожен орендар має власну підпапку
+            memory_budget (int): Бюджет пам'яті для всіх орендарів у байтах
+            cache_size (int): Розмір кешів результатів менеджерів орендаря
+        """
+        self.base_dir = Path(base_dir)
+        self.memory_budget = memory_budget
+        self.cache_size = cache_size
+        self._tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+        self._mutex = threading.RLock()
+        # Орендарі, що саме завантажуються: звернення до них чекають на
+        # завершення завантаження, а не на м'ютекс пулу
+        self._loading: Dict[str, threading.Event] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _validate_tenant_id(tenant_id: str) -> str:
+        """
+        Перевіряє, що ідентифікатор можна безпечно використати як назву папки
+
+        Raises:
+            ValueError: Якщо ідентифікатор порожній або містить шлях
+        """
+        if (not tenant_id or tenant_id in ('.', '..')
+                or any(separator in tenant_id for separator in ('/', '\\', '\0'))):
+            raise ValueError(f"Неправильний ідентифікатор орендаря: '{tenant_id}'")
+        return tenant_id
+
+    def get(self, tenant_id: str) -> Tenant:
+        """
+        Повертає орендаря, завантажуючи його дані за потреби
+
+        Дані завантажуються поза м'ютексом пулу, тож холодне завантаження
+        одного орендаря не затримує звернення до інших; потоки, що одночасно
+        запитали того самого орендаря, чекають на одне завантаження.
+
+        Args:
+            tenant_id (str): Ідентифікатор орендаря
+
+        Returns:
+            Tenant: Дані орендаря
+
+        Raises:
+            ValueError: Якщо ідентифікатор неправильний
+        """
+        self._validate_tenant_id(tenant_id)
+        while True:
+            with self._mutex:
+                tenant = self._tenants.get(tenant_id)
+                if tenant is not None and tenant.closed:
+                    # Орендаря витіснено, а його дані вже збережено
+                    del self._tenants[tenant_id]
+                    tenant = None
+                if tenant is not None:
+                    self._tenants.move_to_end(tenant_id)
+                    return tenant
+                loading = self._loading.get(tenant_id)
+                if loading is None:
+                    loading = self._loading[tenant_id] = threading.Event()
+                    break
+            loading.wait()
+
+        try:
+            tenant = Tenant(tenant_id, self.base_dir / tenant_id, self.cache_size)
+            with self._mutex:
+                self._tenants[tenant_id] = tenant
+                self.loads += 1
+        finally:
+            with self._mutex:
+                del self._loading[tenant_id]
+            loading.set()
+
+        self._enforce_budget(keep=tenant_id)
+        return tenant
+
+    def contacts(self, tenant_id: str) -> ContactManager:
+        """Повертає менеджер контактів орендаря"""
+        return self.get(tenant_id).contacts
+
+    def notes(self, tenant_id: str) -> NoteManager:
+        """Повертає менеджер нотаток орендаря"""
+        return self.get(tenant_id).notes
+
+    def _resident(self) -> List[Tuple[str, Tenant]]:
+        """Повертає завантажених орендарів від найдавніше використаного"""
+        with self._mutex:
+            return list(self._tenants.items())
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        """
+        Витісняє найдавніше використаних орендарів, доки пул не вкладеться в бюджет
+
+        Пам'ять оцінюється і орендарі закриваються поза м'ютексом пулу.
+        Орендар, з менеджерами якого саме працює інший потік (або поточний
+        потік під блокуванням на читання), пропускається: очікування на нього
+        могло б призвести до взаємного блокування потоків, що звертаються до
+        пулу зсередини операцій з менеджерами.
+        """
+        resident = self._resident()
+        total = sum(tenant.measure_memory() for _, tenant in resident)
+        for tenant_id, tenant in resident:
+            if total <= self.memory_budget:
+                break
+            if tenant_id == keep:
+                continue
+            if tenant.close(blocking=False):
+                total -= tenant.memory_bytes
+                self._detach(tenant_id, tenant)
+
+    def _detach(self, tenant_id: str, tenant: Tenant) -> None:
+        """Вилучає закритого орендаря з пулу та враховує витіснення"""
+        with self._mutex:
+            if self._tenants.get(tenant_id) is tenant:
+                del self._tenants[tenant_id]
+            self.evictions += 1
+
+    def trim(self) -> None:
+        """Повторно оцінює пам'ять орендарів і витісняє зайвих (наприклад, після масових змін)"""
+        self._enforce_budget()
+
+    def evict(self, tenant_id: str) -> bool:
+        """
+        Примусово вивантажує орендаря, зберігши його зміни
+
+        Метод чекає на завершення операцій інших потоків з менеджерами
+        орендаря.
+
+        Args:
+            tenant_id (str): Ідентифікатор орендаря
+
+        Returns:
+            bool: True, якщо орендар був у пам'яті
+        """
+        with self._mutex:
+            tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            return False
+        if tenant.close():
+            self._detach(tenant_id, tenant)
+        return True
+
+    def close(self) -> None:
+        """Зберігає зміни всіх орендарів та очищає пул"""
+        for tenant_id, tenant in self._resident():
+            if tenant.close():
+                self._detach(tenant_id, tenant)
+
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Повертає оцінку пам'яті кожного завантаженого орендаря
+
+        Returns:
+            Dict[str, int]: {ідентифікатор: байти} від найдавніше до
+            найнещодавніше використаного
+        """
+        return {tenant_id: tenant.measure_memory() for tenant_id, tenant in self._resident()}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Повертає статистику пулу
+
+        Returns:
+            Dict[str, Any]: Кількість завантажених орендарів, використана
+            пам'ять, бюджет, кількість завантажень та витіснень
+        """
+        report = self.memory_report()
+        return {
+            'resident_tenants': len(report),
+            'memory_bytes': sum(report.values()),
+            'memory_budget': self.memory_budget,
+            'loads': self.loads,
+            'evictions': self.evictions,
+        }
+
+    def __contains__(self, tenant_id: str) -> bool:
+        """Перевіряє, чи завантажений орендар"""
+        return tenant_id in self._tenants
+
+    def __len__(self) -> int:
+        """Повертає кількість завантажених орендарів"""
+        return len(self._tenants)
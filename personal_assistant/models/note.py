@@ -3,8 +3,9 @@
 """
 
 from datetime import datetime
-from typing import List, Set, Dict, Any, Optional
+from typing import List, Set, Dict, Any, Optional, Callable
 import re
+import uuid
 
 
 class Note:
@@ -12,14 +13,19 @@ class Note:
     Клас для зберігання та управління нотатками з тегами
     
     Attributes:
+        id (str): Незмінний унікальний ідентифікатор нотатки
         title (str): Заголовок нотатки
         content (str): Зміст нотатки
         tags (Set[str]): Множина тегів, пов'язаних з нотаткою
         created_at (datetime): Дата та час створення нотатки
         updated_at (datetime): Дата та час останнього оновлення
+    
+    Менеджер, що містить нотатку, підписується на її зміни (set_title,
+    set_content, зміни тегів), щоб підтримувати свої індекси.
     """
 
-    def __init__(self, title: str, content: str = "", tags: Optional[List[str]] = None):
+    def __init__(self, title: str, content: str = "", tags: Optional[List[str]] = None,
+                 note_id: Optional[str] = None):
         """
         Ініціалізує нову нотатку
         
@@ -27,15 +33,21 @@ class Note:
             title (str): Заголовок нотатки
             content (str): Зміст нотатки (необов'язковий)
             tags (Optional[List[str]]): Список тегів (необов'язковий)
+            note_id (Optional[str]): Ідентифікатор (None - згенерувати новий)
             
         Raises:
             ValueError: Якщо заголовок порожній
         """
+        self.id = note_id or uuid.uuid4().hex
         self.title = self._validate_title(title)
         self.content = content.strip()
         self.tags: Set[str] = set()
         self.created_at = datetime.now()
         self.updated_at = self.created_at
+        # Обробник змін від менеджера, що містить нотатку
+        self._listener: Optional[Callable[['Note'], None]] = None
+        # Кешована кількість слів (скидається при зміні заголовка чи змісту)
+        self._word_count: Optional[int] = None
         
         # Додаємо теги якщо вони передані
         if tags:
@@ -92,6 +104,12 @@ class Note:
         
         return tag
 
+    def _touch(self) -> None:
+        """Оновлює час зміни та повідомляє менеджер про зміну нотатки"""
+        self.updated_at = datetime.now()
+        if self._listener is not None:
+            self._listener(self)
+
     def set_title(self, title: str) -> None:
         """
         Встановлює новий заголовок нотатки
@@ -103,7 +121,8 @@ class Note:
             ValueError: Якщо заголовок не пройшов валідацію
         """
         self.title = self._validate_title(title)
-        self.updated_at = datetime.now()
+        self._word_count = None
+        self._touch()
 
     def set_content(self, content: str) -> None:
         """
@@ -113,7 +132,8 @@ class Note:
             content (str): Новий зміст нотатки
         """
         self.content = content.strip()
-        self.updated_at = datetime.now()
+        self._word_count = None
+        self._touch()
 
     def add_tag(self, tag: str) -> None:
         """
@@ -131,7 +151,7 @@ class Note:
             raise ValueError(f"Тег '{validated_tag}' вже існує у цій нотатці")
         
         self.tags.add(validated_tag)
-        self.updated_at = datetime.now()
+        self._touch()
 
     def remove_tag(self, tag: str) -> bool:
         """
@@ -150,7 +170,7 @@ class Note:
         
         if normalized_tag in self.tags:
             self.tags.remove(normalized_tag)
-            self.updated_at = datetime.now()
+            self._touch()
             return True
         return False
 
@@ -174,7 +194,7 @@ class Note:
         """Видаляє всі теги з нотатки"""
         if self.tags:
             self.tags.clear()
-            self.updated_at = datetime.now()
+            self._touch()
 
     def search_in_content(self, query: str, case_sensitive: bool = False) -> bool:
         """
@@ -223,12 +243,16 @@ class Note:
         """
         Підраховує кількість слів у нотатці
         
+        Результат кешується до наступної зміни заголовка чи змісту
+        через set_title/set_content.
+        
         Returns:
             int: Кількість слів
         """
-        content = f"{self.title} {self.content}"
-        words = re.findall(r'\b\w+\b', content)
-        return len(words)
+        if self._word_count is None:
+            content = f"{self.title} {self.content}"
+            self._word_count = len(re.findall(r'\b\w+\b', content))
+        return self._word_count
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -238,6 +262,7 @@ class Note:
             Dict[str, Any]: Словник з даними нотатки
         """
         return {
+            'id': self.id,
             'title': self.title,
             'content': self.content,
             'tags': list(self.tags),
@@ -266,7 +291,8 @@ class Note:
         note = cls(
             title=data['title'],
             content=data.get('content', ''),
-            tags=data.get('tags', [])
+            tags=data.get('tags', []),
+            note_id=data.get('id')
         )
         
         # Відновлюємо дати створення та оновлення, якщо вони є
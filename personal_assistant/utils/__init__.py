@@ -4,5 +4,7 @@
 
 from .validators import *
 from .command_matcher import CommandMatcher
+from .sorted_index import SortedIndex
+from .events import ChangeEvent, EventStream
 
-__all__ = ['CommandMatcher']
\ No newline at end of file
+__all__ = ['CommandMatcher', 'SortedIndex', 'ChangeEvent', 'EventStream']
\ No newline at end of file
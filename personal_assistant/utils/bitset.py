@@ -0,0 +1,70 @@
+"""
+Модуль для роботи з бітовими множинами у вигляді цілих чисел Python
+"""
+
+from typing import Iterable, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def bit_positions(bits: int) -> List[int]:
+    """
+    Повертає номери встановлених бітів у порядку зростання
+
+    З NumPy біти розпаковуються векторно; без неї встановлені біти
+    шукаються у двійковому рядку числа, тож обидва шляхи лінійні за
+    розміром множини, а не квадратичні, як почергове скидання молодшого біта.
+
+    Args:
+        bits (int): Бітова множина (невід'ємне ціле число)
+
+    Returns:
+        List[int]: Номери встановлених бітів
+    """
+    if bits <= 0:
+        return []
+
+    if NUMPY_AVAILABLE:
+        data = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(data, bitorder='little')).tolist()
+
+    digits = bin(bits)[:1:-1]
+    positions = []
+    position = digits.find('1')
+    while position != -1:
+        positions.append(position)
+        position = digits.find('1', position + 1)
+    return positions
+
+
+def bits_from_positions(positions: Iterable[int]) -> int:
+    """
+    Будує бітову множину з номерів бітів за один прохід
+
+    Почергове "bits |= 1 << position" щоразу створює нове ціле число
+    розміром з усю множину, тож n вставок коштують O(n^2 / 64). Тут біти
+    виставляються в масиві байтів, який перетворюється на число один раз.
+
+    Args:
+        positions (Iterable[int]): Номери бітів (невід'ємні)
+
+    Returns:
+        int: Бітова множина
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+
+    if NUMPY_AVAILABLE:
+        flags = np.zeros(max(positions) + 1, dtype=np.uint8)
+        flags[positions] = 1
+        return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+    data = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, 'little')
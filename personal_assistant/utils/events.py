@@ -0,0 +1,182 @@
+"""
+Модуль з потоком подій про зміни колекцій для інкрементальних споживачів
+"""
+
+import queue
+import time
+from typing import Any, Callable, Hashable, List, Optional
+
+
+class ChangeEvent:
+    """
+    Подія зміни елемента колекції
+
+    Attributes:
+        kind (str): Вид зміни (ADDED, UPDATED або REMOVED)
+        source (str): Назва колекції ('contacts' або 'notes')
+        before_key (Optional[Hashable]): Ключ елемента до зміни (None для ADDED)
+        after_key (Optional[Hashable]): Ключ елемента після зміни (None для REMOVED)
+        item (Any): Сам елемент (для REMOVED - видалений об'єкт)
+    """
+
+    ADDED = 'added'
+    UPDATED = 'updated'
+    REMOVED = 'removed'
+
+    __slots__ = ('kind', 'source', 'before_key', 'after_key', 'item')
+
+    def __init__(self, kind: str, source: str, before_key: Optional[Hashable],
+                 after_key: Optional[Hashable], item: Any):
+        self.kind = kind
+        self.source = source
+        self.before_key = before_key
+        self.after_key = after_key
+        self.item = item
+
+    @property
+    def key(self) -> Hashable:
+        """Актуальний ключ елемента (після зміни, а для видалення - до неї)"""
+        return self.after_key if self.after_key is not None else self.before_key
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.kind}, {self.source}, {self.before_key!r} -> {self.after_key!r})"
+
+
+class EventStream:
+    """
+    Потік подій про зміни з синхронними підписниками та підписниками-чергами
+
+    Поки підписників немає, publish() повертається одразу, не створюючи
+    об'єкт події, тож менеджери без споживачів майже нічого не втрачають.
+    Під час пакетних змін події утримуються і доставляються лише після
+    успішного завершення пакета (або відкидаються при відкаті).
+
+    Час доставки накопичується у статистиці, щоб накладні витрати
+    підписників можна було виміряти.
+    """
+
+    def __init__(self, source: str):
+        """
+        Ініціалізує потік подій
+
+        Args:
+            source (str): Назва колекції для поля ChangeEvent.source
+        """
+        self.source = source
+        # Список замінюється, а не змінюється, тож доставка ітерує
+        # незмінний знімок навіть при одночасній підписці
+        self._subscribers: List[Callable[[ChangeEvent], None]] = []
+        self._held: Optional[List[ChangeEvent]] = None
+        self.published = 0
+        self.delivery_time = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Чи є хоча б один підписник"""
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+        """
+        Підписує функцію на події (виклик синхронний, у потоці зміни)
+
+        Args:
+            callback (Callable[[ChangeEvent], None]): Обробник події
+
+        Returns:
+            Callable[[], None]: Функція для відписки
+        """
+        self._subscribers = self._subscribers + [callback]
+        return lambda: self.unsubscribe(callback)
+
+    def subscribe_queue(self, event_queue: Optional[queue.Queue] = None) -> queue.Queue:
+        """
+        Підписує чергу на події для обробки в іншому потоці
+
+        Args:
+            event_queue (Optional[queue.Queue]): Черга (None - створити необмежену)
+
+        Returns:
+            queue.Queue: Черга, у яку надходитимуть події
+        """
+        if event_queue is None:
+            event_queue = queue.Queue()
+        self.subscribe(event_queue.put)
+        return event_queue
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> bool:
+        """
+        Відписує обробник або чергу (за методом put)
+
+        Args:
+            callback (Callable[[ChangeEvent], None]): Обробник, переданий у subscribe
+
+        Returns:
+            bool: True, якщо обробник було відписано
+        """
+        if isinstance(callback, queue.Queue):
+            callback = callback.put
+        if callback not in self._subscribers:
+            return False
+        subscribers = list(self._subscribers)
+        subscribers.remove(callback)
+        self._subscribers = subscribers
+        return True
+
+    def publish(self, kind: str, before_key: Optional[Hashable],
+                after_key: Optional[Hashable], item: Any) -> None:
+        """
+        Публікує подію зміни
+
+        Args:
+            kind (str): Вид зміни (ChangeEvent.ADDED, UPDATED або REMOVED)
+            before_key (Optional[Hashable]): Ключ до зміни
+            after_key (Optional[Hashable]): Ключ після зміни
+            item (Any): Елемент колекції
+        """
+        if not self._subscribers:
+            return
+        event = ChangeEvent(kind, self.source, before_key, after_key, item)
+        if self._held is not None:
+            self._held.append(event)
+        else:
+            self._deliver([event])
+
+    def hold(self) -> None:
+        """Починає утримувати події (початок пакета)"""
+        self._held = []
+
+    def release(self) -> None:
+        """Доставляє утримані події (успішне завершення пакета)"""
+        held, self._held = self._held, None
+        if held:
+            self._deliver(held)
+
+    def discard(self) -> None:
+        """Відкидає утримані події (відкат пакета)"""
+        self._held = None
+
+    def _deliver(self, events: List[ChangeEvent]) -> None:
+        """Доставляє події всім підписникам; помилка обробника не зупиняє інших"""
+        started = time.perf_counter()
+        subscribers = self._subscribers
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Помилка обробника подій: {e}")
+        self.published += len(events)
+        self.delivery_time += time.perf_counter() - started
+
+    def get_statistics(self) -> dict:
+        """
+        Повертає статистику доставки подій
+
+        Returns:
+            dict: Кількість підписників, доставлених подій та сумарний час доставки (с)
+        """
+        return {
+            'subscribers': len(self._subscribers),
+            'published': self.published,
+            'delivery_seconds': self.delivery_time,
+        }
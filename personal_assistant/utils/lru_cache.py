@@ -0,0 +1,91 @@
+"""
+Модуль з обмеженим LRU-кешем результатів, позначених версією колекції
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class VersionedLRUCache:
+    """
+    Обмежений кеш результатів запитів з витісненням найдавніше використаних
+
+    Кожен запис позначається версією колекції, для якої його обчислено.
+    Менеджер збільшує версію при кожній зміні, тому запис зі старою
+    версією вважається промахом і ніколи не повертається.
+
+    Кеш має власне блокування, тому ним можна користуватися з кількох
+    потоків-читачів одночасно.
+    """
+
+    # Маркер відсутності значення (None може бути валідним результатом)
+    MISS = object()
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Ініціалізує кеш
+
+        Args:
+            maxsize (int): Максимальна кількість записів (0 вимикає кеш)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._mutex = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Any:
+        """
+        Повертає закешоване значення для поточної версії колекції
+
+        Args:
+            key (Hashable): Нормалізований ключ запиту
+            version (int): Поточна версія колекції
+
+        Returns:
+            Any: Значення або VersionedLRUCache.MISS
+        """
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return self.MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        Зберігає значення у кеші
+
+        Args:
+            key (Hashable): Нормалізований ключ запиту
+            version (int): Версія колекції, для якої обчислено значення
+            value (Any): Значення
+        """
+        if self.maxsize <= 0:
+            return
+        with self._mutex:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищає кеш (лічильники влучань і промахів зберігаються)"""
+        with self._mutex:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Повертає статистику використання кешу
+
+        Returns:
+            Dict[str, int]: Кількість влучань, промахів та записів
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def __len__(self) -> int:
+        """Повертає кількість записів у кеші"""
+        return len(self._entries)
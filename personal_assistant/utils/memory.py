@@ -0,0 +1,60 @@
+"""
+Модуль для оцінки обсягу пам'яті, яку займають об'єкти
+"""
+
+import sys
+import types
+from collections import deque
+from typing import Any, Optional, Set
+
+# Функції, методи, класи та модулі спільні для всіх об'єктів і не
+# належать до даних конкретного менеджера
+_SHARED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, types.BuiltinMethodType,
+)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Оцінює обсяг пам'яті об'єкта разом з усіма досяжними з нього даними
+
+    Обходяться словники, колекції та атрибути об'єктів (__dict__ і
+    __slots__). Кожен об'єкт враховується один раз, тож спільні рядки та
+    поля, на які посилаються кілька індексів, не подвоюються. Функції,
+    методи, класи та модулі не враховуються.
+
+    Args:
+        obj (Any): Об'єкт для оцінки
+        seen (Optional[Set[int]]): id вже врахованих об'єктів (для спільного
+            обліку кількох об'єктів)
+
+    Returns:
+        int: Оцінка обсягу пам'яті у байтах
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        else:
+            attributes = getattr(current, '__dict__', None)
+            if attributes is not None:
+                stack.append(attributes)
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
@@ -0,0 +1,130 @@
+"""
+Модуль для пошуку регулярними виразами по текстах нотаток
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+_WORD = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Компілює регулярний вираз з LRU-кешем скомпільованих виразів
+
+    Args:
+        pattern (str): Регулярний вираз
+        flags (int): Прапорці re (re.IGNORECASE, re.MULTILINE, ...)
+
+    Returns:
+        re.Pattern: Скомпільований вираз
+
+    Raises:
+        ValueError: Якщо вираз неправильний
+    """
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"Неправильний регулярний вираз: {e}") from None
+
+
+def required_words(pattern: str, flags: int = 0) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Витягує зі виразу слова, які обов'язково є в кожному збігу
+
+    Розглядаються лише послідовні літерали на верхньому рівні виразу.
+    Слово літерала повне, якщо з обох боків його обмежує не-словесний
+    символ літерала, межа \\b або початок/кінець рядка; якщо обмежено лише
+    початок - це префікс слова тексту. Такі слова можна шукати в
+    текстовому індексі (у нижньому регістрі) до запуску виразу.
+
+    З re.IGNORECASE без re.ASCII слова не витягуються: Unicode-порівняння
+    без регістру зіставляє літери, які lower() не зводить докупи (ſ і s).
+
+    Args:
+        pattern (str): Регулярний вираз
+        flags (int): Прапорці re
+
+    Returns:
+        Optional[Tuple[List[str], List[str]]]: (повні слова, префікси) або
+        None, якщо жодного слова витягнути не вдалося
+    """
+    if flags & re.IGNORECASE and not flags & re.ASCII:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE and not parsed.state.flags & re.ASCII:
+        return None
+
+    # Межі, після/перед якими слово тексту гарантовано починається/закінчується
+    boundaries = {sre_parse.AT_BOUNDARY, sre_parse.AT_BEGINNING_STRING}
+    end_boundaries = {sre_parse.AT_BOUNDARY, sre_parse.AT_END_STRING}
+    if not flags & re.MULTILINE:
+        boundaries.add(sre_parse.AT_BEGINNING)
+        end_boundaries.add(sre_parse.AT_END)
+    if flags & re.ASCII:
+        # \b у режимі ASCII не збігається з межами Unicode-слів індексу
+        boundaries.discard(sre_parse.AT_BOUNDARY)
+        end_boundaries.discard(sre_parse.AT_BOUNDARY)
+
+    terms: List[str] = []
+    prefixes: List[str] = []
+    items = list(parsed)
+    position = 0
+    while position < len(items):
+        if items[position][0] is not sre_parse.LITERAL:
+            position += 1
+            continue
+        start = position
+        while position < len(items) and items[position][0] is sre_parse.LITERAL:
+            position += 1
+        literal = ''.join(chr(value) for _, value in items[start:position]).lower()
+
+        before = items[start - 1] if start > 0 else None
+        after = items[position] if position < len(items) else None
+        left_bounded = before is not None and before[0] is sre_parse.AT and before[1] in boundaries
+        right_bounded = after is not None and after[0] is sre_parse.AT and after[1] in end_boundaries
+
+        for match in _WORD.finditer(literal):
+            complete_left = match.start() > 0 or left_bounded
+            complete_right = match.end() < len(literal) or right_bounded
+            if complete_left and complete_right:
+                terms.append(match.group())
+            elif complete_left:
+                prefixes.append(match.group())
+
+    if not terms and not prefixes:
+        return None
+    return terms, prefixes
+
+
+def search_texts(pattern: str, flags: int,
+                 texts: Sequence[Tuple[str, str]]) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Шукає вираз у текстах (також виконується у процесах-обробниках)
+
+    Args:
+        pattern (str): Регулярний вираз
+        flags (int): Прапорці re
+        texts (Sequence[Tuple[str, str]]): Пари (ідентифікатор, текст)
+
+    Returns:
+        List[Tuple[str, List[Tuple[int, int]]]]: Ідентифікатори текстів зі
+        збігами та позиції (початок, кінець) усіх збігів
+    """
+    regex = compile_pattern(pattern, flags)
+    found = []
+    for text_id, text in texts:
+        spans = [match.span() for match in regex.finditer(text)]
+        if spans:
+            found.append((text_id, spans))
+    return found
@@ -0,0 +1,228 @@
+"""
+Модуль з блокуванням читачі/письменник для потокобезпечних менеджерів
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class ReadWriteLock:
+    """
+    Реентерабельне блокування "багато читачів / один письменник"
+
+    Читачі працюють паралельно, письменник отримує ексклюзивний доступ.
+    Письменники мають пріоритет: нові читачі чекають, доки письменник, що
+    стоїть у черзі, не завершить роботу, тож потік читачів не може
+    відкладати запис безкінечно. Потік, що вже тримає блокування, може
+    отримати його повторно (письменник - і на читання, і на запис).
+    Підвищення блокування з читання до запису не підтримується; зміну, яку
+    потік ініціює під блокуванням на читання, можна відкласти через
+    write_or_defer().
+    """
+
+    def __init__(self):
+        """Ініціалізує блокування"""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        # Відкладені через write_or_defer() дії потоків, що тримали блокування на читання
+        self._deferred: Dict[int, List[Callable[[], None]]] = {}
+
+    def acquire_read(self, blocking: bool = True) -> bool:
+        """
+        Отримує блокування на читання
+
+        Args:
+            blocking (bool): Чекати, якщо блокування зайняте письменником;
+                якщо False, одразу повертає результат спроби
+
+        Returns:
+            bool: True, якщо блокування отримано
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if thread_id in self._readers or self._writer == thread_id:
+                # Повторний вхід не чекає, інакше потік заблокує сам себе
+                self._readers[thread_id] = self._readers.get(thread_id, 0) + 1
+                return True
+            while self._writer is not None or self._waiting_writers:
+                if not blocking:
+                    return False
+                self._condition.wait()
+            self._readers[thread_id] = 1
+            return True
+
+    def release_read(self) -> None:
+        """
+        Звільняє блокування на читання
+
+        Raises:
+            RuntimeError: Якщо потік не тримає блокування на читання
+        """
+        thread_id = threading.get_ident()
+        deferred = None
+        with self._condition:
+            count = self._readers.get(thread_id)
+            if not count:
+                raise RuntimeError("Потік не тримає блокування на читання")
+            if count == 1:
+                del self._readers[thread_id]
+                deferred = self._deferred.pop(thread_id, None)
+                if not self._readers:
+                    self._condition.notify_all()
+            else:
+                self._readers[thread_id] = count - 1
+        if deferred:
+            with self.write_lock():
+                for action in deferred:
+                    action()
+
+    def acquire_write(self, blocking: bool = True) -> bool:
+        """
+        Отримує ексклюзивне блокування на запис
+
+        Args:
+            blocking (bool): Чекати, якщо блокування зайняте; якщо False,
+                отримує лише вільне блокування і одразу повертає результат
+
+        Returns:
+            bool: True, якщо блокування отримано
+
+        Raises:
+            RuntimeError: Якщо потік тримає лише блокування на читання і
+                очікування дозволене
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if not blocking:
+                # Спроба вдається лише на вільному блокуванні, зокрема не
+                # вкладається у блокування, яке вже тримає цей потік
+                if self._writer is not None or self._readers:
+                    return False
+                self._writer = thread_id
+                self._writer_depth = 1
+                return True
+            if self._writer == thread_id:
+                self._writer_depth += 1
+                return True
+            if thread_id in self._readers:
+                raise RuntimeError("Неможливо підвищити блокування з читання до запису")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = thread_id
+            self._writer_depth = 1
+            return True
+
+    def release_write(self) -> None:
+        """
+        Звільняє блокування на запис
+
+        Raises:
+            RuntimeError: Якщо потік не тримає блокування на запис
+        """
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Потік не тримає блокування на запис")
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    def write_or_defer(self, action: Callable[[], None]) -> None:
+        """
+        Виконує дію під блокуванням на запис або відкладає її
+
+        Якщо потік тримає лише блокування на читання, підвищити його не можна,
+        тож дія виконується під блокуванням на запис одразу після того, як
+        потік звільнить останнє блокування на читання.
+
+        Args:
+            action (Callable[[], None]): Дія, що змінює захищені дані
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if thread_id in self._readers and self._writer != thread_id:
+                self._deferred.setdefault(thread_id, []).append(action)
+                return
+        with self.write_lock():
+            action()
+
+    @contextmanager
+    def read_lock(self):
+        """Контекст блокування на читання"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def try_read_lock(self):
+        """
+        Контекст неблокуючої спроби отримати блокування на читання
+
+        Yields:
+            bool: True, якщо блокування отримано (і буде звільнене при виході)
+        """
+        acquired = self.acquire_read(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release_read()
+
+    @contextmanager
+    def write_lock(self):
+        """Контекст блокування на запис"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    @contextmanager
+    def try_write_lock(self):
+        """
+        Контекст неблокуючої спроби отримати вільне блокування на запис
+
+        Yields:
+            bool: True, якщо блокування отримано (і буде звільнене при виході)
+        """
+        acquired = self.acquire_write(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release_write()
+
+
+def read_locked(method: Callable) -> Callable:
+    """Декоратор методу, що виконується під блокуванням self._lock на читання"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def write_locked(method: Callable) -> Callable:
+    """
+    Декоратор методу, що виконується під блокуванням self._lock на запис
+
+    Якщо об'єкт закрито (атрибут _closed), метод відхиляється з RuntimeError.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_lock():
+            if getattr(self, '_closed', False):
+                raise RuntimeError(f"{type(self).__name__} закрито, зміни не приймаються")
+            return method(self, *args, **kwargs)
+    return wrapper
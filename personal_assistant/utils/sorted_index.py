@@ -0,0 +1,214 @@
+"""
+Модуль з відсортованим індексом для підтримки впорядкованих представлень колекцій
+"""
+
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class SortedIndex:
+    """
+    Відсортоване представлення колекції, що підтримується інкрементально
+
+    Зберігає записи (ключ_сортування, ключ_елемента) у відсортованому списку.
+    Вставка та видалення виконуються через bisect, тому повне сортування
+    колекції ніколи не потрібне. Ключ елемента є унікальним і служить
+    остаточним критерієм при однакових ключах сортування, а також курсором
+    для посторінкового перегляду. Масове наповнення (наприклад, при
+    завантаженні) виконується в блоці bulk() з одним сортуванням наприкінці.
+    """
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._entries: List[Tuple[Any, Hashable]] = []
+        self._sort_keys: Dict[Hashable, Any] = {}
+        self._bulk = False
+
+    @contextmanager
+    def bulk(self):
+        """
+        Контекст масових змін: записи лише збираються, а список сортується
+        один раз при виході
+
+        Окрема вставка коштує O(n) через зсув списку, тож n вставок
+        поспіль - це O(n^2); у блоці bulk() ті самі зміни коштують
+        O(n log n). Усередині блоку впорядковані запити (позиції,
+        ітерація, сторінки) недоступні - лише add, remove, len та in.
+        """
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            self._entries = sorted((sort_key, item_key) for item_key, sort_key in self._sort_keys.items())
+
+    def add(self, item_key: Hashable, sort_key: Any) -> None:
+        """
+        Додає елемент до індексу (або переміщує, якщо він уже є)
+
+        Args:
+            item_key (Hashable): Унікальний ключ елемента
+            sort_key (Any): Ключ сортування
+        """
+        if self._bulk:
+            self._sort_keys[item_key] = sort_key
+            return
+        if item_key in self._sort_keys:
+            self.remove(item_key)
+        self._sort_keys[item_key] = sort_key
+        insort(self._entries, (sort_key, item_key))
+
+    def remove(self, item_key: Hashable) -> bool:
+        """
+        Видаляє елемент з індексу
+
+        Args:
+            item_key (Hashable): Ключ елемента
+
+        Returns:
+            bool: True, якщо елемент було видалено
+        """
+        if item_key not in self._sort_keys:
+            return False
+        if self._bulk:
+            del self._sort_keys[item_key]
+            return True
+        position = self.position_of(item_key)
+        del self._entries[position]
+        del self._sort_keys[item_key]
+        return True
+
+    def snapshot(self) -> 'SortedIndex':
+        """
+        Повертає незалежну копію індексу для ітерації без блокувань
+
+        Копіюються лише списки посилань, тому операція швидка навіть для
+        великих колекцій.
+
+        Returns:
+            SortedIndex: Копія індексу
+        """
+        copy = SortedIndex()
+        copy._entries = self._entries[:]
+        copy._sort_keys = self._sort_keys.copy()
+        return copy
+
+    def clear(self) -> None:
+        """Очищає індекс"""
+        self._entries = []
+        self._sort_keys = {}
+
+    def position_of(self, item_key: Hashable) -> Optional[int]:
+        """
+        Повертає позицію елемента у відсортованому порядку
+
+        Args:
+            item_key (Hashable): Ключ елемента
+
+        Returns:
+            Optional[int]: Позиція (починається з 0) або None, якщо елемента немає
+        """
+        if item_key not in self._sort_keys:
+            return None
+        return bisect_left(self._entries, (self._sort_keys[item_key], item_key))
+
+    def bisect(self, sort_key: Any) -> int:
+        """
+        Повертає першу позицію, ключ сортування якої не менший за вказаний
+
+        Args:
+            sort_key (Any): Ключ сортування для пошуку
+
+        Returns:
+            int: Позиція вставки
+        """
+        return bisect_left(self._entries, (sort_key,))
+
+    def keys_between(self, low: Any, high: Any) -> List[Hashable]:
+        """
+        Повертає ключі елементів з ключем сортування у діапазоні [low, high)
+
+        Межі знаходяться через bisect, тож вартість - O(log n + k), де k -
+        кількість елементів у діапазоні.
+
+        Args:
+            low (Any): Нижня межа ключа сортування (включно)
+            high (Any): Верхня межа ключа сортування (не включно)
+
+        Returns:
+            List[Hashable]: Ключі елементів у відсортованому порядку
+        """
+        start, stop = self.bisect(low), self.bisect(high)
+        return [entry[1] for entry in self._entries[start:stop]]
+
+    def key_at(self, position: int) -> Hashable:
+        """Повертає ключ елемента на вказаній позиції"""
+        return self._entries[position][1]
+
+    def iter_keys(self, start: int = 0, stop: Optional[int] = None,
+                  reverse: bool = False) -> Iterator[Hashable]:
+        """
+        Ітерує ключі елементів у діапазоні позицій [start, stop)
+
+        Args:
+            start (int): Початкова позиція
+            stop (Optional[int]): Кінцева позиція (не включається)
+            reverse (bool): Ітерувати від stop-1 до start
+
+        Yields:
+            Hashable: Ключі елементів
+        """
+        entries = self._entries
+        if stop is None or stop > len(entries):
+            stop = len(entries)
+        positions = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        for position in positions:
+            yield entries[position][1]
+
+    def page(self, after: Optional[Hashable] = None, limit: int = 20,
+             reverse: bool = False) -> Tuple[List[Hashable], Optional[Hashable]]:
+        """
+        Повертає сторінку ключів після курсора
+
+        Args:
+            after (Optional[Hashable]): Ключ останнього елемента попередньої сторінки
+            limit (int): Максимальна кількість елементів на сторінці
+            reverse (bool): Перегляд у зворотному порядку
+
+        Returns:
+            Tuple[List[Hashable], Optional[Hashable]]: Ключі сторінки та курсор
+            для наступної сторінки (None, якщо сторінка остання)
+        """
+        size = len(self._entries)
+        if after is None:
+            start = size - 1 if reverse else 0
+        else:
+            position = self.position_of(after)
+            if position is None:
+                raise KeyError(after)
+            start = position - 1 if reverse else position + 1
+
+        if reverse:
+            stop = max(start - limit, -1)
+            keys = [self._entries[i][1] for i in range(start, stop, -1)]
+            has_more = stop >= 0
+        else:
+            stop = min(start + limit, size)
+            keys = [self._entries[i][1] for i in range(start, stop)]
+            has_more = stop < size
+
+        next_cursor = keys[-1] if keys and has_more else None
+        return keys, next_cursor
+
+    def __len__(self) -> int:
+        """Повертає кількість елементів в індексі"""
+        return len(self._sort_keys)
+
+    def __contains__(self, item_key: Hashable) -> bool:
+        """Перевіряє, чи є елемент в індексі"""
+        return item_key in self._sort_keys
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Ітерує ключі елементів у відсортованому порядку"""
+        return self.iter_keys()
@@ -0,0 +1,387 @@
+"""
+Модуль з інвертованим індексом тексту для повнотекстового пошуку
+
+Запит до індексу - слова, які мають бути в документі, а також:
+
+    "квартальний звіт"   - фраза: слова поспіль в одному полі
+    бюдж*                - будь-яке слово з префіксом "бюдж"
+"""
+
+import heapq
+import math
+import re
+from contextlib import contextmanager
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple, Union
+
+from .sorted_index import SortedIndex
+
+_TOKEN = re.compile(r'\w+')
+_PHRASE = re.compile(r'"([^"]*)"?')
+
+# Позиції слова в полі документа: одне число, якщо слово трапляється один
+# раз (так буває найчастіше), інакше кортеж чисел за зростанням
+Positions = Union[int, Tuple[int, ...]]
+
+
+def _as_tuple(positions: Positions) -> Tuple[int, ...]:
+    """Повертає позиції слова кортежем"""
+    return (positions,) if positions.__class__ is int else positions
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Розбиває текст на слова у нижньому регістрі
+
+    Args:
+        text (str): Текст
+
+    Returns:
+        List[str]: Слова у порядку появи
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class TextQuery:
+    """
+    Розібраний запит до текстового індексу
+
+    Attributes:
+        terms (List[str]): Слова, які мають бути в документі
+        prefixes (List[str]): Префікси слів (з запису "слово*")
+        phrases (List[List[str]]): Фрази з двох і більше слів
+        literals (List[str]): Текстові частини запиту без лапок і зірочок
+            (для перевірки з урахуванням регістру)
+    """
+
+    def __init__(self, query: str, prefix_last: bool = False):
+        """
+        Розбирає запит
+
+        Args:
+            query (str): Пошуковий запит
+            prefix_last (bool): Вважати префіксом останнє слово запиту, якщо
+                воно не в лапках (пошук за початком слова, як при введенні)
+        """
+        self.terms: List[str] = []
+        self.prefixes: List[str] = []
+        self.phrases: List[List[str]] = []
+        self.literals: List[str] = []
+
+        for phrase in _PHRASE.findall(query):
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                self.phrases.append(tokens)
+            else:
+                self.terms.extend(tokens)
+            if phrase.strip():
+                self.literals.append(phrase.strip())
+
+        words = _PHRASE.sub(' ', query).split()
+        if prefix_last and words and not query.rstrip().endswith('"') and not words[-1].endswith('*'):
+            words[-1] += '*'
+        for word in words:
+            is_prefix = word.endswith('*')
+            tokens = tokenize(word)
+            if is_prefix and tokens:
+                self.terms.extend(tokens[:-1])
+                self.prefixes.append(tokens[-1])
+            else:
+                self.terms.extend(tokens)
+            literal = word.rstrip('*') if is_prefix else word
+            if literal:
+                self.literals.append(literal)
+
+    @property
+    def empty(self) -> bool:
+        """Чи немає у запиті жодного слова"""
+        return not (self.terms or self.prefixes or self.phrases)
+
+
+class TextIndex:
+    """
+    Позиційний інвертований індекс по полях: поле -> слово -> {документ: позиції}
+
+    Документ складається з кількох полів (для нотаток - заголовок і зміст).
+    Позиції слова в полі документа зберігаються числом або кортежем чисел
+    (див. Positions): такі об'єкти не відстежуються збирачем сміття, тож
+    навіть великий індекс будується швидко. Запит торкається лише списків
+    документів для слів запиту; префікси розгортаються через відсортований
+    словник слів, а фрази перевіряються з'єднанням позицій на документах,
+    що містять усі слова фрази. Сумарні довжини полів підтримуються для ранжування BM25.
+    Масове наповнення (побудова за колекцією) виконується в блоці bulk().
+    """
+
+    def __init__(self, fields: int = 2):
+        """
+        Ініціалізує порожній індекс
+
+        Args:
+            fields (int): Кількість полів документа
+        """
+        self.fields = fields
+        self._postings: List[Dict[str, Dict[Hashable, Positions]]] = [{} for _ in range(fields)]
+        self._texts: Dict[Hashable, Tuple[str, ...]] = {}
+        self._lengths: Dict[Hashable, Tuple[int, ...]] = {}
+        self._total_lengths = [0] * fields
+        # Відсортований словник слів усіх полів для розгортання префіксів
+        self._terms = SortedIndex()
+
+    @contextmanager
+    def bulk(self):
+        """
+        Контекст масового додавання документів
+
+        Словник слів для префіксів сортується один раз при виході, а не
+        вставкою кожного нового слова. Усередині блоку префіксні запити
+        недоступні.
+        """
+        with self._terms.bulk():
+            yield self
+
+    def add(self, doc_id: Hashable, *texts: str) -> None:
+        """
+        Індексує документ (або переіндексовує, якщо він уже є)
+
+        Args:
+            doc_id (Hashable): Ідентифікатор документа
+            *texts (str): Поля документа у порядку полів (заголовок, зміст)
+
+        Raises:
+            ValueError: Якщо кількість полів не відповідає індексу
+        """
+        if len(texts) != self.fields:
+            raise ValueError(f"Очікується полів: {self.fields}, отримано: {len(texts)}")
+        if doc_id in self._texts:
+            self.remove(doc_id)
+        self._texts[doc_id] = texts
+
+        lengths = []
+        for field, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            self._total_lengths[field] += len(tokens)
+            positions: Dict[str, Positions] = {}
+            repeated: Dict[str, List[int]] = {}
+            for position, token in enumerate(tokens):
+                if token not in positions:
+                    positions[token] = position
+                elif token in repeated:
+                    repeated[token].append(position)
+                else:
+                    repeated[token] = [positions[token], position]
+            for token, token_positions in repeated.items():
+                positions[token] = tuple(token_positions)
+            postings = self._postings[field]
+            for token, token_positions in positions.items():
+                documents = postings.get(token)
+                if documents is None:
+                    documents = postings[token] = {}
+                    if token not in self._terms:
+                        self._terms.add(token, token)
+                documents[doc_id] = token_positions
+        self._lengths[doc_id] = tuple(lengths)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """
+        Прибирає документ з індексу
+
+        Слова документа беруться з його збереженого тексту.
+
+        Args:
+            doc_id (Hashable): Ідентифікатор документа
+
+        Returns:
+            bool: True, якщо документ був в індексі
+        """
+        texts = self._texts.pop(doc_id, None)
+        if texts is None:
+            return False
+        lengths = self._lengths.pop(doc_id)
+        for field, text in enumerate(texts):
+            self._total_lengths[field] -= lengths[field]
+            postings = self._postings[field]
+            for token in set(tokenize(text)):
+                documents = postings[token]
+                del documents[doc_id]
+                if not documents:
+                    del postings[token]
+                    if not any(token in other for other in self._postings):
+                        self._terms.remove(token)
+        return True
+
+    def clear(self) -> None:
+        """Очищає індекс"""
+        self._postings = [{} for _ in range(self.fields)]
+        self._texts = {}
+        self._lengths = {}
+        self._total_lengths = [0] * self.fields
+        self._terms.clear()
+
+    def documents(self, token: str) -> Set[Hashable]:
+        """
+        Повертає документи, що містять слово хоча б в одному полі
+
+        Args:
+            token (str): Слово у нижньому регістрі
+
+        Returns:
+            Set[Hashable]: Ідентифікатори документів
+        """
+        found: Set[Hashable] = set()
+        for postings in self._postings:
+            found.update(postings.get(token, ()))
+        return found
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """
+        Повертає слова індексу з вказаним префіксом
+
+        Args:
+            prefix (str): Префікс у нижньому регістрі
+
+        Returns:
+            List[str]: Слова у алфавітному порядку
+        """
+        # Слова з префіксом лежать у словнику поспіль, від першого не
+        # меншого за префікс і до першого, що з нього не починається
+        terms = []
+        for term in self._terms.iter_keys(self._terms.bisect(prefix)):
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _contains_phrase(self, doc_id: Hashable, tokens: List[str]) -> bool:
+        """
+        Перевіряє, чи стоять слова фрази поспіль в одному з полів документа
+
+        Позиції початку фрази - це позиції першого слова, які зсуваються
+        і перетинаються з позиціями кожного наступного слова.
+        """
+        for postings in self._postings:
+            starts = postings.get(tokens[0], {}).get(doc_id)
+            if starts is None:
+                continue
+            starts = set(_as_tuple(starts))
+            for offset, token in enumerate(tokens[1:], 1):
+                following = postings.get(token, {}).get(doc_id)
+                if following is None:
+                    starts = None
+                    break
+                starts.intersection_update(position - offset for position in _as_tuple(following))
+                if not starts:
+                    break
+            if starts:
+                return True
+        return False
+
+    def search(self, query: str, prefix_last: bool = False) -> Optional[Set[Hashable]]:
+        """
+        Знаходить документи, що містять усі слова, фрази та префікси запиту
+
+        Списки документів перетинаються, починаючи з найкоротшого, тож
+        вартість визначається розміром списків, а не обсягом тексту. Фрази
+        перевіряються за позиціями лише на документах, що містять усі їхні
+        слова; префікс замінюється об'єднанням списків слів з цим префіксом.
+
+        Args:
+            query (str): Пошуковий запит
+            prefix_last (bool): Вважати префіксом останнє слово поза лапками
+
+        Returns:
+            Optional[Set[Hashable]]: Ідентифікатори документів або None,
+            якщо у запиті немає жодного слова
+        """
+        parsed = TextQuery(query, prefix_last)
+        if parsed.empty:
+            return None
+
+        tokens = set(parsed.terms)
+        for phrase in parsed.phrases:
+            tokens.update(phrase)
+        lists = [self.documents(token) for token in tokens]
+        for prefix in parsed.prefixes:
+            expanded: Set[Hashable] = set()
+            for term in self.expand_prefix(prefix):
+                expanded.update(self.documents(term))
+            lists.append(expanded)
+
+        lists.sort(key=len)
+        result = set(lists[0])
+        for postings in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(postings)
+
+        for phrase in parsed.phrases:
+            result = {doc_id for doc_id in result if self._contains_phrase(doc_id, phrase)}
+        return result
+
+    def rank(self, query: str, weights: Sequence[float], limit: Optional[int] = None,
+             k1: float = 1.2, b: float = 0.75,
+             prefix_last: bool = False) -> List[Tuple[Hashable, float]]:
+        """
+        Ранжує документи за запитом за формулою BM25F
+
+        Частоти слова в полях нормалізуються на довжину поля (параметр b),
+        зважуються вагами полів і насичуються параметром k1. Документ
+        отримує бали за кожне слово запиту, яке містить; префікси
+        розгортаються у слова словника, а фрази запиту є обов'язковими.
+        Найкращі limit документів відбираються купою, без сортування всіх збігів.
+
+        Args:
+            query (str): Пошуковий запит
+            weights (Sequence[float]): Вага кожного поля (наприклад, заголовок важливіший)
+            limit (Optional[int]): Максимальна кількість результатів
+            k1 (float): Насичення частоти слова
+            b (float): Сила нормалізації на довжину поля
+            prefix_last (bool): Вважати префіксом останнє слово поза лапками
+
+        Returns:
+            List[Tuple[Hashable, float]]: (документ, бал) від найрелевантнішого
+        """
+        total = len(self._texts)
+        if not total:
+            return []
+        average_lengths = [length / total or 1.0 for length in self._total_lengths]
+
+        parsed = TextQuery(query, prefix_last)
+        tokens = set(parsed.terms)
+        for phrase in parsed.phrases:
+            tokens.update(phrase)
+        for prefix in parsed.prefixes:
+            tokens.update(self.expand_prefix(prefix))
+
+        scores: Dict[Hashable, float] = {}
+        for token in tokens:
+            # Зважена нормалізована частота слова в кожному документі по всіх полях
+            weighted: Dict[Hashable, float] = {}
+            for field, (postings, weight, average) in enumerate(
+                    zip(self._postings, weights, average_lengths)):
+                for doc_id, positions in postings.get(token, {}).items():
+                    frequency = 1 if positions.__class__ is int else len(positions)
+                    length = self._lengths[doc_id][field]
+                    weighted[doc_id] = (weighted.get(doc_id, 0.0)
+                                        + weight * frequency / (1 - b + b * length / average))
+            if not weighted:
+                continue
+            idf = math.log(1 + (total - len(weighted) + 0.5) / (len(weighted) + 0.5))
+            for doc_id, value in weighted.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * value / (k1 + value)
+
+        for phrase in parsed.phrases:
+            scores = {doc_id: score for doc_id, score in scores.items()
+                      if self._contains_phrase(doc_id, phrase)}
+
+        key = lambda item: (item[1], str(item[0]))
+        if limit is None:
+            return sorted(scores.items(), key=key, reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=key)
+
+    def __len__(self) -> int:
+        """Повертає кількість документів в індексі"""
+        return len(self._texts)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        """Перевіряє, чи є документ в індексі"""
+        return doc_id in self._texts
@@ -0,0 +1,155 @@
+"""
+Модуль для транслітерації та нормалізації тексту для пошуку і порівняння
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+# Українська національна транслітерація (постанова КМУ №55 від 27.01.2010).
+# Російські літери, які пропускає валідація імен, додані для повноти.
+_CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ie', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia',
+    'ы': 'y', 'э': 'e', 'ъ': '', 'ё': 'e',
+}
+
+# На початку слова деякі літери передаються інакше
+_WORD_START = {'є': 'ye', 'ї': 'yi', 'й': 'y', 'ю': 'yu', 'я': 'ya'}
+
+# Апострофи не передаються при транслітерації
+_APOSTROPHES = {"'", '’', 'ʼ', '`'}
+
+_WORD_SEPARATORS = re.compile(r"[\s\-]+")
+
+
+def transliterate(text: str) -> str:
+    """
+    Транслітерує кириличний текст латиницею
+
+    Латинські та інші символи залишаються без змін, регістр приводиться
+    до нижнього.
+
+    Args:
+        text (str): Текст для транслітерації
+
+    Returns:
+        str: Транслітерований текст у нижньому регістрі
+    """
+    result = []
+    previous = ' '
+    for char in text.lower():
+        if char in _APOSTROPHES:
+            continue
+        if char in _WORD_START and not previous.isalpha():
+            result.append(_WORD_START[char])
+        else:
+            result.append(_CYRILLIC_TO_LATIN.get(char, char))
+        previous = char
+    return ''.join(result)
+
+
+def fold_text(text: str) -> str:
+    """
+    Приводить текст до форми для порівняння незалежно від алфавіту
+
+    Текст транслітерується, діакритичні знаки прибираються, а пробіли та
+    дефіси між словами зводяться до одного пробілу.
+
+    Args:
+        text (str): Текст для нормалізації
+
+    Returns:
+        str: Нормалізований текст
+    """
+    decomposed = unicodedata.normalize('NFKD', transliterate(text))
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD_SEPARATORS.sub(' ', stripped).strip()
+
+
+def name_block_key(name: str) -> str:
+    """
+    Повертає ключ імені, незалежний від алфавіту та порядку слів
+
+    "Іван Петров", "Petrov Ivan" та "ivan  petrov" мають однаковий ключ.
+
+    Args:
+        name (str): Ім'я
+
+    Returns:
+        str: Ключ імені
+    """
+    return ' '.join(sorted(fold_text(name).split()))
+
+
+# Фонетичні класи приголосних (у стилі Soundex) для латинської форми тексту.
+# Кириличні імена спершу транслітеруються, тож один код мають, наприклад,
+# "Олександр"/"Oleksandr"/"Alexander" чи "Микола"/"Nikolai".
+_PHONETIC_DIGRAPHS = (
+    ('shch', 's'), ('zh', 's'), ('kh', 'k'), ('ts', 's'), ('ch', 's'),
+    ('sh', 's'), ('ph', 'f'), ('th', 't'), ('ck', 'k'), ('qu', 'kv'), ('x', 'ks'),
+)
+_PHONETIC_CLASSES = {
+    'b': '1', 'p': '1',
+    'f': '2', 'v': '2', 'w': '2',
+    # Українське "г" транслітерується як "h", тож воно в одному класі з g/k
+    'c': '3', 'g': '3', 'h': '3', 'k': '3', 'q': '3',
+    'd': '4', 't': '4',
+    'l': '5',
+    'm': '6', 'n': '6',
+    'r': '7',
+    's': '8', 'z': '8',
+}
+
+
+def phonetic_key(text: str) -> str:
+    """
+    Повертає фонетичний ключ тексту, стійкий до типових помилок написання
+
+    Кожне слово кодується окремо: голосні (крім першої літери) відкидаються,
+    приголосні замінюються номером фонетичного класу, а повтори класу
+    поспіль зводяться до одного. Слова ключа впорядковуються, тож порядок
+    слів імені не важливий.
+
+    Args:
+        text (str): Текст (ім'я) кирилицею або латиницею
+
+    Returns:
+        str: Фонетичний ключ (порожній, якщо в тексті немає літер)
+    """
+    return folded_phonetic_key(fold_text(text))
+
+
+def folded_phonetic_key(folded: str) -> str:
+    """
+    Повертає фонетичний ключ тексту, вже обробленого fold_text()
+
+    Args:
+        folded (str): Нормалізований текст
+
+    Returns:
+        str: Фонетичний ключ, як у phonetic_key()
+    """
+    codes = [code for code in map(_phonetic_word_code, folded.split()) if code]
+    return ' '.join(sorted(codes))
+
+
+@lru_cache(maxsize=4096)
+def _phonetic_word_code(word: str) -> str:
+    """Кодує одне нормалізоване слово (імена часто повторюються, тож код кешується)"""
+    for digraph, replacement in _PHONETIC_DIGRAPHS:
+        word = word.replace(digraph, replacement)
+    letters = [char for char in word if char.isalpha()]
+    if not letters:
+        return ''
+    # Слово, що починається з голосної, позначається "0"
+    code = [_PHONETIC_CLASSES.get(letters[0], '0')]
+    for char in letters[1:]:
+        digit = _PHONETIC_CLASSES.get(char)
+        if digit is not None and digit != code[-1]:
+            code.append(digit)
+    return ''.join(code)
@@ -5,13 +5,19 @@
 import unittest
 import tempfile
 import shutil
+import io
+import threading
+from contextlib import redirect_stdout
+from datetime import date
 from pathlib import Path
 
 from personal_assistant.models.contact import Contact
 from personal_assistant.models.note import Note
 from personal_assistant.managers.contact_manager import ContactManager
 from personal_assistant.managers.note_manager import NoteManager
+from personal_assistant.managers.tenant_pool import TenantPool
 from personal_assistant.storage.file_storage import FileStorage
+from personal_assistant.utils.rwlock import ReadWriteLock
 
 
 class TestContact(unittest.TestCase):
@@ -88,6 +94,17 @@ class TestNote(unittest.TestCase):
         self.assertTrue(note.search_in_content("важлива"))
         self.assertTrue(note.search_in_content("роботу"))
         self.assertFalse(note.search_in_content("неіснуюче"))
+    
+    def test_word_count_cache(self):
+        """Тест кешування кількості слів"""
+        note = Note("Два слова", "І ще три")
+        
+        self.assertEqual(note.get_word_count(), 5)
+        self.assertEqual(note._word_count, 5)
+        note.set_content("Одне")
+        self.assertEqual(note.get_word_count(), 3)
+        note.set_title("Заголовок")
+        self.assertEqual(note.get_word_count(), 2)
 
 
 class TestFileStorage(unittest.TestCase):
@@ -159,6 +176,421 @@ class TestContactManager(unittest.TestCase):
         
         self.assertTrue(self.manager.remove_contact("Тест Видалення"))
         self.assertEqual(len(self.manager), 0)
+    
+    def test_statistics_follow_mutations(self):
+        """Тест інкрементальної статистики контактів"""
+        contact = Contact("Іван Петров")
+        contact.add_phone("+380501234567")
+        self.manager.add_contact(contact)
+        self.manager.add_contact(Contact("Петро Іванов"))
+        
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['total_contacts'], 2)
+        self.assertEqual(stats['with_phones'], 1)
+        self.assertEqual(stats['with_emails'], 0)
+        
+        # Редагування "на місці" фіксується через update_contact
+        contact.add_email("ivan@example.com")
+        self.manager.update_contact("Іван Петров")
+        self.manager.update_contact("Петро Іванов", address="Київ, вул. Хрещатик 1")
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['with_emails'], 1)
+        self.assertEqual(stats['with_addresses'], 1)
+        
+        self.manager.remove_contact("Іван Петров")
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['with_phones'], 0)
+        self.assertEqual(stats['with_emails'], 0)
+    
+    def test_upcoming_birthdays_count(self):
+        """Тест кешованої кількості найближчих днів народження"""
+        today = date.today()
+        contact = Contact("Іменинник Сьогодні")
+        # 28 років тому - рік того ж типу (високосний чи ні), що й поточний
+        contact.set_birthday(today.replace(year=today.year - 28).strftime('%d.%m.%Y'))
+        self.assertEqual(self.manager.count_upcoming_birthdays(), 0)
+        
+        self.manager.add_contact(contact)
+        expected = len(self.manager.get_upcoming_birthdays())
+        self.assertEqual(self.manager.count_upcoming_birthdays(), expected)
+        self.assertEqual(self.manager.get_statistics()['upcoming_birthdays'], expected)
+        
+        self.manager.update_contact("Іменинник Сьогодні", birthday=None)
+        self.assertEqual(self.manager.count_upcoming_birthdays(), 0)
+    
+    def test_sorted_views_and_pages(self):
+        """Тест відсортованих представлень та посторінкового перегляду"""
+        names = ["Олена", "Андрій", "Борис", "Василь", "Галина"]
+        birthdays = ["01.01.1990", None, "15.06.1985", "31.12.1970", "10.03.2000"]
+        for name, birthday in zip(names, birthdays):
+            contact = Contact(name)
+            if birthday:
+                contact.set_birthday(birthday)
+            self.manager.add_contact(contact)
+        
+        def expected(sort_by):
+            contacts = list(self.manager)
+            if sort_by == 'name':
+                return sorted(c.name.value for c in contacts)
+            return [c.name.value for c in sorted(
+                contacts, key=lambda c: (c.birthday is None, c.days_to_birthday() or 0,
+                                         c.name.value.lower()))]
+        
+        for sort_by in ('name', 'birthday'):
+            ordered = [c.name.value for c in self.manager.get_all_contacts(sort_by)]
+            self.assertEqual(ordered, expected(sort_by))
+            
+            paged, cursor = [], None
+            while True:
+                contacts, cursor = self.manager.page(sort_by, after=cursor, limit=2)
+                paged.extend(c.name.value for c in contacts)
+                if cursor is None:
+                    break
+            self.assertEqual(paged, ordered)
+        
+        self.manager.remove_contact("Андрій")
+        self.manager.update_contact("Борис", birthday=None)
+        self.assertEqual([c.name.value for c in self.manager.get_all_contacts('birthday')],
+                         expected('birthday'))
+        
+        # Після завантаження (масове наповнення) порядок той самий
+        self.manager.save_contacts()
+        reloaded = ContactManager(self.storage)
+        for sort_by in ('name', 'birthday'):
+            self.assertEqual([c.name.value for c in reloaded.get_all_contacts(sort_by)],
+                             [c.name.value for c in self.manager.get_all_contacts(sort_by)])
+        reloaded.add_contact(Contact("Ярослав"))
+        self.assertEqual([c.name.value for c in reloaded.get_all_contacts('name')][-1], "Ярослав")
+    
+    def test_birth_date_ranges(self):
+        """Тест діапазонних запитів за датою народження та віком"""
+        today = date.today()
+        forty_years_ago = today.replace(year=today.year - 40, day=min(today.day, 28))
+        records = [
+            {'name': 'Старший', 'birthday': '10.05.1955'},
+            {'name': 'Молодший', 'birthday': '01.01.1960'},
+            {'name': 'Сорокарічний', 'birthday': forty_years_ago.strftime('%d.%m.%Y')},
+            {'name': 'Без дати'},
+        ]
+        self.manager.add_contacts_bulk(records, workers=1)
+        
+        born = self.manager.born_between(date(1955, 1, 1), date(1960, 1, 1))
+        self.assertEqual([c.name.value for c in born], ["Старший", "Молодший"])
+        
+        forty = [c.name.value for c in self.manager.age_bracket(40, 40)]
+        self.assertEqual(forty, ["Сорокарічний"])
+        
+        self.manager.update_contact("Старший", birthday='')
+        born = self.manager.born_between(date(1955, 1, 1), date(1960, 12, 31))
+        self.assertEqual([c.name.value for c in born], ["Молодший"])
+        with self.assertRaises(ValueError):
+            self.manager.age_bracket(30, 20)
+    
+    def test_iter_search_is_lazy(self):
+        """Тест лінивого пошуку контактів з обмеженням"""
+        for name in ["Анна", "Анатолій", "Андрій", "Борис"]:
+            self.manager.add_contact(Contact(name))
+        
+        results = self.manager.iter_search("ан")
+        self.assertEqual(next(results).name.value, "Анна")
+        self.assertEqual(len(list(self.manager.iter_search("ан", limit=2))), 2)
+        self.assertEqual([c.name.value for c in self.manager.iter_all(limit=2)],
+                         ["Анатолій", "Андрій"])
+    
+    def test_batch_commits_once(self):
+        """Тест пакетних змін з одним збереженням"""
+        saves = []
+        original_save = self.storage.save_data
+        self.storage.save_data = lambda *args: (saves.append(args[0]), original_save(*args))
+        
+        with self.manager.batch():
+            for name in ["Анна", "Борис", "Василь"]:
+                self.manager.add_contact(Contact(name))
+            self.manager.update_contact("Анна", phones=["0501234567"])
+            self.manager.remove_contact("Борис")
+        
+        self.assertEqual(saves, ['contacts'])
+        reloaded = ContactManager(self.storage)
+        self.assertEqual(sorted(c.name.value for c in reloaded), ["Анна", "Василь"])
+    
+    def test_batch_rollback(self):
+        """Тест відкату пакета при винятку"""
+        contact = Contact("Анна")
+        contact.add_phone("0501234567")
+        self.manager.add_contact(contact)
+        
+        with self.assertRaises(ValueError):
+            with self.manager.batch():
+                self.manager.add_contact(Contact("Борис"))
+                self.manager.update_contact("Анна", phones=["0671234567"])
+                self.manager.remove_contact("Анна")
+                self.manager.add_contact(Contact("Борис"))  # дублікат
+        
+        self.assertEqual([c.name.value for c in self.manager], ["Анна"])
+        self.assertEqual(contact.phones[0].value, "+380501234567")
+        self.assertEqual(self.manager.get_statistics()['with_phones'], 1)
+        self.assertEqual(len(ContactManager(self.storage)), 1)
+        
+        # Великий пакет відкочується з масовим пересортуванням представлень
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                letters = "абвгдежзиклмнопрстуфхцчшщ"
+                names = [f"Контакт {a}{b}" for a in letters for b in letters]
+                for name in names[:ContactManager.BULK_ROLLBACK_SIZE + 1]:
+                    self.manager.add_contact(Contact(name))
+                self.manager.remove_contact("Анна")
+                raise RuntimeError("перервано")
+        self.assertEqual([c.name.value for c in self.manager.iter_all('name')], ["Анна"])
+        self.assertEqual(self.manager.search_contacts("Контакт"), [])
+    
+    def test_add_contacts_bulk(self):
+        """Тест масового імпорту контактів"""
+        records = [
+            {'name': 'анна', 'phones': ['0501234567']},
+            {'name': 'Борис', 'emails': ['boris@example.com']},
+            {'name': 'Борис', 'phones': ['0671234567'], 'birthday': '01.02.1990'},
+            {'name': 'Н0меР', 'phones': []},
+            {'phones': ['0501234567']},
+        ]
+        
+        for workers in (1, 2):
+            manager = ContactManager(FileStorage(tempfile.mkdtemp(dir=self.temp_dir)))
+            manager.add_contact(Contact("Анна"))
+            summary = manager.add_contacts_bulk(records, workers=workers, chunk_size=2)
+            
+            self.assertEqual(summary['added'], 1)
+            self.assertEqual(summary['merged'], 2)
+            self.assertEqual([position for position, _ in summary['errors']], [3, 4])
+            
+            boris = manager.find_contact("борис")
+            self.assertEqual(len(boris.phones), 1)
+            self.assertEqual(len(boris.emails), 1)
+            self.assertEqual(boris.birthday.value, "01.02.1990")
+            self.assertEqual(manager.get_statistics()['with_phones'], 2)
+            self.assertEqual(len(ContactManager(manager.storage)), 2)
+    
+    def test_find_and_merge_duplicates(self):
+        """Тест пошуку та злиття дублікатів"""
+        records = [
+            {'name': 'Іван Петров', 'phones': ['0501234567'], 'birthday': '01.02.1990'},
+            {'name': 'Ivan Petrov', 'phones': ['+380501234567'], 'emails': ['ivan@example.com']},
+            {'name': 'Петров Іван'},
+            {'name': 'Марія Петрова', 'phones': ['0671234567']},
+            {'name': 'Олег', 'phones': ['0671234567']},
+        ]
+        self.manager.add_contacts_bulk(records, workers=1)
+        
+        groups = self.manager.find_duplicates()
+        self.assertEqual([[c.name.value for c in group] for group in groups],
+                         [["Ivan Petrov", "Петров Іван", "Іван Петров"]])
+        
+        merged = self.manager.merge_contacts("Іван Петров", "Ivan Petrov")
+        self.assertEqual(len(merged.phones), 1)
+        self.assertEqual(merged.emails[0].value, "ivan@example.com")
+        self.assertEqual(merged.birthday.value, "01.02.1990")
+        self.assertNotIn("ivan petrov", self.manager)
+        self.assertEqual(self.manager.get_statistics()['with_emails'], 1)
+        
+        # Невдале злиття в пакеті відновлює обидва контакти
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                self.manager.merge_contacts("Олег", "Марія Петрова")
+                raise RuntimeError("перервано")
+        self.assertIn("марія петрова", self.manager)
+        self.assertEqual(len(self.manager.find_contact("Олег").phones), 1)
+        self.assertEqual(len(self.manager.find_duplicates()), 1)
+    
+    def test_ranked_search(self):
+        """Тест ранжованого пошуку контактів"""
+        records = [
+            {'name': 'Olena', 'address': 'Ann Street 5'},
+            {'name': 'Bohdan', 'emails': ['ann@example.com']},
+            {'name': 'Ann'},
+            {'name': 'Maria Ann'},
+            {'name': 'Anna Koval'},
+        ]
+        self.manager.add_contacts_bulk(records, workers=1)
+        
+        ranked = [c.name.value for c in self.manager.search_contacts("ann", ranked=True)]
+        self.assertEqual(ranked, ["Ann", "Anna Koval", "Maria Ann", "Bohdan", "Olena"])
+        
+        top = self.manager.search_contacts("ann", ranked=True, limit=2)
+        self.assertEqual([c.name.value for c in top], ["Ann", "Anna Koval"])
+        self.assertEqual(len(self.manager.search_contacts("ann")), 5)
+        
+        # Порожній запит повертає всі контакти, зокрема без телефону, email та адреси
+        everyone = [c.name.value for c in self.manager.search_contacts("", ranked=True)]
+        self.assertEqual(everyone, ["Ann", "Anna Koval", "Bohdan", "Maria Ann", "Olena"])
+        self.assertEqual(len(self.manager.search_contacts("", ranked=True, limit=2)), 2)
+    
+    def test_structured_query(self):
+        """Тест структурованих запитів через індекси"""
+        records = [
+            {'name': 'Петро Коваль', 'phones': ['0501234567'], 'birthday': '15.03.1990'},
+            {'name': 'Петрик Іванов', 'emails': ['p@example.com']},
+            {'name': 'Ольга Петренко', 'emails': ['olga@example.com'], 'birthday': '01.03.1985'},
+            {'name': 'Іван Сидоренко', 'phones': ['0670000000']},
+        ]
+        self.manager.add_contacts_bulk(records, workers=1)
+        
+        def names(query):
+            return [c.name.value for c in self.manager.search_contacts(query)]
+        
+        self.assertEqual(names("has:phone"), ["Петро Коваль", "Іван Сидоренко"])
+        self.assertEqual(names("domain:example.com birthday:03"), ["Ольга Петренко"])
+        self.assertEqual(names("name:петр*"), ["Ольга Петренко", "Петрик Іванов", "Петро Коваль"])
+        self.assertEqual(names("phone:0501234567"), ["Петро Коваль"])
+        
+        with self.assertRaises(ValueError):
+            self.manager.search_contacts("birthday:13")
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.manager.search_contacts("has:email name:петр*", explain=True)
+        self.assertIn("старт: індекс has:email", output.getvalue())
+        
+        # Індекси підтримуються при зміні та видаленні
+        self.manager.update_contact("Петро Коваль", birthday='10.04.1990')
+        self.assertEqual(names("birthday:03"), ["Ольга Петренко"])
+        self.manager.remove_contact("Петрик Іванов")
+        self.assertEqual(names("name:петр*"), ["Ольга Петренко", "Петро Коваль"])
+    
+    def test_transliterated_search(self):
+        """Тест пошуку латиницею за кириличними іменами і навпаки"""
+        self.manager.add_contact(Contact("Іван Петренко"))
+        self.manager.add_contact(Contact("Yurii Kovalenko"))
+        
+        self.assertEqual([c.name.value for c in self.manager.search_contacts("ivan")], ["Іван Петренко"])
+        self.assertEqual([c.name.value for c in self.manager.search_contacts("Юрій")], ["Yurii Kovalenko"])
+        self.assertEqual([c.name.value for c in self.manager.search_contacts("name:petr*")], ["Іван Петренко"])
+        
+        self.manager.remove_contact("Іван Петренко")
+        self.assertEqual(self.manager.search_contacts("ivan"), [])
+    
+    def test_find_similar_names(self):
+        """Тест фонетичного пошуку схожих імен"""
+        self.manager.add_contact(Contact("Олександр Петренко"))
+        self.manager.add_contact(Contact("Микола Коваль"))
+        
+        self.assertEqual(self.manager.find_similar_names("Alexander Petrenco"), ["Олександр Петренко"])
+        self.assertEqual(self.manager.find_similar_names("Nikolai"), ["Микола Коваль"])
+        self.assertEqual(self.manager.find_similar_names("Тарас"), [])
+        
+        self.manager.remove_contact("Микола Коваль")
+        self.assertEqual(self.manager.find_similar_names("Nikolai"), [])
+    
+    def test_search_cache_invalidation(self):
+        """Тест кешу результатів пошуку з версією колекції"""
+        self.manager.add_contact(Contact("Анна"))
+        
+        self.assertEqual(len(self.manager.search_contacts("Ан")), 1)
+        self.assertEqual(len(self.manager.search_contacts("ан")), 1)
+        stats = self.manager.get_statistics()
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (1, 1))
+        
+        # Зміна колекції робить закешований результат застарілим
+        self.manager.add_contact(Contact("Андрій"))
+        self.assertEqual(len(self.manager.search_contacts("ан")), 2)
+        self.assertEqual(self.manager.get_statistics()['cache_misses'], 2)
+    
+    def test_change_events(self):
+        """Тест потоку подій про зміни контактів"""
+        received = []
+        unsubscribe = self.manager.events.subscribe(received.append)
+        event_queue = self.manager.events.subscribe_queue()
+        
+        self.manager.add_contact(Contact("Іван Петренко"))
+        self.manager.update_contact("Іван Петренко", address="Київ, Хрещатик 1")
+        self.manager.remove_contact("Іван Петренко")
+        
+        self.assertEqual(
+            [(e.kind, e.before_key, e.after_key) for e in received],
+            [('added', None, 'іван петренко'),
+             ('updated', 'іван петренко', 'іван петренко'),
+             ('removed', 'іван петренко', None)]
+        )
+        self.assertEqual(event_queue.qsize(), 3)
+        
+        # Події пакета доставляються після збереження, а при відкаті відкидаються
+        received.clear()
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                self.manager.add_contact(Contact("Тимчасовий"))
+                raise RuntimeError("відкат")
+        self.assertEqual(received, [])
+        
+        unsubscribe()
+        self.manager.events.unsubscribe(event_queue)
+        self.manager.add_contact(Contact("Ольга"))
+        self.assertEqual(received, [])
+        self.assertEqual(self.manager.events.get_statistics()['published'], 3)
+    
+    def test_concurrent_readers_and_writers(self):
+        """Стрес-тест: N потоків-читачів і M потоків-письменників"""
+        readers_count, writers_count, operations = 4, 2, 40
+        errors = []
+        writers_done = threading.Event()
+        
+        def writer(worker: int) -> None:
+            try:
+                letter = "АБ"[worker]
+                for i in range(operations):
+                    name = f"{letter}{'а' * (i + 1)}"
+                    contact = Contact(name)
+                    contact.add_phone(f"050{worker}{i:06d}")
+                    self.manager.add_contact(contact)
+                    if i % 2:
+                        self.manager.remove_contact(name)
+            except Exception as e:
+                errors.append(e)
+        
+        def reader() -> None:
+            try:
+                while not writers_done.is_set():
+                    self.manager.search_contacts("а")
+                    for contact in self.manager.iter_search("050"):
+                        contact.name.value
+                    list(self.manager.iter_all('birthday'))
+                    self.manager.page('name', limit=5)
+                    self.manager.get_statistics()
+            except Exception as e:
+                errors.append(e)
+        
+        readers = [threading.Thread(target=reader) for _ in range(readers_count)]
+        writers = [threading.Thread(target=writer, args=(i,)) for i in range(writers_count)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writers_done.set()
+        for thread in readers:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        expected = writers_count * operations // 2
+        self.assertEqual(len(self.manager), expected)
+        self.assertEqual(self.manager.get_statistics()['with_phones'], expected)
+        self.assertEqual(len(self.manager.get_all_contacts()), expected)
+    
+    def test_statistics_under_read_lock(self):
+        """Тест: статистика не потребує блокування на запис"""
+        today = date.today()
+        contact = Contact("Іван")
+        contact.set_birthday(today.replace(year=today.year - 28).strftime('%d.%m.%Y'))
+        self.manager.add_contact(contact)
+        expected = len(self.manager.get_upcoming_birthdays())
+        results = []
+        
+        def read_statistics():
+            results.append(self.manager.get_statistics()['upcoming_birthdays'])
+        
+        # Інший потік тримає блокування на читання - статистика не чекає на нього
+        with self.manager._lock.read_lock():
+            thread = threading.Thread(target=read_statistics)
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [expected])
 
 
 class TestNoteManager(unittest.TestCase):
@@ -190,6 +622,11 @@ class TestNoteManager(unittest.TestCase):
         results = self.manager.search_notes("важлива")
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0][1].title, "Перша")
+        
+        # Останнє слово запиту може бути початком слова
+        self.assertEqual([note.title for _, note in self.manager.search_notes("важлива інф")], ["Перша"])
+        self.assertEqual([note.title for _, note, _ in self.manager.search_notes_ranked("осо")], ["Друга"])
+        self.assertEqual(self.manager.search_notes("інф важлива"), [])
     
     def test_find_notes_by_tags(self):
         """Тест пошуку нотаток за тегами"""
@@ -199,7 +636,427 @@ class TestNoteManager(unittest.TestCase):
         results = self.manager.find_notes_by_tags(["робота"])
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0][1].title, "Робоча")
+    
+    def test_tag_postings(self):
+        """Тест індексу тег -> нотатки"""
+        first = self.manager.create_note("Перша", "Зміст", ["робота", "проєкт"])
+        second = self.manager.create_note("Друга", "Зміст", ["робота"])
+        self.manager.create_note("Третя", "Зміст", ["особисте"])
+        
+        def titles(tags, match_all=False):
+            return [note.title for _, note in self.manager.find_notes_by_tags(tags, match_all)]
+        
+        self.assertEqual(titles(["робота", "особисте"]), ["Перша", "Друга", "Третя"])
+        self.assertEqual(titles(["робота", "проєкт"], match_all=True), ["Перша"])
+        self.assertEqual(titles(["робота", "невідомий"], match_all=True), [])
+        
+        # Індекс стежить за змінами тегів і видаленням нотаток
+        self.manager.update_note(second.id, tags=["проєкт"])
+        first.remove_tag("робота")
+        self.assertEqual(titles(["робота"]), [])
+        self.assertEqual(titles(["проєкт"]), ["Перша", "Друга"])
+        self.manager.remove_note(first.id)
+        self.assertEqual(titles(["проєкт"]), ["Друга"])
+    
+    def test_corpus_word_totals(self):
+        """Тест інкрементальної статистики слів колекції"""
+        first = self.manager.create_note("Перша", "один два три", ["робота"])
+        self.manager.create_note("Друга", "чотири")
+        
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['total_words'], 6)
+        self.assertEqual(stats['avg_words_per_note'], 3.0)
+        self.assertEqual(stats['notes_with_tags'], 1)
+        
+        first.set_content("один")
+        self.manager.update_note(first.id, tags=[])
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['total_words'], 4)
+        self.assertEqual(stats['notes_with_tags'], 0)
+        
+        self.manager.remove_note(first.id)
+        self.assertEqual(self.manager.get_statistics()['total_words'], 2)
+    
+    def test_tag_counts(self):
+        """Тест інкрементальних лічильників тегів"""
+        first = self.manager.create_note("Перша", "Зміст", ["робота", "важливо"])
+        second = self.manager.create_note("Друга", "Зміст", ["робота"])
+        
+        self.assertEqual(self.manager.most_common_tags(1), [("робота", 2)])
+        self.assertEqual(self.manager.get_tag_statistics(), {"робота": 2, "важливо": 1})
+        
+        # Тег з нульовою кількістю зникає з переліку тегів
+        self.manager.remove_tag_from_note(first.id, "важливо")
+        second.add_tag("дім")
+        self.manager.remove_note(first.id)
+        self.assertEqual(self.manager.get_all_tags(), {"робота", "дім"})
+        self.assertEqual(self.manager.most_common_tags(), [("дім", 1), ("робота", 1)])
+    
+    def test_tag_expressions(self):
+        """Тест булевих виразів над тегами"""
+        first = self.manager.create_note("Перша", "Зміст", ["робота"])
+        second = self.manager.create_note("Друга", "Зміст", ["проєкт", "архів"])
+        self.manager.create_note("Третя", "Зміст", ["особисте"])
+        
+        def titles(expression):
+            return [note.title for _, note in self.manager.find_notes(expression)]
+        
+        self.assertEqual(titles("(робота OR проєкт) AND NOT архів"), ["Перша"])
+        self.assertEqual(titles("робота, проєкт"), ["Перша", "Друга"])
+        self.assertEqual(titles("НЕ особисте і НЕ робота"), ["Друга"])
+        self.assertEqual(titles("проєкт архів"), ["Друга"])
+        
+        # Слоти видалених нотаток використовуються повторно
+        self.manager.remove_note(first.id)
+        self.manager.create_note("Четверта", "Зміст", ["проєкт"])
+        self.assertEqual(titles("проєкт AND NOT архів"), ["Четверта"])
+        second.remove_tag("архів")
+        self.assertEqual(titles("NOT робота AND NOT особисте"), ["Друга", "Четверта"])
+        
+        # Після завантаження бітові множини будуються масово з тими самими результатами
+        self.manager.update_note(second.id)
+        reloaded = NoteManager(self.storage)
+        self.assertEqual([note.title for _, note in reloaded.find_notes("NOT робота AND NOT особисте")],
+                         ["Друга", "Четверта"])
+        self.assertEqual([note.title for _, note in reloaded.find_notes("проєкт")], ["Друга", "Четверта"])
+        
+        for expression in ("", "(робота", "робота AND", "робота)", "тег!"):
+            with self.assertRaises(ValueError):
+                self.manager.find_notes(expression)
+    
+    def test_iterators_with_limit(self):
+        """Тест лінивих ітераторів нотаток з обмеженням"""
+        for i in range(5):
+            self.manager.create_note(f"Нотатка {i}", "Спільний зміст", ["спільне"])
+        
+        self.assertEqual(len(list(self.manager.iter_search("спільний", limit=3))), 3)
+        self.assertEqual(len(list(self.manager.iter_by_tags(["спільне"], limit=2))), 2)
+        
+        # Ітератори без обмеження видають нотатки від найстарішої по одній
+        by_created = self.manager.get_all_notes('created')[::-1]
+        found = self.manager.iter_search("спільний")
+        self.assertEqual([next(found), next(found)], by_created[:2])
+        self.assertEqual(list(self.manager.iter_by_tags(["спільне"])), by_created)
+        self.assertEqual(list(self.manager.iter_search("Спільний", case_sensitive=True)), by_created)
+        
+        titles = [note.title for _, note in self.manager.iter_all('title', limit=2)]
+        self.assertEqual(titles, ["Нотатка 0", "Нотатка 1"])
+        self.assertEqual(list(self.manager.iter_all('created', limit=4)),
+                         self.manager.get_all_notes('created')[:4])
+    
+    def test_sorted_views(self):
+        """Тест підтримуваних порядків сортування нотаток"""
+        notes = [self.manager.create_note(title, "Зміст") for title in ("Б", "А", "В")]
+        for offset, note in enumerate(notes):
+            note.created_at = note.created_at.replace(year=2020 + offset)
+            self.manager.update_note(note.id)
+        
+        def titles(sort_by, limit=None):
+            return [note.title for _, note in self.manager.iter_all(sort_by, limit)]
+        
+        self.assertEqual(titles('created', 2), ["В", "А"])
+        self.assertEqual(titles('title'), ["А", "Б", "В"])
+        
+        # Зміна нотатки переміщує її у представленнях
+        notes[0].add_tag("важливо")
+        self.assertEqual(titles('updated', 1), ["Б"])
+        self.assertEqual(titles('tags', 1), ["Б"])
+        
+        # Посторінковий перегляд з курсором
+        page, cursor = self.manager.page('title', limit=2)
+        self.assertEqual([note.title for _, note in page], ["А", "Б"])
+        page, cursor = self.manager.page('title', after=cursor, limit=2)
+        self.assertEqual([note.title for _, note in page], ["В"])
+        self.assertIsNone(cursor)
+    
+    def test_batch_rollback(self):
+        """Тест відкату пакета нотаток при винятку"""
+        note = self.manager.create_note("Перша", "Зміст", ["робота"])
+        
+        with self.assertRaises(ValueError):
+            with self.manager.batch():
+                self.manager.create_note("Друга")
+                self.manager.add_tag_to_note(note.id, "важливо")
+                self.manager.update_note(note.id, title="")  # невалідний заголовок
+        
+        self.assertEqual(len(self.manager), 1)
+        self.assertEqual(note.tags, {"робота"})
+        self.assertEqual(len(NoteManager(self.storage)), 1)
+    
+    def test_search_cache_invalidation(self):
+        """Тест кешу результатів пошуку нотаток"""
+        note = self.manager.create_note("Перша", "Зміст", ["робота"])
+        
+        self.assertEqual(len(self.manager.find_notes_by_tags(["Робота"])), 1)
+        self.assertEqual(len(self.manager.find_notes_by_tags(["робота"])), 1)
+        self.assertEqual(self.manager.get_statistics()['cache_hits'], 1)
+        
+        self.manager.add_tag_to_note(note.id, "важливо")
+        self.manager.remove_tag_from_note(note.id, "робота")
+        self.assertEqual(self.manager.find_notes_by_tags(["робота"]), [])
+    
+    def test_text_index_maintenance(self):
+        """Тест інкрементального текстового індексу нотаток"""
+        note = self.manager.create_note("Бюджет", "Квартальний звіт")
+        self.manager.create_note("Відпустка", "План подорожі")
+        
+        def titles(query):
+            return [n.title for _, n in self.manager.search_notes(query)]
+        
+        self.assertEqual(titles("звіт квартальний"), ["Бюджет"])
+        
+        # Зміна через методи нотатки одразу оновлює індекс
+        note.set_content("Річний звіт")
+        self.assertEqual(titles("квартальний"), [])
+        self.assertEqual(titles("річний"), ["Бюджет"])
+        self.manager.update_note(note.id)
+        
+        # Після завантаження індекс будується при першому запиті, окремий
+        # файл не зберігається
+        self.assertFalse(self.storage.file_exists('notes_index'))
+        reloaded = NoteManager(self.storage)
+        self.assertEqual([n.title for _, n in reloaded.search_notes("подорожі")], ["Відпустка"])
+        self.assertEqual([n.title for _, n in reloaded.search_notes("річ*")], ["Бюджет"])
+        
+        self.manager.remove_note(note.id)
+        self.assertEqual(titles("звіт"), [])
+    
+    def test_direct_note_edits(self):
+        """Тест подій і переіндексації при зміні нотатки напряму та через менеджер"""
+        note = self.manager.create_note("Бюджет", "Квартальний звіт")
+        events = []
+        self.manager.events.subscribe(events.append)
+        
+        note.add_tag("фінанси")
+        self.assertEqual([(e.kind, e.key) for e in events], [('updated', note.id)])
+        self.assertEqual(self.manager.get_tag_statistics(), {"фінанси": 1})
+        
+        # Зміни через менеджер переіндексовують нотатку один раз і дають одну подію
+        self.manager.update_note(note.id, title="Кошторис", tags=["а", "б", "в"])
+        self.assertEqual(len(events), 2)
+        self.assertEqual(self.manager.find_notes("а AND в"), [(note.id, note)])
+        self.assertEqual([n.title for _, n in self.manager.search_notes("кошторис")], ["Кошторис"])
+    
+    def test_phrase_and_prefix_search(self):
+        """Тест пошуку фраз і префіксів через позиційний індекс"""
+        self.manager.create_note("Бюджет", "Квартальний звіт про бюджет")
+        self.manager.create_note("Звіт", "Звіт квартальний, чернетка")
+        
+        def titles(query):
+            return [note.title for _, note in self.manager.search_notes(query)]
+        
+        self.assertEqual(titles('"квартальний звіт"'), ["Бюджет"])
+        self.assertEqual(titles('"звіт квартальний"'), ["Звіт"])
+        self.assertEqual(titles("бюдж*"), ["Бюджет"])
+        self.assertEqual(titles('черн* "звіт квартальний"'), ["Звіт"])
+        self.assertEqual(titles("кварт* звіт"), ["Бюджет", "Звіт"])
+        self.assertEqual(titles('"звіт чернетка"'), [])
+        
+        # Слово, що трапляється кілька разів, має всі свої позиції
+        self.manager.create_note("План", "план план дій, план")
+        self.assertEqual(titles('"план дій"'), ["План"])
+        self.assertEqual(titles('"дій план"'), ["План"])
+        self.assertEqual(titles('"дій дій"'), [])
+        
+        # Після перезавантаження позиції будуються наново з текстів нотаток
+        reloaded = NoteManager(self.storage)
+        self.assertEqual([n.title for _, n in reloaded.search_notes('"про бюджет"')], ["Бюджет"])
+        self.assertEqual(reloaded.search_notes_ranked('бюдж*')[0][1].title, "Бюджет")
+    
+    def test_regex_search(self):
+        """Тест пошуку регулярним виразом"""
+        first = self.manager.create_note("Рахунки", "Оплачено INV-2024 та INV-77")
+        self.manager.create_note("Інше", "Рахунок INV-5 у чернетці")
+        self.manager.create_note("Порожня", "Без номерів")
+        
+        results = self.manager.search_notes_regex(r"INV-\d{2,}")
+        self.assertEqual([(note_id, spans) for note_id, _, spans in results],
+                         [(first.id, [(9, 17), (21, 27)])])
+        # Обов'язкове слово виразу відбирає кандидатів через індекс
+        self.assertEqual(len(self.manager.search_notes_regex(r"\bчернетц")), 1)
+        with self.assertRaises(ValueError):
+            self.manager.search_notes_regex("(")
+        
+        # Розподілений пошук дає ті самі результати
+        self.manager.REGEX_PARALLEL_CHARS = 0
+        self.manager.REGEX_WORKERS = 2
+        parallel = self.manager.search_notes_regex(r"INV-\d+")
+        self.assertEqual([note.title for _, note, _ in parallel], ["Рахунки", "Інше"])
+    
+    def test_ranked_search(self):
+        """Тест ранжованого пошуку нотаток (BM25)"""
+        self.manager.create_note("Покупки", "Купити молоко та хліб")
+        self.manager.create_note("Молоко", "Список на тиждень")
+        self.manager.create_note("Звіт", "Витрати за місяць: молоко, сир, кава та інші дрібниці")
+        self.manager.create_note("Інше", "Нічого спільного")
+        
+        results = self.manager.search_notes_ranked("молоко")
+        # Збіг у заголовку важить більше, нотатки без збігів не потрапляють
+        self.assertEqual([note.title for _, note, _ in results], ["Молоко", "Покупки", "Звіт"])
+        scores = [score for _, _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        
+        # Обмеження кількості та слова, яких немає в жодній нотатці
+        self.assertEqual(len(self.manager.search_notes_ranked("молоко хліб", limit=1)), 1)
+        self.assertEqual(self.manager.search_notes_ranked("чай"), [])
+    
+    def test_stable_note_ids(self):
+        """Тест незмінних ідентифікаторів нотаток"""
+        first = self.manager.create_note("Перша")
+        second = self.manager.create_note("Друга")
+        third = self.manager.create_note("Третя")
+        
+        # Видалення не зсуває адреси інших нотаток
+        self.assertTrue(self.manager.remove_note(first.id))
+        self.assertFalse(self.manager.remove_note(first.id))
+        self.assertIs(self.manager.get_note(third.id), third)
+        self.assertTrue(self.manager.remove_note_by_title("друга"))
+        self.assertNotIn(second.id, self.manager)
+        
+        # Ідентифікатори зберігаються між сесіями
+        reloaded = NoteManager(self.storage)
+        self.assertEqual(reloaded.get_note(third.id).title, "Третя")
+        
+        # Нотаткам зі старих файлів без id присвоюються постійні ідентифікатори
+        self.storage.save_data('notes', [{'title': 'Стара'}])
+        legacy = next(iter(NoteManager(self.storage)))
+        self.assertEqual(self.storage.load_data('notes')[0]['id'], legacy.id)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Тести для блокування читачі/письменник"""
+    
+    def test_readers_share_and_writer_waits(self):
+        """Тест: читачі працюють разом, письменник чекає на них"""
+        lock = ReadWriteLock()
+        order, acquired = [], []
+        
+        def read():
+            acquired.append(lock.acquire_read(blocking=False))
+            lock.release_read()
+        
+        def write():
+            with lock.write_lock():
+                order.append('write')
+        
+        with lock.read_lock():
+            # Інший читач не чекає, письменник - чекає
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(5)
+            self.assertEqual(acquired, [True])
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.1)
+            self.assertTrue(writer.is_alive())
+            order.append('read')
+        writer.join(5)
+        self.assertEqual(order, ['read', 'write'])
+        
+        # Підвищення з читання до запису заборонене
+        with lock.read_lock():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+    
+    def test_write_or_defer(self):
+        """Тест: зміна під блокуванням на читання відкладається до його звільнення"""
+        lock, applied = ReadWriteLock(), []
+        with lock.read_lock():
+            lock.write_or_defer(lambda: applied.append(True))
+            self.assertEqual(applied, [])
+        self.assertEqual(applied, [True])
+        
+        lock.write_or_defer(lambda: applied.append(False))
+        self.assertEqual(applied, [True, False])
+
+
+class TestTenantPool(unittest.TestCase):
+    """Тести для пулу менеджерів орендарів"""
+    
+    def setUp(self):
+        """Підготовка тимчасової папки для даних орендарів"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Очищення тимчасової папки після тестів"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_lazy_load_and_eviction(self):
+        """Тест лінивого завантаження та витіснення під бюджетом пам'яті"""
+        pool = TenantPool(self.temp_dir, memory_budget=10 ** 9)
+        self.assertIs(pool.contacts("alice"), pool.contacts("alice"))
+        self.assertEqual(pool.loads, 1)
+        
+        with pool.contacts("alice").batch():
+            pool.contacts("alice").add_contact(Contact("Аліса"))
+        pool.notes("bob").create_note("Нотатка")
+        
+        report = pool.memory_report()
+        self.assertEqual(list(report), ["alice", "bob"])
+        self.assertTrue(all(size > 0 for size in report.values()))
+        
+        # Бюджет менший за одного орендаря: залишається лише щойно запитаний
+        pool.memory_budget = 1
+        pool.get("carol")
+        self.assertEqual(len(pool), 1)
+        self.assertIn("carol", pool)
+        self.assertEqual(pool.evictions, 2)
+        
+        # Дані витісненого орендаря збережено і завантажуються знову
+        self.assertIsNotNone(pool.contacts("alice").find_contact("Аліса"))
+        self.assertEqual(len(pool.notes("bob")), 1)
+        
+        with self.assertRaises(ValueError):
+            pool.get("../alice")
+    
+    def test_evicted_managers_are_closed(self):
+        """Тест: менеджери витісненого орендаря не приймають змін, flush зберігає все"""
+        pool = TenantPool(self.temp_dir, memory_budget=10 ** 9)
+        contacts = pool.contacts("alice")
+        contacts.add_contact(Contact("Аліса"))
+        
+        # Зміна об'єкта напряму зберігається через flush
+        contacts.find_contact("Аліса").add_phone("0501234567")
+        pool.get("alice").flush()
+        saved = ContactManager(FileStorage(str(Path(self.temp_dir) / "alice")))
+        self.assertEqual(len(saved.find_contact("Аліса").phones), 1)
+        
+        pool.evict("alice")
+        with self.assertRaises(RuntimeError):
+            contacts.add_contact(Contact("Борис"))
+        self.assertIsNotNone(contacts.find_contact("Аліса"))
+        
+        pool.contacts("alice").add_contact(Contact("Віра"))
+        self.assertEqual(len(pool.contacts("alice")), 2)
+    
+    def test_pool_calls_inside_batch(self):
+        """Тест: звернення до пулу зсередини пакета не блокують інші потоки"""
+        pool = TenantPool(self.temp_dir, memory_budget=1)
+        contacts = pool.contacts("alice")
+        in_batch, loaded = threading.Event(), threading.Event()
+        
+        def load_other():
+            in_batch.wait()
+            pool.get("bob")
+            loaded.set()
+        
+        thread = threading.Thread(target=load_other)
+        thread.start()
+        with contacts.batch():
+            contacts.add_contact(Contact("Аліса"))
+            in_batch.set()
+            self.assertTrue(loaded.wait(5))
+            pool.notes("carol").create_note("Нотатка")
+            # Орендаря, з яким працює потік, не витіснено посеред пакета
+            contacts.add_contact(Contact("Борис"))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertIn("alice", pool)
+        
+        pool.trim()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(len(pool.contacts("alice")), 2)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()